@@ -0,0 +1,88 @@
+"""Run the benchmark suite
+
+Usage: python -m benchmarks [--saves DIR | --synthetic 1,2,4] [--save-baseline] [--compare]
+"""
+
+import argparse
+import sys
+import tempfile
+
+from . import bench_save, runner
+
+
+def main() -> int:
+    """Run the benchmarks and return the exit code"""
+
+    parser = argparse.ArgumentParser(prog="benchmarks", description=__doc__)
+    parser.add_argument(
+        "--saves", default=bench_save.SAVES_DIR, help="directory of save files"
+    )
+    parser.add_argument(
+        "--synthetic",
+        default="",
+        help="comma separated sizes of generated saves to use instead of --saves",
+    )
+    parser.add_argument(
+        "--game-version",
+        type=int,
+        default=120200,
+        help="game version of the generated saves",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="minimum time to spend on each benchmark in seconds",
+    )
+    parser.add_argument(
+        "--only", default="", help="comma separated names of benchmarks to run"
+    )
+    parser.add_argument("--baseline", default="default", help="name of the baseline")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as a baseline"
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="compare the results to the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown or memory growth counted as a regression",
+    )
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    scales = [float(scale) for scale in args.synthetic.split(",") if scale.strip()]
+    if scales:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_files = bench_save.write_synthetic_saves(
+                temp_dir, scales, args.game_version
+            )
+            results = bench_save.run(save_files, args.min_time, only)
+    else:
+        results = bench_save.run(
+            bench_save.get_save_files(args.saves), args.min_time, only
+        )
+    if not results:
+        print(f"No save files found in {args.saves}")
+        return 1
+
+    exit_code = 0
+    if args.compare:
+        baseline = runner.load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline named {args.baseline}")
+            return 1
+        comparisons = runner.compare(results, baseline, args.threshold)
+        print()
+        print(runner.format_report(comparisons))
+        if any(comparison.is_regression() for comparison in comparisons):
+            exit_code = 1
+    if args.save_baseline:
+        print(f"Saved baseline to {runner.save_baseline(results, args.baseline)}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Benchmarks for parsing game data CSV files
+
+Compares the single pass tokenizer of csv_handler with the previous parser,
+which made a pass to split lines, strip comments and whitespace, split items
+and remove empty items, and then another to convert the items to ints.
+
+Usage: python -m benchmarks.bench_csv [--data DIR] [--min-time 0.5]
+
+DIR is a folder of downloaded game data files, e.g a DataLocal folder. Files
+that aren't in it are generated with a similar shape.
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Any, Callable
+
+from BCSFE_Python import csv_handler, helper
+
+from . import runner
+
+FILES = ["unitbuy.csv", "SkillAcquisition.csv", "GatyaDataSetR1.csv"]
+
+
+def legacy_parse_csv(data: str, delimeter: str = ",") -> list[list[str]]:
+    """The parser csv_handler.parse_csv replaced"""
+
+    data_ls = data.split("\n")
+    data_ls = [line.split("//")[0] for line in data_ls]
+    data_ls = [line.strip() for line in data_ls]
+    data_ls = [line for line in data_ls if line != ""]
+    data_ls_ls = [line.split(delimeter) for line in "\n".join(data_ls).split("\n")]
+    data_ls_ls = csv_handler.remove_empty_items(data_ls_ls)
+    return [line for line in data_ls_ls if line != []]
+
+
+def generate_unitbuy(rng: random.Random) -> bytes:
+    """Generate a file shaped like unitbuy.csv, a row of 62 ints per cat"""
+
+    lines = []
+    for _ in range(750):
+        lines.append(",".join(str(rng.randint(-1, 9999)) for _ in range(62)))
+    return "\n".join(lines).encode("utf-8")
+
+
+def generate_skill_acquisition(rng: random.Random) -> bytes:
+    """Generate a file shaped like SkillAcquisition.csv, a header and 113 ints per cat"""
+
+    lines = [",".join(f"column_{i}" for i in range(113))]
+    for cat_id in range(200):
+        values = [str(cat_id)] + [str(rng.randint(0, 300)) for _ in range(112)]
+        lines.append(",".join(values))
+    return "\n".join(lines).encode("utf-8")
+
+
+def generate_gatya_data_set(rng: random.Random) -> bytes:
+    """Generate a file shaped like GatyaDataSetR1.csv, cat ids ending in -1 per banner"""
+
+    lines = []
+    for banner_id in range(1000):
+        cats = [str(rng.randint(0, 700)) for _ in range(rng.randint(1, 120))]
+        lines.append(",".join(cats) + ",-1,//" + f"banner {banner_id}")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+GENERATORS: dict[str, Callable[[random.Random], bytes]] = {
+    "unitbuy.csv": generate_unitbuy,
+    "SkillAcquisition.csv": generate_skill_acquisition,
+    "GatyaDataSetR1.csv": generate_gatya_data_set,
+}
+
+
+def get_files(data_dir: str) -> dict[str, bytes]:
+    """Get the data of the files to parse, generating the missing ones"""
+
+    rng = random.Random(0)
+    files: dict[str, bytes] = {}
+    for file_name in FILES:
+        path = os.path.join(data_dir, file_name) if data_dir else ""
+        if path and os.path.isfile(path):
+            files[file_name] = helper.read_file_bytes(path)
+        else:
+            files[f"{file_name} (generated)"] = GENERATORS[file_name](rng)
+    return files
+
+
+def get_benchmarks(data: bytes) -> dict[str, Callable[[], Any]]:
+    """Get the benchmarks to run for a single file"""
+
+    return {
+        "legacy_parse_int_csv": lambda: helper.parse_int_list_list(
+            legacy_parse_csv(data.decode("utf-8"))
+        ),
+        "parse_int_csv": lambda: csv_handler.parse_int_csv(data),
+        "legacy_parse_csv": lambda: legacy_parse_csv(data.decode("utf-8")),
+        "parse_csv": lambda: csv_handler.parse_csv(data),
+    }
+
+
+def run(
+    files: dict[str, bytes], min_time: float, only: list[str]
+) -> list[runner.BenchmarkResult]:
+    """
+    Run the CSV benchmarks for a set of files
+
+    Args:
+        files (dict[str, bytes]): The data of each file
+        min_time (float): Minimum time to spend on each benchmark in seconds
+        only (list[str]): Names of the benchmarks to run, empty for all
+
+    Returns:
+        list[runner.BenchmarkResult]: Results of the benchmarks
+    """
+    results: list[runner.BenchmarkResult] = []
+    for file_name, data in files.items():
+        group = f"{file_name} ({runner.format_size(len(data))})"
+        for name, func in get_benchmarks(data).items():
+            if only and name not in only:
+                continue
+            result = runner.run_benchmark(name, group, func, min_time)
+            print(result)
+            results.append(result)
+    return results
+
+
+def main() -> int:
+    """Run the benchmarks and return the exit code"""
+
+    parser = argparse.ArgumentParser(prog="benchmarks.bench_csv", description=__doc__)
+    parser.add_argument("--data", default="", help="directory of game data files")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="minimum time to spend on each benchmark in seconds",
+    )
+    parser.add_argument(
+        "--only", default="", help="comma separated names of benchmarks to run"
+    )
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    files = get_files(args.data)
+    for file_name, data in files.items():
+        if csv_handler.parse_int_csv(data) != helper.parse_int_list_list(
+            legacy_parse_csv(data.decode("utf-8"))
+        ):
+            print(f"{file_name}: parse_int_csv differs from the previous parser")
+            return 1
+    run(files, args.min_time, only)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
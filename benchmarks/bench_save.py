@@ -0,0 +1,140 @@
+"""Benchmarks for parsing, serialising, patching and exporting save data"""
+
+import contextlib
+import io
+import os
+import tempfile
+from typing import Any, Callable
+
+from BCSFE_Python import helper, parse_save, patcher, serialise_save
+
+from . import runner, save_generator
+
+SAVES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "saves"
+)
+
+
+def get_save_files(saves_dir: str) -> list[str]:
+    """Get the paths of all save files in a directory"""
+
+    if not os.path.isdir(saves_dir):
+        return []
+    save_files: list[str] = []
+    for file in sorted(os.listdir(saves_dir)):
+        path = os.path.join(saves_dir, file)
+        if (
+            os.path.isfile(path)
+            and not file.endswith(".bak")
+            and not file.endswith("_backup")
+            and not file.endswith(".json")
+        ):
+            save_files.append(path)
+    return save_files
+
+
+def quiet(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a function so that anything it prints is discarded"""
+
+    def wrapper() -> Any:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+
+    return wrapper
+
+
+def get_benchmarks(
+    save_data: bytes, country_code: str, temp_dir: str
+) -> dict[str, Callable[[], Any]]:
+    """Get the benchmarks to run for a single save"""
+
+    save_stats = parse_save.parse_save(save_data, country_code)
+    json_path = os.path.join(temp_dir, "save.json")
+
+    return {
+        "parse_save": quiet(lambda: parse_save.parse_save(save_data, country_code)),
+        "serialize_save": quiet(lambda: serialise_save.serialize_save(save_stats)),
+        "detect_game_version": lambda: patcher.detect_game_version(save_data),
+        "patch_save_data": lambda: patcher.patch_save_data(save_data, country_code),
+        "re_order": lambda: parse_save.re_order(save_stats),
+        "export_json": quiet(lambda: helper.export_json(save_stats, json_path)),
+    }
+
+
+def round_trip_batch(saves: list[tuple[bytes, str]]) -> None:
+    """Parse and serialise a batch of saves"""
+
+    for save_data, country_code in saves:
+        save_stats = parse_save.parse_save(save_data, country_code)
+        serialise_save.serialize_save(save_stats)
+
+
+def run(
+    save_files: list[str], min_time: float, only: list[str]
+) -> list[runner.BenchmarkResult]:
+    """
+    Run the save benchmarks for a list of save files
+
+    Args:
+        save_files (list[str]): Paths of the save files
+        min_time (float): Minimum time to spend on each benchmark in seconds
+        only (list[str]): Names of the benchmarks to run, empty for all
+
+    Returns:
+        list[runner.BenchmarkResult]: Results of the benchmarks
+    """
+    results: list[runner.BenchmarkResult] = []
+    batch: list[tuple[bytes, str]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for path in save_files:
+            save_data = helper.read_file_bytes(path)
+            country_code = patcher.detect_game_version(save_data)
+            if country_code is None:
+                print(f"Skipping {path}: could not detect the country code")
+                continue
+            batch.append((save_data, country_code))
+            game_version = parse_save.get_game_version(save_data)
+            group = (
+                f"{os.path.basename(path)} ({game_version} {country_code} "
+                f"{runner.format_size(len(save_data))})"
+            )
+            benchmarks = get_benchmarks(save_data, country_code, temp_dir)
+            for name, func in benchmarks.items():
+                if only and name not in only:
+                    continue
+                result = runner.run_benchmark(name, group, func, min_time)
+                print(result)
+                results.append(result)
+
+    if len(batch) > 1 and (not only or "round_trip_batch" in only):
+        size = sum(len(save_data) for save_data, _ in batch)
+        group = f"batch ({len(batch)} saves {runner.format_size(size)})"
+        result = runner.run_benchmark(
+            "round_trip_batch", group, quiet(lambda: round_trip_batch(batch)), min_time
+        )
+        print(result)
+        results.append(result)
+    return results
+
+
+def write_synthetic_saves(
+    output_dir: str, scales: list[float], game_version: int
+) -> list[str]:
+    """
+    Write synthetic saves of increasing size
+
+    Args:
+        output_dir (str): Directory to write the saves to
+        scales (list[float]): Size of each save relative to the default options
+        game_version (int): Game version of the saves
+
+    Returns:
+        list[str]: Paths of the saves
+    """
+    paths: list[str] = []
+    for scale in scales:
+        options = save_generator.SaveOptions(game_version=game_version).scale(scale)
+        path = os.path.join(output_dir, f"synthetic_x{scale:g}")
+        helper.write_file_bytes(path, save_generator.generate_save(options))
+        paths.append(path)
+    return paths
@@ -0,0 +1,113 @@
+"""Cold start budget of python -m BCSFE_Python
+
+Measures the time a new interpreter takes to import the editor, on top of the
+time taken by an empty interpreter, and checks that the modules that are only
+needed after a feature is picked are not imported.
+
+Usage: python -m benchmarks.bench_startup [--budget 0.25] [--rounds 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from BCSFE_Python import startup_profile
+
+# seconds on top of an empty interpreter, measured on a desktop CPU
+STARTUP_BUDGET = 0.25
+# modules that must only be imported on first use
+LAZY_MODULES = ["requests", "dateutil", "BCSFE_Python.edits"]
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+
+def run_interpreter(code: str) -> tuple[float, str]:
+    """Run code in a new interpreter and get the time taken and the output"""
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (SRC_DIR, env.get("PYTHONPATH")) if path
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return time.perf_counter() - start, result.stdout
+
+
+def measure_startup(rounds: int = 10) -> float:
+    """
+    Measure the cold start time of the editor
+
+    Args:
+        rounds (int, optional): Number of runs, the fastest is used. Defaults to 10.
+
+    Returns:
+        float: Seconds taken to import the editor, minus the interpreter start up
+    """
+    import_code = f"import {startup_profile.START_UP_MODULE}"
+    startup = min(run_interpreter(import_code)[0] for _ in range(rounds))
+    interpreter = min(run_interpreter("pass")[0] for _ in range(rounds))
+    return max(startup - interpreter, 0.0)
+
+
+def get_eager_modules() -> list[str]:
+    """Get the lazy modules that are imported when the editor starts"""
+
+    code = (
+        f"import sys, {startup_profile.START_UP_MODULE}\n"
+        "print('\\n'.join(sys.modules))"
+    )
+    modules = run_interpreter(code)[1].splitlines()
+    return sorted(
+        module
+        for module in modules
+        if any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+
+
+def main() -> int:
+    """Check the start up budget and return the exit code"""
+
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.bench_startup", description=__doc__
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET,
+        help="maximum import time in seconds",
+    )
+    parser.add_argument("--rounds", type=int, default=10, help="runs to measure")
+    parser.add_argument(
+        "--profile", action="store_true", help="print the import time breakdown"
+    )
+    args = parser.parse_args()
+
+    exit_code = 0
+    eager_modules = get_eager_modules()
+    if eager_modules:
+        print(f"Imported on start up: {', '.join(eager_modules)}")
+        exit_code = 1
+
+    startup = measure_startup(args.rounds)
+    print(f"Start up: {startup * 1000:.1f}ms (budget {args.budget * 1000:.0f}ms)")
+    if startup > args.budget:
+        print("Over the start up budget")
+        exit_code = 1
+    if args.profile or exit_code:
+        print()
+        startup_profile.main()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
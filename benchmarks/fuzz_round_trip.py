@@ -0,0 +1,369 @@
+"""Property based round trip fuzzer for parse_save and serialise_save
+
+Every case mutates a parsed save within the domain of each field, serialises
+it, parses the result and checks that the parsed stats are a fixed point.
+
+Usage: python -m benchmarks.fuzz_round_trip [--saves DIR] [--cases 5000] [--workers N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import time
+import traceback
+from typing import Any, Optional, Union
+
+from BCSFE_Python import helper, parse_save, patcher, serialise_save
+
+from . import bench_save, save_generator
+
+Path = tuple[Union[str, int], ...]
+
+# fields that decide the layout of the save or are derived from other fields
+FROZEN_KEYS = {
+    "editor_version",
+    "game_version",
+    "game_version_2",
+    "version",
+    "dst",
+    "extra_time_data",
+    "extra_data",
+    "time",
+    "second_time",
+    "third_time",
+    "fourth_time",
+    "play_time",
+    "gamatoto_time_left",
+    "hash",
+    "exit",
+    "len",
+    "len_val",
+    "Lengths",
+    "Length_1",
+    "Length_2",
+    "total",
+    "stars",
+    "stages",
+    "unknown",
+    "unknown_65",
+    "unknown_66",
+    "unknown_104",
+    "cleared_slot_data",
+}
+
+# fields that are only generated by the parser, depending on the dst flag
+NOT_STORED_WITH_DST = {"unknown_24"}
+NOT_STORED_WITHOUT_DST = {
+    "dst_val",
+    "unknown_110",
+    "unknown_112",
+    "unknown_119",
+    "unknown_128",
+    "time_stamps",
+}
+
+
+class Leaf:
+    """A mutable field of the save stats"""
+
+    def __init__(self, path: Path, kind: str, max_value: int = 0):
+        self.path = path
+        self.kind = kind
+        self.max_value = max_value
+
+    def get_value(self, rng: random.Random) -> Any:
+        """Get a random value in the domain of the field"""
+
+        if self.kind == "int":
+            return rng.choice([0, self.max_value, rng.randint(0, self.max_value)])
+        if self.kind == "bool":
+            return rng.random() < 0.5
+        if self.kind == "float":
+            return rng.uniform(0, 2**31)
+        length = rng.randint(0, 16)
+        return "".join(chr(rng.randint(0x20, 0x7E)) for _ in range(length))
+
+    def set_value(self, save_stats: dict[str, Any], value: Any) -> None:
+        """Set the value of the field in the save stats"""
+
+        container: Any = save_stats
+        for key in self.path[:-1]:
+            container = container[key]
+        container[self.path[-1]] = value
+
+
+def is_int_field(value: Any) -> bool:
+    """Check if a value is a {"Value": int, "Length": int} field"""
+
+    return (
+        isinstance(value, dict)
+        and len(value) == 2  # type: ignore
+        and isinstance(value.get("Value"), int)  # type: ignore
+        and isinstance(value.get("Length"), int)  # type: ignore
+    )
+
+
+def get_leaves(value: Any, frozen: set[str], path: Path = ()) -> list[Leaf]:
+    """
+    Get all mutable fields of the save stats
+
+    Ints inside lists and dicts are only mutated within a single byte, which
+    every width in the format can hold. Sized fields ({"Value", "Length"})
+    inside lists are dumped raw data where a value may be the length of the
+    values after it, so only top level sized fields are mutated.
+
+    Args:
+        value (Any): The save stats or a part of it
+        frozen (set[str]): Keys of fields that must not be mutated
+        path (Path, optional): Path to the value. Defaults to ().
+
+    Returns:
+        list[Leaf]: The mutable fields
+    """
+    if path and path[-1] in frozen:
+        return []
+    if path and str(path[0]).startswith("gv_"):
+        return []
+    if is_int_field(value):
+        if any(isinstance(key, int) for key in path):
+            return []
+        return [Leaf(path + ("Value",), "int", 2 ** (8 * value["Length"]) - 1)]
+    if isinstance(value, bool):
+        return [Leaf(path, "bool")]
+    if isinstance(value, int):
+        return [Leaf(path, "int", 0xFF)]
+    if isinstance(value, float):
+        return [Leaf(path, "float")]
+    if isinstance(value, str):
+        return [Leaf(path, "str")]
+    leaves: list[Leaf] = []
+    if isinstance(value, dict):
+        for key, item in value.items():  # type: ignore
+            leaves.extend(get_leaves(item, frozen, path + (key,)))
+        if value.get("len_val", 4) != 4:  # type: ignore
+            # cannon foundation and style levels are only stored with a length of 4
+            leaves = [
+                leaf for leaf in leaves if leaf.path[-1] not in ("foundation", "style")
+            ]
+    elif isinstance(value, list):
+        for index, item in enumerate(value):  # type: ignore
+            leaves.extend(get_leaves(item, frozen, path + (index,)))
+    return leaves
+
+
+class Failure:
+    """A case that did not round trip"""
+
+    def __init__(self, seed: int, paths: list[Path], error: str):
+        self.seed = seed
+        self.paths = paths
+        self.error = error
+
+    def __str__(self) -> str:
+        paths = ", ".join(format_path(path) for path in self.paths)
+        return f"seed {self.seed}: {self.error}\n  mutated: {paths}"
+
+
+def format_path(path: Path) -> str:
+    """Format a path to a field, e.g. cats[123]"""
+
+    text = str(path[0])
+    for key in path[1:]:
+        text += f"[{key}]" if isinstance(key, int) else f".{key}"
+    return text
+
+
+def find_difference(value_1: Any, value_2: Any, path: Path = ()) -> Optional[Path]:
+    """Find the path of the first difference between two values"""
+
+    if isinstance(value_1, dict) and isinstance(value_2, dict):
+        for key in value_1:  # type: ignore
+            if key not in value_2:
+                return path + (key,)  # type: ignore
+            difference = find_difference(value_1[key], value_2[key], path + (key,))  # type: ignore
+            if difference is not None:
+                return difference
+        return None
+    if isinstance(value_1, (list, tuple)) and isinstance(value_2, (list, tuple)):
+        if len(value_1) != len(value_2):  # type: ignore
+            return path
+        for index, (item_1, item_2) in enumerate(zip(value_1, value_2)):  # type: ignore
+            difference = find_difference(item_1, item_2, path + (index,))
+            if difference is not None:
+                return difference
+        return None
+    return None if value_1 == value_2 else path
+
+
+class Fuzzer:
+    """Round trip fuzzer for a single save"""
+
+    def __init__(self, save_data: bytes, country_code: str, mutations: int):
+        self.country_code = country_code
+        self.mutations = mutations
+        save_stats = parse_save.parse_save(save_data, country_code)
+        self.dst = save_stats["dst"]
+        self.pickled_stats = pickle.dumps(save_stats)
+        frozen = FROZEN_KEYS | (
+            NOT_STORED_WITH_DST if self.dst else NOT_STORED_WITHOUT_DST
+        )
+        self.leaves = get_leaves(save_stats, frozen)
+
+    def run_case(self, seed: int) -> Optional[Failure]:
+        """Run a single case, returning the failure if it does not round trip"""
+
+        rng = random.Random(seed)
+        save_stats: dict[str, Any] = pickle.loads(self.pickled_stats)
+        leaves = rng.sample(self.leaves, min(self.mutations, len(self.leaves)))
+        for leaf in leaves:
+            leaf.set_value(save_stats, leaf.get_value(rng))
+        paths = [leaf.path for leaf in leaves]
+
+        try:
+            save_data = serialise_save.serialize_save(save_stats)
+            save_data = patcher.patch_save_data(save_data, self.country_code)
+            save_stats_2 = parse_save.parse_save(save_data, self.country_code, self.dst)
+            save_stats.pop("hash")
+            save_stats_2.pop("hash")
+        except Exception as err:  # pylint: disable=broad-except
+            error = traceback.format_exception_only(type(err), err)[-1].strip()
+            return Failure(seed, paths, error)
+
+        difference = find_difference(save_stats, save_stats_2)
+        if difference is not None:
+            return Failure(seed, paths, f"{format_path(difference)} changed")
+        return None
+
+
+def run_worker(
+    args: tuple[bytes, str, int, int, int]
+) -> tuple[int, list[Failure]]:
+    """Run a range of cases for a save"""
+
+    save_data, country_code, mutations, first_seed, cases = args
+    fuzzer = Fuzzer(save_data, country_code, mutations)
+    failures: list[Failure] = []
+    for seed in range(first_seed, first_seed + cases):
+        failure = fuzzer.run_case(seed)
+        if failure is not None:
+            failures.append(failure)
+    return cases, failures
+
+
+def fuzz(
+    saves: list[tuple[bytes, str]],
+    cases: int,
+    mutations: int = 10,
+    workers: int = 1,
+    seed: int = 0,
+    batch_size: int = 25,
+) -> tuple[int, list[Failure], float]:
+    """
+    Fuzz a list of saves
+
+    Args:
+        saves (list[tuple[bytes, str]]): Save data and country code of each save
+        cases (int): Number of cases to run for each save
+        mutations (int, optional): Fields to mutate per case. Defaults to 10.
+        workers (int, optional): Number of processes. Defaults to 1.
+        seed (int, optional): Seed of the first case. Defaults to 0.
+        batch_size (int, optional): Cases per task sent to a process. Defaults to 25.
+
+    Returns:
+        tuple[int, list[Failure], float]: Cases run, failures, time taken in seconds
+    """
+    tasks: list[tuple[bytes, str, int, int, int]] = []
+    for save_data, country_code in saves:
+        for first_seed in range(seed, seed + cases, batch_size):
+            count = min(batch_size, seed + cases - first_seed)
+            tasks.append((save_data, country_code, mutations, first_seed, count))
+
+    start = time.perf_counter()
+    total_cases = 0
+    failures: list[Failure] = []
+    if workers <= 1:
+        results = map(run_worker, tasks)
+        for total, task_failures in results:
+            total_cases += total
+            failures.extend(task_failures)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for total, task_failures in pool.imap_unordered(run_worker, tasks):
+                total_cases += total
+                failures.extend(task_failures)
+    return total_cases, failures, time.perf_counter() - start
+
+
+def get_saves(save_files: list[str]) -> list[tuple[bytes, str]]:
+    """Load save files and detect their country codes"""
+
+    saves: list[tuple[bytes, str]] = []
+    for path in save_files:
+        save_data = helper.read_file_bytes(path)
+        country_code = patcher.detect_game_version(save_data)
+        if country_code is None:
+            print(f"Skipping {path}: could not detect the country code")
+            continue
+        saves.append((save_data, country_code))
+    return saves
+
+
+def main() -> int:
+    """Run the fuzzer from the command line and return the exit code"""
+
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.fuzz_round_trip", description=__doc__
+    )
+    parser.add_argument("--saves", default="", help="directory of save files")
+    parser.add_argument(
+        "--synthetic-scale",
+        type=float,
+        default=0.25,
+        help="size of the generated save used when no saves are given",
+    )
+    parser.add_argument("--cases", type=int, default=5000, help="cases per save")
+    parser.add_argument("--mutations", type=int, default=10, help="fields per case")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="processes to use"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first case")
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=3000,
+        help="required cases per minute, 0 to disable",
+    )
+    args = parser.parse_args()
+
+    if args.saves:
+        saves = get_saves(bench_save.get_save_files(args.saves))
+    else:
+        options = save_generator.SaveOptions().scale(args.synthetic_scale)
+        saves = [(save_generator.generate_save(options), options.country_code)]
+    if not saves:
+        print(f"No save files found in {args.saves}")
+        return 1
+
+    total_cases, failures, total_time = fuzz(
+        saves, args.cases, args.mutations, args.workers, args.seed
+    )
+    for failure in failures[:20]:
+        print(failure)
+    cases_per_minute = total_cases / total_time * 60
+    print(
+        f"{total_cases} cases, {len(failures)} failures in {total_time:.1f}s "
+        f"({cases_per_minute:.0f} cases/min, {args.workers} workers)"
+    )
+    if failures:
+        return 1
+    if args.target and cases_per_minute < args.target:
+        print(f"Below the target of {args.target:.0f} cases/min")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Timing, memory and baseline helpers for the benchmark suite"""
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+class BenchmarkResult:
+    """Result of a single benchmark"""
+
+    def __init__(
+        self,
+        name: str,
+        group: str,
+        rounds: int,
+        total_time: float,
+        peak_memory: int,
+    ):
+        self.name = name
+        self.group = group
+        self.rounds = rounds
+        self.total_time = total_time
+        self.peak_memory = peak_memory
+
+    @property
+    def key(self) -> str:
+        """Get the key used to match the result against a baseline"""
+
+        return f"{self.group}::{self.name}"
+
+    @property
+    def mean(self) -> float:
+        """Get the mean time of a single operation in seconds"""
+
+        return self.total_time / self.rounds
+
+    @property
+    def ops_per_sec(self) -> float:
+        """Get the number of operations per second"""
+
+        if self.total_time == 0:
+            return float("inf")
+        return self.rounds / self.total_time
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a dict"""
+
+        return {
+            "name": self.name,
+            "group": self.group,
+            "rounds": self.rounds,
+            "total_time": self.total_time,
+            "peak_memory": self.peak_memory,
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "BenchmarkResult":
+        """Create a result from a dict"""
+
+        return BenchmarkResult(
+            data["name"],
+            data["group"],
+            data["rounds"],
+            data["total_time"],
+            data["peak_memory"],
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key:<60} {self.ops_per_sec:>12.2f} ops/s "
+            f"{self.mean * 1000:>10.3f} ms {format_size(self.peak_memory):>10}"
+        )
+
+
+class Comparison:
+    """Comparison of a result against its baseline"""
+
+    def __init__(
+        self,
+        current: BenchmarkResult,
+        baseline: Optional[BenchmarkResult],
+        threshold: float,
+    ):
+        self.current = current
+        self.baseline = baseline
+        self.threshold = threshold
+
+    @property
+    def speed_change(self) -> Optional[float]:
+        """Get the relative change in ops/sec, positive is faster"""
+
+        if self.baseline is None:
+            return None
+        return self.current.ops_per_sec / self.baseline.ops_per_sec - 1
+
+    @property
+    def memory_change(self) -> Optional[float]:
+        """Get the relative change in peak memory, positive is more memory"""
+
+        if self.baseline is None or self.baseline.peak_memory == 0:
+            return None
+        return self.current.peak_memory / self.baseline.peak_memory - 1
+
+    def is_regression(self) -> bool:
+        """Check if the result is slower or uses more memory than the threshold allows"""
+
+        speed_change = self.speed_change
+        memory_change = self.memory_change
+        if speed_change is not None and speed_change < -self.threshold:
+            return True
+        if memory_change is not None and memory_change > self.threshold:
+            return True
+        return False
+
+    def __str__(self) -> str:
+        if self.baseline is None:
+            return f"{self.current.key:<60} {'new':>10}"
+        status = "REGRESSION" if self.is_regression() else "ok"
+        memory_change = self.memory_change
+        memory_text = "n/a" if memory_change is None else f"{memory_change:+.1%}"
+        return (
+            f"{self.current.key:<60} {self.speed_change:>+10.1%} speed "
+            f"{memory_text:>10} memory  {status}"
+        )
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes"""
+
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024  # type: ignore
+    return f"{size:.1f}GiB"
+
+
+def measure_time(
+    func: Callable[[], Any], min_time: float, min_rounds: int = 3
+) -> tuple[int, float]:
+    """
+    Run a function repeatedly until min_time has passed
+
+    Args:
+        func (Callable[[], Any]): Function to time
+        min_time (float): Minimum total time to spend in seconds
+        min_rounds (int, optional): Minimum number of calls. Defaults to 3.
+
+    Returns:
+        tuple[int, float]: Number of calls, total time of the calls
+    """
+    rounds = 0
+    total_time = 0.0
+    while rounds < min_rounds or total_time < min_time:
+        start = time.perf_counter()
+        func()
+        total_time += time.perf_counter() - start
+        rounds += 1
+    return rounds, total_time
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> int:
+    """Get the peak memory allocated by a single call of a function"""
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(
+    name: str, group: str, func: Callable[[], Any], min_time: float
+) -> BenchmarkResult:
+    """Time a function and measure its peak memory"""
+
+    func()
+    rounds, total_time = measure_time(func, min_time)
+    peak_memory = measure_peak_memory(func)
+    return BenchmarkResult(name, group, rounds, total_time, peak_memory)
+
+
+def get_baseline_path(name: str) -> str:
+    """Get the path of a named baseline"""
+
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(results: list[BenchmarkResult], name: str) -> str:
+    """Save results as a named baseline"""
+
+    path = get_baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": [result.to_dict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(data, indent=4))
+    return path
+
+
+def load_baseline(name: str) -> Optional[dict[str, BenchmarkResult]]:
+    """Load a named baseline, keyed by result key"""
+
+    path = get_baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.loads(file.read())
+    results = [BenchmarkResult.from_dict(result) for result in data["results"]]
+    return {result.key: result for result in results}
+
+
+def compare(
+    results: list[BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    threshold: float,
+) -> list[Comparison]:
+    """Compare results against a baseline"""
+
+    return [
+        Comparison(result, baseline.get(result.key), threshold) for result in results
+    ]
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    """Format a comparison report"""
+
+    lines = [str(comparison) for comparison in comparisons]
+    regressions = [comparison for comparison in comparisons if comparison.is_regression()]
+    lines.append("")
+    lines.append(f"{len(regressions)} regression(s) in {len(comparisons)} benchmark(s)")
+    return "\n".join(lines)
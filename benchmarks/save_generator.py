@@ -0,0 +1,298 @@
+"""Generate synthetic save files for benchmarks
+
+Usage: python -m benchmarks.save_generator OUTPUT [--game-version 120200] [--cats 700] ...
+"""
+
+import argparse
+import datetime
+import random
+import sys
+from typing import Any, Optional
+
+from BCSFE_Python import helper, parse_save, patcher, serialise_save
+
+
+class SaveOptions:
+    """Parameters of a synthetic save"""
+
+    def __init__(
+        self,
+        game_version: int = 120200,
+        country_code: str = "en",
+        cats: int = 700,
+        event_sub_chapters: int = 600,
+        gauntlet_sub_chapters: int = 40,
+        talent_cats: int = 100,
+        orbs: int = 200,
+        medals: int = 200,
+        login_bonuses: int = 50,
+        purchase_receipts: int = 50,
+        seed: int = 0,
+    ):
+        self.game_version = game_version
+        self.country_code = country_code
+        self.cats = cats
+        self.event_sub_chapters = event_sub_chapters
+        self.gauntlet_sub_chapters = gauntlet_sub_chapters
+        self.talent_cats = talent_cats
+        self.orbs = orbs
+        self.medals = medals
+        self.login_bonuses = login_bonuses
+        self.purchase_receipts = purchase_receipts
+        self.seed = seed
+
+    def scale(self, factor: float) -> "SaveOptions":
+        """Get a copy of the options with every size multiplied by a factor"""
+
+        return SaveOptions(
+            self.game_version,
+            self.country_code,
+            max(1, int(self.cats * factor)),
+            max(1, int(self.event_sub_chapters * factor)),
+            max(1, int(self.gauntlet_sub_chapters * factor)),
+            min(int(self.talent_cats * factor), int(self.cats * factor)),
+            min(int(self.orbs * factor), 0xFFFF),
+            min(int(self.medals * factor), 0xFFFF),
+            int(self.login_bonuses * factor),
+            int(self.purchase_receipts * factor),
+            self.seed,
+        )
+
+
+class TemplateData:
+    """
+    Stand-in for save data that serves every read as the value 1
+
+    Parsing it produces save stats with every section present and every
+    length set to 1, which is then used as the skeleton of a synthetic save.
+    The game version and the year used to find the start of the time data
+    are served at their fixed offsets.
+    """
+
+    def __init__(self, game_version: int, year: int):
+        self.game_version = game_version
+        self.year = year
+        self.end = 0
+
+    def __len__(self) -> int:
+        # makes the trailing extra data empty
+        return self.end + 32
+
+    def __getitem__(self, key: slice) -> bytes:
+        length = key.stop - key.start
+        self.end = max(self.end, key.stop)
+        if key.start == 0 and length == 4:
+            return self.game_version.to_bytes(4, "little")
+        if key.start == 15 and length == 4:
+            return self.year.to_bytes(4, "little")
+        return (1).to_bytes(length, "little") if length else b""
+
+
+def get_skeleton(game_version: int, country_code: str) -> dict[str, Any]:
+    """Get save stats with every section for a game version present"""
+
+    dst = country_code not in ("jp", "ja")
+    data = TemplateData(game_version, 2000)
+    return parse_save.parse_save(data, country_code, dst)  # type: ignore
+
+
+def chunk(data: list[int], size: int) -> list[list[int]]:
+    """Split a list into chunks of a fixed size"""
+
+    return list(helper.chunks(data, size))
+
+
+def get_stage_progress(
+    rng: random.Random, total: int, stages: int, stars: int
+) -> dict[str, Any]:
+    """Get the current lengths and progress of an event style set of chapters"""
+
+    clear_progress = chunk([rng.randint(0, stages) for _ in range(total * stars)], stars)
+    clear_amount = [
+        [[rng.randint(0, 99) for _ in range(stages)] for _ in range(stars)]
+        for _ in range(total)
+    ]
+    unlock_next = chunk([rng.randint(0, 1) for _ in range(total * stars)], stars)
+    lengths = {
+        "Clear": [[0] * stars for _ in range(total)],
+        "total": total,
+        "stages": stages,
+        "stars": stars,
+    }
+    progress = {
+        "Value": {
+            "clear_progress": clear_progress,
+            "clear_amount": clear_amount,
+            "unlock_next": unlock_next,
+        },
+        "Lengths": lengths,
+    }
+    return {"current": lengths, "progress": progress}
+
+
+def set_times(save_stats: dict[str, Any], time: datetime.datetime) -> None:
+    """Set all of the time data to a fixed time"""
+
+    save_stats["time"] = time.isoformat()
+    save_stats["duplicate_time"] = {"yy": time.year, "mm": time.month, "dd": time.day}
+    save_stats["second_time"] = time.isoformat()
+    save_stats["third_time"] = time.isoformat()
+    save_stats["fourth_time"] = time.isoformat()
+    time_stamp = float(int(time.replace(tzinfo=datetime.timezone.utc).timestamp()))
+    save_stats["time_stamp"] = time_stamp
+    save_stats["time_stamps"] = [time_stamp] * len(save_stats["time_stamps"])
+    save_stats["time_stamps_2"] = [time_stamp] * len(save_stats["time_stamps_2"])
+    save_stats["time_stamps_3"] = [time_stamp] * len(save_stats["time_stamps_3"])
+    save_stats["account_created_time_stamp"] = time_stamp
+
+
+def set_cats(save_stats: dict[str, Any], rng: random.Random, total_cats: int) -> None:
+    """Set the per cat data for a number of cats"""
+
+    save_stats["cats"] = [int(rng.random() < 0.8) for _ in range(total_cats)]
+    save_stats["cat_upgrades"] = {
+        "Base": [rng.randint(0, 49) for _ in range(total_cats)],
+        "Plus": [rng.randint(0, 90) for _ in range(total_cats)],
+    }
+    save_stats["current_forms"] = [rng.randint(0, 2) for _ in range(total_cats)]
+    save_stats["unlocked_forms"] = [rng.randint(0, 3) for _ in range(total_cats)]
+    save_stats["gatya_seen_cats"] = [rng.randint(0, 1) for _ in range(total_cats)]
+    save_stats["cat_guide_collected"] = [rng.randint(0, 1) for _ in range(total_cats)]
+
+
+def set_talents(
+    save_stats: dict[str, Any], rng: random.Random, total_cats: int, talent_cats: int
+) -> None:
+    """Set the talents of a number of cats"""
+
+    cat_ids = sorted(rng.sample(range(total_cats), min(talent_cats, total_cats)))
+    save_stats["talents"] = {
+        cat_id: [
+            {"id": talent_id, "level": rng.randint(0, 10)}
+            for talent_id in rng.sample(range(1, 113), 5)
+        ]
+        for cat_id in cat_ids
+    }
+
+
+def set_purchases(
+    save_stats: dict[str, Any], rng: random.Random, total_receipts: int
+) -> None:
+    """Set the purchase receipts"""
+
+    purchases: list[dict[str, Any]] = []
+    for i in range(total_receipts):
+        item_packs = [
+            {
+                "Value": f"jp.co.ponos.battlecats.item{i}_{j}",
+                "unknown_1": rng.randint(0, 1),
+            }
+            for j in range(rng.randint(1, 3))
+        ]
+        purchases.append({"unknown_4": i, "item_packs": item_packs})
+    save_stats["purchases"] = purchases
+
+
+def generate_save_stats(options: SaveOptions) -> dict[str, Any]:
+    """
+    Generate the save stats of a synthetic save
+
+    Args:
+        options (SaveOptions): Parameters of the save
+
+    Returns:
+        dict[str, Any]: The save stats
+    """
+    rng = random.Random(options.seed)
+    save_stats = get_skeleton(options.game_version, options.country_code)
+
+    for key, value in save_stats.items():
+        if key.startswith("gv_") and key[3:].isdigit():
+            value["Value"] = int(key[3:])
+    if save_stats["dst"]:
+        save_stats["game_version_2"]["Value"] = options.game_version
+    set_times(save_stats, datetime.datetime(2022, 6, 1, 12, 30, 15))
+
+    # the number of lineup slots is used to detect dst, 255 is an empty slot
+    save_stats["slots"] = [[255] * 10 for _ in range(15)]
+    save_stats["slot_names"] = [f"Slot {i + 1}" for i in range(15)]
+
+    save_stats["cat_food"]["Value"] = rng.randint(0, 45000)
+    save_stats["xp"]["Value"] = rng.randint(0, 99999999)
+    save_stats["inquiry_code"] = f"{rng.getrandbits(36):09x}"
+    save_stats["token"] = f"{rng.getrandbits(160):040x}"
+    save_stats["unknown_108"] = []
+
+    set_cats(save_stats, rng, options.cats)
+    set_talents(save_stats, rng, options.cats, options.talent_cats)
+
+    event = get_stage_progress(rng, options.event_sub_chapters, 12, 3)
+    event["current"]["unknown"] = 1
+    save_stats["event_current"] = event["current"]
+    save_stats["event_stages"] = event["progress"]
+
+    gauntlet = get_stage_progress(rng, options.gauntlet_sub_chapters, 8, 3)
+    save_stats["gauntlet_current"] = gauntlet["current"]
+    save_stats["gauntlets"] = gauntlet["progress"]
+    save_stats["unknown_77"] = [0] * options.gauntlet_sub_chapters
+
+    max_orbs = 0xFF if options.game_version < 110400 else 999
+    save_stats["talent_orbs"] = {
+        orb_id: rng.randint(1, max_orbs) for orb_id in range(options.orbs)
+    }
+    save_stats["medals"] = {
+        "medal_data_1": list(range(options.medals)),
+        "medal_data_2": {
+            medal_id: rng.randint(0, 1) for medal_id in range(options.medals)
+        },
+    }
+    save_stats["login_bonuses"] = {
+        bonus_id: rng.randint(0, 30) for bonus_id in range(options.login_bonuses)
+    }
+    set_purchases(save_stats, rng, options.purchase_receipts)
+    return save_stats
+
+
+def generate_save(options: SaveOptions) -> bytes:
+    """
+    Generate a synthetic save file and sign it
+
+    Args:
+        options (SaveOptions): Parameters of the save
+
+    Returns:
+        bytes: The save data
+    """
+    save_stats = generate_save_stats(options)
+    save_data = serialise_save.serialize_save(save_stats)
+    return patcher.patch_save_data(save_data, options.country_code)
+
+
+def get_options(args: Optional[list[str]] = None) -> tuple[SaveOptions, str]:
+    """Get the save options and output path from the command line"""
+
+    defaults = SaveOptions()
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.save_generator", description=__doc__
+    )
+    parser.add_argument("output", help="path to write the save to")
+    for name, value in vars(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(value), default=value
+        )
+    parsed = vars(parser.parse_args(args))
+    output = parsed.pop("output")
+    return SaveOptions(**parsed), output
+
+
+def main() -> None:
+    """Generate a save from the command line options"""
+
+    options, output = get_options()
+    save_data = generate_save(options)
+    helper.write_file_bytes(output, save_data)
+    print(f"Wrote {len(save_data)} bytes to {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+import importlib
+from typing import Any
+
 from . import (
     adb_handler,
     feature_handler,
@@ -5,7 +8,6 @@ from . import (
     item,
     server_handler,
     user_input_handler,
-    edits,
     updater,
     patcher,
     managed_item,
@@ -16,3 +18,10 @@ from . import (
     root_handler,
     user_info,
 )
+
+
+def __getattr__(name: str) -> Any:
+    # the edits are only imported when a feature is first used
+    if name == "edits":
+        return importlib.import_module(".edits", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
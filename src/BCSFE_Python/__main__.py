@@ -2,9 +2,11 @@
 import os
 import sys
 import traceback
+from typing import Optional
 
 from . import (
     adb_handler,
+    background_task,
     config_manager,
     feature_handler,
     game_data_getter,
@@ -19,7 +21,6 @@ from . import (
     root_handler,
     locale_handler,
 )
-from .edits.levels import clear_tutorial
 
 
 def print_start_up():
@@ -61,9 +62,16 @@ def print_start_up():
     )
 
 
-def check_update() -> None:
+# seconds to wait for the latest version before showing the menu without it
+UPDATE_CHECK_TIMEOUT = 1.5
+
+
+def check_update(task: Optional[background_task.BackgroundTask] = None) -> None:
     """Check if there is an update available and if so, ask the user if they want to update"""
-    version_info = updater.get_version_info()
+    if task is None:
+        version_info = updater.get_version_info()
+    else:
+        version_info = task.result(UPDATE_CHECK_TIMEOUT)
     locale_manager = locale_handler.LocalManager.from_config()
     if version_info is None:
         helper.colored_text(
@@ -108,11 +116,18 @@ def main():
         "SERVER", "WIPE_TRACKED_ITEMS_ON_START"
     ):
         user_info.UserInfo.clear_all_items()
-    game_data_getter.check_remove_handler()
+    background_task.BackgroundTask.start_new(
+        "game_data_housekeeping", game_data_getter.check_remove_handler
+    )
 
     check_updates = config_manager.get_config_value_category(
         "START_UP", "CHECK_FOR_UPDATES"
     )
+    update_task = None
+    if check_updates:
+        update_task = background_task.BackgroundTask.start_new(
+            "update_check", updater.get_version_info
+        )
     show_start = not config_manager.get_config_value_category(
         "START_UP", "HIDE_START_TEXT"
     )
@@ -121,7 +136,7 @@ def main():
         print()
         helper.print_line_seperator(helper.CYAN, length=200)
     if check_updates:
-        check_update()
+        check_update(update_task)
     if show_start:
         print_start_up()
     if show_start or check_updates:
@@ -228,6 +243,10 @@ def start(path: str) -> None:
             base=helper.RED,
             new=helper.WHITE,
         )
+    from .edits.levels import (  # pylint: disable=import-outside-toplevel
+        clear_tutorial,
+    )
+
     data = helper.load_save_file(path)
     save_stats = data["save_stats"]
     save_data: bytes = data["save_data"]
@@ -258,6 +277,13 @@ def start(path: str) -> None:
 
 
 if __name__ == "__main__":
+    if "--startup-profile" in sys.argv[1:]:
+        from . import startup_profile  # pylint: disable=import-outside-toplevel
+
+        startup_profile.main()
+        sys.exit()
+    if "--offline" in sys.argv[1:]:
+        game_data_getter.set_offline(True)
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,51 @@
+"""Run slow start up work, such as network requests, without blocking the editor"""
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class BackgroundTask:
+    """A function run in a daemon thread, so it never delays exiting"""
+
+    def __init__(self, name: str, function: Callable[..., Any], *args: Any):
+        self.name = name
+        self.function = function
+        self.args = args
+        self.value: Optional[Any] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+
+    def run(self) -> None:
+        try:
+            self.value = self.function(*self.args)
+        except Exception as err:  # pylint: disable=broad-except
+            self.error = err
+        finally:
+            self.done.set()
+
+    def start(self) -> "BackgroundTask":
+        self.thread.start()
+        return self
+
+    def result(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the task to finish
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait, forever if None. Defaults to None.
+
+        Returns:
+            Optional[Any]: The return value, None if the task failed or didn't finish in time
+        """
+        if not self.done.wait(timeout):
+            return None
+        return self.value
+
+    @staticmethod
+    def start_new(
+        name: str, function: Callable[..., Any], *args: Any
+    ) -> "BackgroundTask":
+        """Create and start a task"""
+
+        return BackgroundTask(name, function, *args).start()
@@ -0,0 +1,271 @@
+"""Content addressed store for save backups
+
+Saves are split into chunks at section boundaries, each unique chunk is stored
+once compressed and every backup is a small manifest listing its chunks.
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import threading
+import time
+import zlib
+from typing import Any, Optional, Sequence
+
+from . import config_manager, helper
+
+MAX_GENERATIONS = 100
+ANCHOR_INTERVAL = 8
+FALLBACK_CHUNK_SIZE = 16384
+COMPRESSORS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+_lock = threading.Lock()
+_threads: list[threading.Thread] = []
+
+
+def get_backup_folder() -> str:
+    """Get the path to the backup store"""
+
+    return os.path.join(config_manager.get_app_data_folder(), "backups")
+
+
+def get_save_id(path: str) -> str:
+    """Get the id of the save at a path, used to group its generations"""
+
+    path = os.path.abspath(path)
+    path_hash = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+    return f"{os.path.basename(path)}_{path_hash}"
+
+
+def get_generations_folder(path: str) -> str:
+    """Get the folder containing the manifests of a save"""
+
+    return os.path.join(get_backup_folder(), "saves", get_save_id(path))
+
+
+def get_object_path(chunk_hash: str, compression: str) -> str:
+    """Get the path of a stored chunk"""
+
+    return os.path.join(
+        get_backup_folder(), "objects", chunk_hash[:2], f"{chunk_hash}.{compression}"
+    )
+
+
+def is_anchor(key: str) -> bool:
+    """Check if a section starts a new chunk, decided by its key so chunks stay aligned between generations"""
+
+    return zlib.crc32(key.encode("utf-8")) % ANCHOR_INTERVAL == 0
+
+
+def get_chunks(
+    save_data: bytes, offsets: Optional[Sequence[tuple[str, int, int]]]
+) -> list[bytes]:
+    """
+    Split save data into chunks at section boundaries
+
+    Args:
+        save_data (bytes): The save data
+        offsets (Optional[Sequence[tuple[str, int, int]]]): Section offsets from the parser, fixed size chunks are used if None
+
+    Returns:
+        list[bytes]: The chunks
+    """
+    if not offsets:
+        return [
+            save_data[i : i + FALLBACK_CHUNK_SIZE]
+            for i in range(0, len(save_data), FALLBACK_CHUNK_SIZE)
+        ]
+    cuts = [0]
+    for key, start, _ in offsets:
+        if start > cuts[-1] and is_anchor(key):
+            cuts.append(start)
+    cuts.append(len(save_data))
+    return [save_data[cuts[i] : cuts[i + 1]] for i in range(len(cuts) - 1)]
+
+
+def store_chunk(chunk: bytes, compression: str) -> str:
+    """Store a chunk if it isn't already stored and return its hash"""
+
+    chunk_hash = hashlib.sha256(chunk).hexdigest()
+    path = get_object_path(chunk_hash, compression)
+    if os.path.exists(path):
+        return chunk_hash
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    helper.write_file_bytes(temp_path, COMPRESSORS[compression][0](chunk))
+    os.replace(temp_path, path)
+    return chunk_hash
+
+
+def load_chunk(chunk_hash: str, compression: str) -> bytes:
+    """Load a stored chunk"""
+
+    data = helper.read_file_bytes(get_object_path(chunk_hash, compression))
+    return COMPRESSORS[compression][1](data)
+
+
+def get_generations(path: str) -> list[dict[str, Any]]:
+    """
+    Get the backups of a save, newest first
+
+    Args:
+        path (str): Path of the save
+
+    Returns:
+        list[dict[str, Any]]: The manifest of each backup
+    """
+    folder = get_generations_folder(path)
+    if not os.path.isdir(folder):
+        return []
+    manifests: list[dict[str, Any]] = []
+    for file in sorted(os.listdir(folder), reverse=True):
+        if file.endswith(".json"):
+            manifests.append(
+                json.loads(helper.read_file_string(os.path.join(folder, file)))
+            )
+    return manifests
+
+
+def get_all_manifests() -> list[dict[str, Any]]:
+    """Get the manifests of every backup in the store"""
+
+    folder = os.path.join(get_backup_folder(), "saves")
+    if not os.path.isdir(folder):
+        return []
+    manifests: list[dict[str, Any]] = []
+    for save_id in os.listdir(folder):
+        save_folder = os.path.join(folder, save_id)
+        for file in os.listdir(save_folder):
+            if file.endswith(".json"):
+                manifests.append(
+                    json.loads(helper.read_file_string(os.path.join(save_folder, file)))
+                )
+    return manifests
+
+
+def backup_save(
+    path: str,
+    save_data: bytes,
+    offsets: Optional[Sequence[tuple[str, int, int]]] = None,
+    compression: str = "zlib",
+) -> Optional[dict[str, Any]]:
+    """
+    Store a backup of a save, skipped if it is identical to the newest backup
+
+    Args:
+        path (str): Path of the save
+        save_data (bytes): The save data
+        offsets (Optional[Sequence[tuple[str, int, int]]], optional): Section offsets from the parser. Defaults to None.
+        compression (str, optional): zlib or lzma. Defaults to "zlib".
+
+    Returns:
+        Optional[dict[str, Any]]: The manifest of the backup, None if it was skipped
+    """
+    data_hash = hashlib.sha256(save_data).hexdigest()
+    with _lock:
+        generations = get_generations(path)
+        if generations and generations[0]["sha256"] == data_hash:
+            return None
+        chunks = [
+            store_chunk(chunk, compression) for chunk in get_chunks(save_data, offsets)
+        ]
+        backup_time = time.time()
+        manifest = {
+            "path": os.path.abspath(path),
+            "time": backup_time,
+            "size": len(save_data),
+            "sha256": data_hash,
+            "compression": compression,
+            "chunks": chunks,
+        }
+        folder = get_generations_folder(path)
+        os.makedirs(folder, exist_ok=True)
+        stamp = int(backup_time * 1000)
+        # backups made in the same millisecond mustn't replace each other
+        while os.path.exists(os.path.join(folder, f"{stamp:015d}.json")):
+            stamp += 1
+        file_name = f"{stamp:015d}.json"
+        helper.write_file_string(os.path.join(folder, file_name), json.dumps(manifest))
+        if len(generations) + 1 > MAX_GENERATIONS:
+            prune(path, MAX_GENERATIONS)
+    return manifest
+
+
+def backup_save_async(
+    path: str,
+    save_data: bytes,
+    offsets: Optional[Sequence[tuple[str, int, int]]] = None,
+) -> None:
+    """Store a backup of a save in a background thread"""
+
+    # the thread gets its own copy, so nothing the caller does later changes it
+    section_offsets = tuple(offsets) if offsets is not None else None
+
+    def run():
+        try:
+            backup_save(path, save_data, section_offsets)
+        except Exception as err:  # pylint: disable=broad-except
+            helper.error_text(f"Failed to create a backup of {path}: {err}")
+
+    thread = threading.Thread(target=run, name="backup")
+    thread.start()
+    _threads.append(thread)
+
+
+def wait_for_backups() -> None:
+    """Wait for all background backups to be written"""
+
+    while _threads:
+        _threads.pop().join()
+
+
+def load_backup(manifest: dict[str, Any]) -> bytes:
+    """
+    Load the save data of a backup
+
+    Args:
+        manifest (dict[str, Any]): The manifest of the backup
+
+    Raises:
+        Exception: If the backup is corrupted
+
+    Returns:
+        bytes: The save data
+    """
+    compression = manifest["compression"]
+    save_data = b"".join(load_chunk(chunk, compression) for chunk in manifest["chunks"])
+    if hashlib.sha256(save_data).hexdigest() != manifest["sha256"]:
+        raise Exception("Backup is corrupted")
+    return save_data
+
+
+def prune(path: str, keep: int) -> None:
+    """Delete all but the newest backups of a save and any chunks no longer used"""
+
+    folder = get_generations_folder(path)
+    files = sorted(file for file in os.listdir(folder) if file.endswith(".json"))
+    for file in files[: max(len(files) - keep, 0)]:
+        os.remove(os.path.join(folder, file))
+    collect_garbage()
+
+
+def collect_garbage() -> None:
+    """Delete chunks that no backup uses"""
+
+    used: set[str] = set()
+    for manifest in get_all_manifests():
+        used.update(
+            f"{chunk}.{manifest['compression']}" for chunk in manifest["chunks"]
+        )
+    objects_folder = os.path.join(get_backup_folder(), "objects")
+    if not os.path.isdir(objects_folder):
+        return
+    for prefix in os.listdir(objects_folder):
+        prefix_folder = os.path.join(objects_folder, prefix)
+        for file in os.listdir(prefix_folder):
+            if file not in used:
+                os.remove(os.path.join(prefix_folder, file))
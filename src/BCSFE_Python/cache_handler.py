@@ -0,0 +1,49 @@
+"""Small json values cached in the app data folder with a time to live"""
+
+import json
+import os
+import time
+from typing import Any, Optional
+
+from . import config_manager, helper
+
+
+def get_cache_path(name: str) -> str:
+    """Get the path of a cached value"""
+
+    return os.path.join(config_manager.get_app_data_folder(), "cache", f"{name}.json")
+
+
+def load(name: str, ttl: Optional[float] = None) -> Optional[Any]:
+    """
+    Load a cached value
+
+    Args:
+        name (str): Name of the value
+        ttl (Optional[float], optional): Maximum age in seconds, any age if None. Defaults to None.
+
+    Returns:
+        Optional[Any]: The value, None if it isn't cached or is too old
+    """
+    path = get_cache_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        data = json.loads(helper.read_file_string(path))
+    except (OSError, ValueError):
+        return None
+    if ttl is not None and not 0 <= time.time() - data["time"] < ttl:
+        return None
+    return data["value"]
+
+
+def save(name: str, value: Any) -> None:
+    """Cache a value"""
+
+    path = get_cache_path(name)
+    helper.create_dirs(os.path.dirname(path))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    helper.write_file_string(
+        temp_path, json.dumps({"time": time.time(), "value": value})
+    )
+    os.replace(temp_path, path)
@@ -2,19 +2,112 @@
 Manager for config settings
 """
 import os
-from typing import Any, Optional
+import threading
+import time
+import types
+from typing import Any, Mapping, Optional
 
 import yaml
 
 from . import helper, user_input_handler, locale_handler
 
+# how long a cached config is trusted before checking the mtime of the file again
+CHECK_INTERVAL = 1.0
+
+
+def freeze(value: Any) -> Any:
+    """Get a read-only copy of a loaded config value"""
+
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: freeze(val) for key, val in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(val) for val in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Get an editable copy of a read-only config value"""
+
+    if isinstance(value, Mapping):
+        return {key: thaw(val) for key, val in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(val) for val in value]
+    return value
+
+
+class ConfigCache:
+    """
+    Process wide cache of the config file that is re-read when its mtime changes
+
+    The cached config is read-only and shared by every caller, so a copy must
+    be made to change it.
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.config: Optional[Mapping[str, Any]] = None
+        self.mtime = 0
+        self.last_check = 0.0
+        self.lock = threading.RLock()
+
+    def clear(self) -> None:
+        """Forget the cached path and config"""
+
+        with self.lock:
+            self.path = None
+            self.config = None
+
+    def invalidate(self) -> None:
+        """Forget the cached config so it is read again"""
+
+        with self.lock:
+            self.config = None
+
+    def get_path(self) -> str:
+        """Get the path to the config file"""
+
+        with self.lock:
+            if self.path is None or not os.path.exists(self.path):
+                self.path = find_config_path()
+            return self.path
+
+    def get(self) -> Mapping[str, Any]:
+        """Get the read-only config, only touching the file system if the cache may be stale"""
+
+        with self.lock:
+            now = time.monotonic()
+            if self.config is not None and now - self.last_check < CHECK_INTERVAL:
+                return self.config
+            path = self.get_path()
+            mtime = os.stat(path).st_mtime_ns
+            if self.config is None or mtime != self.mtime:
+                with open(path, "r", encoding="utf-8") as file:
+                    self.config = freeze(yaml.safe_load(file))
+                self.mtime = mtime
+            self.last_check = now
+            return self.config  # type: ignore
+
+    def write(self, config: dict[str, Any]) -> None:
+        """Write the config to the file and keep a read-only copy cached"""
+
+        with self.lock:
+            path = self.get_path()
+            with open(path, "w", encoding="utf-8") as file:
+                yaml.safe_dump(config, file)
+            self.config = freeze(config)
+            self.mtime = os.stat(path).st_mtime_ns
+            self.last_check = time.monotonic()
+
+
+config_cache = ConfigCache()
+
 
 def get_config_value_category(category: str, key: str) -> Any:
     """
     Returns the value of the given key in the config file.
     """
     config = get_config_file()
-    category_data: Optional[dict[str, Any]] = config.get(category)
+    category_data: Optional[Mapping[str, Any]] = config.get(category)
     if category_data is None:
         create_config_file()
         return get_config_value_category(category, key)
@@ -25,23 +118,30 @@ def get_config_value_category(category: str, key: str) -> Any:
     return key_data
 
 
-def get_config_file() -> dict[str, Any]:
+def get_config_file() -> Mapping[str, Any]:
     """
     Get the config file
 
     Returns:
-        dict: Config file
+        Mapping[str, Any]: Config file, read-only as it is shared by every caller
     """
-    config_file = get_config_path()
-    with open(config_file, "r", encoding="utf-8") as file:
-        config = yaml.safe_load(file)
-    return config
+    return config_cache.get()
 
 
 def get_config_path() -> str:
     """
     Get the path to the config file
 
+    Returns:
+        str: Path to config file
+    """
+    return config_cache.get_path()
+
+
+def find_config_path() -> str:
+    """
+    Find the path to the config file from config_path.txt, creating the config file if needed
+
     Returns:
         str: Path to config file
     """
@@ -66,6 +166,7 @@ def set_config_path(path: str):
         path (str): Path to config file
     """
     helper.write_file_string(helper.get_file("config_path.txt"), path)
+    config_cache.clear()
     if not os.path.exists(path):
         create_config_file()
 
@@ -96,10 +197,10 @@ def set_config_setting_category(category: str, key: str, value: Any) -> None:
         setting (str): Setting to set
         value (Any): Value to set setting to
     """
-    config = get_config_file()
-    config[category][key] = value
-    with open(get_config_path(), "w", encoding="utf-8") as file:
-        yaml.safe_dump(config, file)
+    with config_cache.lock:
+        config = thaw(get_config_file())
+        config[category][key] = value
+        config_cache.write(config)
 
 
 def set_config_setting(setting: str, value: Any) -> None:
@@ -110,10 +211,10 @@ def set_config_setting(setting: str, value: Any) -> None:
         setting (str): Setting to set
         value (Any): Value to set setting to
     """
-    config = get_config_file()
-    config[setting] = value
-    with open(get_config_path(), "w", encoding="utf-8") as file:
-        yaml.safe_dump(config, file)
+    with config_cache.lock:
+        config = thaw(get_config_file())
+        config[setting] = value
+        config_cache.write(config)
 
 
 def create_config_file(config_path: Optional[str] = None) -> None:
@@ -157,6 +258,7 @@ SERVER:
 """
 
     helper.write_file_string(config_file, file_data)
+    config_cache.invalidate()
 
 
 def get_app_data_folder() -> str:
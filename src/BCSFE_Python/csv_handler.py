@@ -1,7 +1,7 @@
 """Handler for parsing CSV files."""
 
-
-from typing import Any
+import array
+from typing import Any, Iterator, Union
 
 
 def remove_pkcs7_padding(data: bytes) -> bytes:
@@ -29,15 +29,127 @@ def remove_comments(data: str) -> str:
     return "\n".join(data_ls)
 
 
-def parse_csv(data: str, delimeter: str = ",") -> list[list[str]]:
+def iter_rows(data: Union[str, bytes], delimeter: str = ",") -> Iterator[list[str]]:
+    """
+    Parse CSV data a row at a time, in a single pass
+
+    In-line comments, surrounding whitespace, empty items and empty rows are
+    removed.
+
+    Args:
+        data (Union[str, bytes]): The CSV data, bytes are decoded as utf-8
+        delimeter (str, optional): The delimeter. Defaults to ",".
+
+    Yields:
+        Iterator[list[str]]: The items of each row
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    for line in data.split("\n"):
+        comment = line.find("//")
+        if comment != -1:
+            line = line[:comment]
+        row = line.strip().split(delimeter)
+        if "" in row:
+            row = [item for item in row if item != ""]
+        if row:
+            yield row
+
+
+def parse_int_row(row: list[Any]) -> list[Any]:
+    """Turn the items of a row that are numbers into ints"""
+
+    try:
+        return list(map(int, row))
+    except ValueError:
+        pass
+    new_row: list[Any] = []
+    for item in row:
+        try:
+            new_row.append(int(item))
+        except ValueError:
+            new_row.append(item.decode("utf-8") if isinstance(item, bytes) else item)
+    return new_row
+
+
+def iter_int_rows(data: Union[str, bytes], delimeter: str = ",") -> Iterator[list[Any]]:
+    """
+    Parse CSV data a row at a time, turning the items that are numbers into ints
+
+    Bytes are parsed without decoding them first, only lines with non ascii
+    characters and items that aren't numbers are decoded.
+
+    Args:
+        data (Union[str, bytes]): The CSV data
+        delimeter (str, optional): The delimeter. Defaults to ",".
+
+    Yields:
+        Iterator[list[Any]]: The items of each row
+    """
+    if isinstance(data, str):
+        for row in iter_rows(data, delimeter):
+            yield parse_int_row(row)
+        return
+    delimeter_bytes = delimeter.encode("utf-8")
+    for line in data.split(b"\n"):
+        if not line.isascii():
+            # str.strip removes unicode whitespace too
+            yield from iter_int_rows(line.decode("utf-8"), delimeter)
+            continue
+        comment = line.find(b"//")
+        if comment != -1:
+            line = line[:comment]
+        row = line.strip().split(delimeter_bytes)
+        if b"" in row:
+            row = [item for item in row if item != b""]
+        if row:
+            yield parse_int_row(row)
+
+
+def parse_csv(data: Union[str, bytes], delimeter: str = ",") -> list[list[str]]:
     """Parse CSV data."""
 
-    data = remove_comments(data)
-    data_ls = data.split("\n")
-    data_ls_ls = [line.split(delimeter) for line in data_ls]
-    data_ls_ls = remove_empty_items(data_ls_ls)
-    data_ls_ls = [line for line in data_ls_ls if line != []]
-    return data_ls_ls
+    return list(iter_rows(data, delimeter))
+
+
+def parse_int_csv(data: Union[str, bytes], delimeter: str = ",") -> list[list[Any]]:
+    """Parse CSV data, turning the items that are numbers into ints."""
+
+    return list(iter_int_rows(data, delimeter))
+
+
+def parse_int_columns(
+    data: Union[str, bytes],
+    delimeter: str = ",",
+    typecode: str = "q",
+    fill: int = 0,
+) -> list["array.array[int]"]:
+    """
+    Parse CSV data of ints into columns
+
+    Args:
+        data (Union[str, bytes]): The CSV data
+        delimeter (str, optional): The delimeter. Defaults to ",".
+        typecode (str, optional): The array typecode of the columns. Defaults to "q".
+        fill (int, optional): The value of the items missing from shorter rows. Defaults to 0.
+
+    Raises:
+        ValueError: If an item isn't a number
+
+    Returns:
+        list[array.array]: Each column, with an item for every row
+    """
+    columns: list["array.array[int]"] = []
+    for row_count, row in enumerate(iter_int_rows(data, delimeter)):
+        while len(columns) < len(row):
+            columns.append(array.array(typecode, [fill] * row_count))
+        for column, item in zip(columns, row):
+            if isinstance(item, str):
+                raise ValueError(f"Invalid int {item!r} on row {row_count}")
+            column.append(item)
+        for column in columns[len(row) :]:
+            column.append(fill)
+    return columns
 
 
 def remove_empty_items(data: list[list[Any]]) -> list[list[Any]]:
@@ -1 +1,16 @@
-from . import basic, gamototo, levels, other, cats, save_management
\ No newline at end of file
+"""Editor features, each category is imported when first accessed"""
+
+import importlib
+from typing import Any
+
+SUBMODULES = ["basic", "gamototo", "levels", "other", "cats", "save_management"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + SUBMODULES)
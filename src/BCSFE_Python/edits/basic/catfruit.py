@@ -18,12 +18,7 @@ def get_fruit_names(is_jp: bool) -> list[str]:
     if file_data is None:
         helper.error_text("Failed to get matatabi data")
         return []
-    fruit_ids = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-            delimeter="\t",
-        )
-    )[1:]
+    fruit_ids = csv_handler.parse_int_csv(file_data, delimeter="\t")[1:]
     fruit_names: list[str] = []
     for fruit in fruit_ids:
         fruit_names.append(item_names[int(fruit[0])][0])
@@ -11,12 +11,7 @@ def get_catseye_ids(is_jp: bool) -> list[int]:
     if file_data is None:
         helper.error_text("Failed to get catseye ids")
         return []
-    items = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-            ",",
-        )[1:]
-    )
+    items = csv_handler.parse_int_csv(file_data)[1:]
     catseye_ids: dict[int, int] = {}
     for item_id, item_data in enumerate(items):
         category = item_data[6]
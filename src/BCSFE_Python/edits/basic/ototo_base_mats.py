@@ -18,11 +18,7 @@ def get_base_mats_names(is_jp: bool) -> list[str]:
     if file_data is None:
         helper.error_text("Failed to get gatya item buy data")
         return []
-    all_items = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-        )
-    )[1:]
+    all_items = csv_handler.parse_int_csv(file_data)[1:]
     base_mat_indexes: dict[int, str] = {}
     for item_id, item in enumerate(all_items):
         if item[6] == 7:
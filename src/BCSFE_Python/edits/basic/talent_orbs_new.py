@@ -1,6 +1,13 @@
 import json
 from typing import Any, Optional
-from BCSFE_Python import game_data_getter, csv_handler, helper, user_input_handler
+from BCSFE_Python import (
+    game_data_archive,
+    game_data_getter,
+    csv_handler,
+    helper,
+    table_cache,
+    user_input_handler,
+)
 
 
 class RawOrbInfo:
@@ -92,18 +99,47 @@ class OrbInfoList:
     grade_list_file_name = "DataLocal/equipmentgrade.csv"
     attribute_list_file_name = "resLocal/attribute_explonation.tsv"
     effect_list_file_name = "resLocal/equipment_explonation.tsv"
+    # bump when the layout of the orb classes changes so stored lists are rebuilt
+    LAYOUT_VERSION = 1
 
     def __init__(self, orb_info_list: list[OrbInfo]):
-        """Initialize the OrbInfoList class
+        """Initialize the OrbInfoList class, indexing the orbs by id and by their components
 
         Args:
             orb_info_list (list[OrbInfo]): The list of OrbInfo
         """
         self.orb_info_list = orb_info_list
+        self.orbs_by_id: dict[int, OrbInfo] = {}
+        self.orbs_by_components: dict[tuple[str, str, str], OrbInfo] = {}
+        self.grade_index: dict[str, list[int]] = {}
+        self.attribute_index: dict[str, list[int]] = {}
+        self.effect_prefix_index: dict[str, list[int]] = {}
+        for index, orb in enumerate(orb_info_list):
+            self.orbs_by_id.setdefault(orb.raw_orb_info.orb_id, orb)
+            self.orbs_by_components.setdefault(
+                (orb.grade, orb.attribute, orb.effect), orb
+            )
+            self.grade_index.setdefault(orb.grade.lower(), []).append(index)
+            self.attribute_index.setdefault(orb.attribute.lower(), []).append(index)
+            self.effect_prefix_index.setdefault(
+                OrbInfoList.get_effect_prefix(orb.effect), []
+            ).append(index)
+
+    @staticmethod
+    def get_effect_prefix(effect: str) -> str:
+        """Get the part of an effect fuzzy searches match, its first word lowercased
+
+        Args:
+            effect (str): The effect of the orb
+
+        Returns:
+            str: The first word of the effect lowercased
+        """
+        return effect.lower().split(" ")[0]
 
     @staticmethod
     def create(is_jp: bool) -> Optional["OrbInfoList"]:
-        """Create an OrbInfoList
+        """Create an OrbInfoList, built once per game version and kept on disk
 
         Args:
             is_jp (bool): Whether the game is in Japanese
@@ -111,29 +147,44 @@ class OrbInfoList:
         Returns:
             Optional[OrbInfoList]: The OrbInfoList
         """
-        json_data_file = game_data_getter.get_file_latest_path(
-            OrbInfoList.equipment_data_file_name, is_jp
-        )
-        grade_list_file = game_data_getter.get_file_latest_path(
-            OrbInfoList.grade_list_file_name, is_jp
-        )
-        attribute_list_file = game_data_getter.get_file_latest_path(
-            OrbInfoList.attribute_list_file_name, is_jp
-        )
-        equipment_list_file = game_data_getter.get_file_latest_path(
-            OrbInfoList.effect_list_file_name, is_jp
-        )
-        if (
-            json_data_file is None
-            or grade_list_file is None
-            or attribute_list_file is None
-            or equipment_list_file is None
-        ):
+        paths = [
+            OrbInfoList.equipment_data_file_name,
+            OrbInfoList.grade_list_file_name,
+            OrbInfoList.attribute_list_file_name,
+            OrbInfoList.effect_list_file_name,
+        ]
+        version = game_data_getter.get_latest_version(is_jp)
+        if version is None:
             return None
-        json_data = json_data_file.decode("utf-8")
-        grade_list = grade_list_file.decode("utf-8")
-        attribute_list = attribute_list_file.decode("utf-8")
-        equipment_list = equipment_list_file.decode("utf-8")
+        game_data_getter.download_files_latest(paths, is_jp)
+        manifest = game_data_archive.get_manifest(version)
+        if any(path not in manifest for path in paths):
+            return None
+        return table_cache.get_game_data_table(
+            version,
+            paths,
+            "orb_info_list",
+            OrbInfoList.LAYOUT_VERSION,
+            lambda: OrbInfoList.parse(
+                *[(manifest.get(path) or b"").decode("utf-8") for path in paths]
+            ),
+        )
+
+    @staticmethod
+    def parse(
+        json_data: str, grade_list: str, attribute_list: str, equipment_list: str
+    ) -> "OrbInfoList":
+        """Parse the equipment data and the names of its components
+
+        Args:
+            json_data (str): Raw data of equipmentlist.json
+            grade_list (str): Raw data of the grade list
+            attribute_list (str): Raw data of the attribute list
+            equipment_list (str): Raw data of the effect list
+
+        Returns:
+            OrbInfoList: The OrbInfoList
+        """
         raw_orbs = OrbInfoList.parse_json_data(json_data)
         orbs = OrbInfoList.load_names(
             raw_orbs, grade_list, attribute_list, equipment_list
@@ -198,9 +249,7 @@ class OrbInfoList:
         Returns:
             Optional[OrbInfo]: The OrbInfo
         """
-        if orb_id >= len(self.orb_info_list):
-            return None
-        return self.orb_info_list[orb_id]
+        return self.orbs_by_id.get(orb_id)
 
     def get_orb_from_components(
         self,
@@ -218,14 +267,7 @@ class OrbInfoList:
         Returns:
             Optional[OrbInfo]: The OrbInfo
         """
-        for orb in self.orb_info_list:
-            if (
-                orb.grade == grade
-                and orb.attribute == attribute
-                and orb.effect == effect
-            ):
-                return orb
-        return None
+        return self.orbs_by_components.get((grade, attribute, effect))
 
     def get_orbs_from_component_fuzzy(
         self,
@@ -243,18 +285,22 @@ class OrbInfoList:
         Returns:
             list[OrbInfo]: The list of OrbInfo
         """
-        orbs: list[OrbInfo] = []
-        for orb in self.orb_info_list:
-            if (
-                (orb.grade.lower() == grade.lower() or grade == "*")
-                and (orb.attribute.lower() == attribute.lower() or attribute == "*")
-                and (
-                    orb.effect.lower().split(" ")[0] == effect.lower().split(" ")[0]
-                    or effect == "*"
-                )
-            ):
-                orbs.append(orb)
-        return orbs
+        postings: list[list[int]] = []
+        if grade != "*":
+            postings.append(self.grade_index.get(grade.lower(), []))
+        if attribute != "*":
+            postings.append(self.attribute_index.get(attribute.lower(), []))
+        if effect != "*":
+            postings.append(
+                self.effect_prefix_index.get(OrbInfoList.get_effect_prefix(effect), [])
+            )
+        if not postings:
+            return list(self.orb_info_list)
+        postings.sort(key=len)
+        indexes = set(postings[0])
+        for posting in postings[1:]:
+            indexes.intersection_update(posting)
+        return [self.orb_info_list[index] for index in sorted(indexes)]
 
     def get_all_grades(self) -> list[str]:
         """Get all the grades
@@ -326,9 +372,8 @@ class SaveOrbs:
             return None
         orbs: dict[int, SaveOrb] = {}
         for orb_id, amount in save_stats["talent_orbs"].items():
-            try:
-                orb_info = orb_info_list.orb_info_list[int(orb_id)]
-            except IndexError:
+            orb_info = orb_info_list.get_orb_info(int(orb_id))
+            if orb_info is None:
                 orb_info = OrbInfo.create_unknown(int(orb_id))
             orbs[int(orb_id)] = SaveOrb(orb_info, amount)
 
@@ -8,4 +8,6 @@ from . import (
     upgrade_blue,
     cat_id_selector,
     cat_helper,
+    cat_name_index,
+    bulk_cats,
 )
@@ -0,0 +1,121 @@
+"""Edits applied to many cats at once"""
+
+from typing import Any, Sequence
+
+
+class CatMask:
+    """
+    The cats an edit applies to, out of all of the cats of a save
+
+    The selected cats are kept as a mask and as runs of consecutive ids, so
+    an edit can write each run with one slice assignment instead of one cat
+    at a time.
+    """
+
+    def __init__(self, mask: bytearray):
+        self.mask = mask
+        self.runs: list[tuple[int, int]] = []
+        start = mask.find(1)
+        while start != -1:
+            stop = mask.find(0, start)
+            if stop == -1:
+                stop = len(mask)
+            self.runs.append((start, stop))
+            start = mask.find(1, stop)
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+    def get_ids(self) -> list[int]:
+        """Get the ids of the selected cats, in order"""
+
+        ids: list[int] = []
+        for start, stop in self.runs:
+            ids.extend(range(start, stop))
+        return ids
+
+    def get_count(self) -> int:
+        """Get the number of selected cats"""
+
+        return sum(stop - start for start, stop in self.runs)
+
+    @staticmethod
+    def from_ids(ids: Sequence[int], length: int) -> "CatMask":
+        """
+        Select cats by id
+
+        Args:
+            ids (Sequence[int]): The ids of the cats, ids that are out of range are ignored
+            length (int): The number of cats in the save
+
+        Returns:
+            CatMask: The selected cats
+        """
+        mask = bytearray(length)
+        for cat_id in ids:
+            if 0 <= cat_id < length:
+                mask[cat_id] = 1
+        return CatMask(mask)
+
+    @staticmethod
+    def select_all(length: int) -> "CatMask":
+        """Select every cat"""
+
+        return CatMask(bytearray(b"\x01" * length))
+
+
+def fill(values: list[Any], mask: CatMask, value: Any) -> None:
+    """Set the value of every selected cat"""
+
+    for start, stop in mask.runs:
+        stop = min(stop, len(values))
+        if start < stop:
+            values[start:stop] = [value] * (stop - start)
+
+
+def copy_from(values: list[Any], mask: CatMask, source: Sequence[Any]) -> None:
+    """Set the value of every selected cat to its value in another list, if it has one"""
+
+    for start, stop in mask.runs:
+        stop = min(stop, len(values), len(source))
+        if start < stop:
+            values[start:stop] = source[start:stop]
+
+
+def maximum(values: list[int], other: Sequence[int]) -> None:
+    """Set each value to the larger of it and the value at the same position in another list"""
+
+    length = min(len(values), len(other))
+    values[:length] = list(map(max, values[:length], other[:length]))
+
+
+def replace(values: list[Any], old: Any, new: Any) -> None:
+    """Replace every value that is equal to old with new"""
+
+    values[:] = [new if value == old else value for value in values]
+
+
+def get_level_caps(
+    base_levels: Sequence[int],
+    max_levels: Sequence[Sequence[int]],
+    offset: int,
+) -> list[int]:
+    """
+    Get how far the level cap of each cat is raised
+
+    Args:
+        base_levels (Sequence[int]): The base level of each cat, 0 for level 1
+        max_levels (Sequence[Sequence[int]]): Limits on the base level of each cat, cats missing from a limit are limited to 0
+        offset (int): The base level after which the cap is raised
+
+    Returns:
+        list[int]: The amount the level cap of each cat is raised by, never below 0
+    """
+    length = len(base_levels)
+    limits = [
+        list(limit[:length]) + [0] * (length - len(limit)) for limit in max_levels
+    ]
+    levels = list(base_levels)
+    for limit in limits:
+        levels = list(map(min, levels, limit))
+    return [level - offset if level > offset else 0 for level in levels]
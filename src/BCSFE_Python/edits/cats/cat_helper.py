@@ -1,9 +1,36 @@
 """Helper for cats"""
-from typing import Any, Optional
+import array
+from typing import Any, Optional, Sequence
 
-from ... import csv_handler, game_data_getter, helper
+from ... import game_table, helper
 from ..levels import main_story, uncanny
 
+LEGENDS = frozenset(
+    [
+        24,
+        25,
+        130,
+        172,
+        268,
+        323,
+        352,
+        383,
+        426,
+        437,
+        462,
+        464,
+        532,
+        554,
+        568,
+        613,
+        622,
+        653,
+    ]
+)
+CRAZED = frozenset([91, 92, 93, 94, 95, 96, 97, 98, 99])
+# the base level after which a level raises the level cap, 30 = 29
+LEVEL_CAP_START = 29
+
 TYPES = [
     "Normal",
     "Special",
@@ -24,7 +51,7 @@ def get_level_cap_increase_amount(cat_base_level: int) -> int:
     Returns:
         int: The amount of levels to increase the level cap by
     """
-    return max(0, cat_base_level - 29)
+    return max(0, cat_base_level - LEVEL_CAP_START)
 
 
 def get_unit_max_levels(is_jp: bool) -> Optional[tuple[list[int], list[int]]]:
@@ -35,26 +62,23 @@ def get_unit_max_levels(is_jp: bool) -> Optional[tuple[list[int], list[int]]]:
         is_jp (bool): If the game is in Japanese
 
     Returns:
-        tuple[list[int], list[int]]: The max base and plus levels for all cats
+        tuple[list[int], list[int]]: The max base and plus levels for all cats, copies of the shared table
     """
-    file_data = game_data_getter.get_file_latest("DataLocal", "unitbuy.csv", is_jp)
-    if file_data is None:
+    table = game_table.get_game_table("DataLocal", "unitbuy.csv", is_jp)
+    if table is None:
         helper.error_text("Could not get unitbuy.csv")
         return None
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
-    max_base_level = helper.copy_first_n(data, 50)
-    max_plus_level = helper.copy_first_n(data, 51)
-    return max_base_level, max_plus_level
+    return list(table.get_column(50)), list(table.get_column(51))
 
 
 def get_unit_max_level(
-    data: tuple[list[int], list[int]], cat_id: int
+    data: tuple[Sequence[int], Sequence[int]], cat_id: int
 ) -> tuple[int, int]:
     """
     Get the max base and plus levels for a cat
 
     Args:
-        data (tuple[list[int], list[int]]): The max base and plus levels for all cats
+        data (tuple[Sequence[int], Sequence[int]]): The max base and plus levels for all cats
         cat_id (int): The id of the cat
 
     Returns:
@@ -69,15 +93,11 @@ def get_unit_max_level(
 def get_rarities(is_jp: bool) -> list[int]:
     """Get all cat ids of each rarity"""
 
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "unitbuy.csv", is_jp
-    )
-    if file_data is None:
+    table = game_table.get_game_table("DataLocal", "unitbuy.csv", is_jp)
+    if table is None:
         helper.error_text("Could not get unitbuy.csv")
         return []
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
-    rarity_ids = helper.copy_first_n(data, 13)
-    return rarity_ids
+    return list(table.get_column(13))
 
 
 def get_rarity(rarity_ids: list[int], is_jp: bool) -> list[int]:
@@ -102,29 +122,7 @@ def is_legend(cat_id: int) -> bool:
     Returns:
         bool: If the cat is a legend
     """
-    legends = [
-        24,
-        25,
-        130,
-        172,
-        268,
-        323,
-        352,
-        383,
-        426,
-        437,
-        462,
-        464,
-        532,
-        554,
-        568,
-        613,
-        622,
-        653,
-    ]
-    if cat_id in legends:
-        return True
-    return False
+    return cat_id in LEGENDS
 
 
 def is_crazed(cat_id: int) -> bool:
@@ -137,33 +135,57 @@ def is_crazed(cat_id: int) -> bool:
     Returns:
         bool: If the cat is crazed
     """
-    crazed = [
-        91,
-        92,
-        93,
-        94,
-        95,
-        96,
-        97,
-        98,
-        99,
-    ]
-    if cat_id in crazed:
-        return True
-    return False
+    return cat_id in CRAZED
 
 
-def get_max_cat_level_normal(save_stats: dict[str, Any]) -> int:
+class CapContext:
+    """
+    The progress of an account that decides how far its cats can be upgraded
+
+    It is computed once per save, so the caps of every cat can be worked out
+    without going over all of the cats again for each one.
+    """
+
+    def __init__(
+        self,
+        user_rank: int,
+        eoc_cleared_2: bool,
+        ancient_curse_clear: bool,
+    ):
+        self.user_rank = user_rank
+        self.eoc_cleared_2 = eoc_cleared_2
+        self.ancient_curse_clear = ancient_curse_clear
+        self.catseyes = user_rank >= 1600
+
+    @staticmethod
+    def from_save_stats(save_stats: dict[str, Any]) -> "CapContext":
+        """Get the progress of the account of a save"""
+
+        return CapContext(
+            helper.calculate_user_rank(save_stats),
+            main_story.has_cleared_chapter(save_stats, 1),
+            uncanny.is_ancient_curse_clear(save_stats),
+        )
+
+
+def get_max_cat_level_normal(
+    save_stats: dict[str, Any], context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a normal cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a normal cat
     """
-    if main_story.has_cleared_chapter(save_stats, 1):
+    if context is None:
+        eoc_cleared_2 = main_story.has_cleared_chapter(save_stats, 1)
+    else:
+        eoc_cleared_2 = context.eoc_cleared_2
+    if eoc_cleared_2:
         return 20
     return 10
 
@@ -181,157 +203,167 @@ def catseyes_unlocked(save_stats: dict[str, Any]) -> bool:
     return helper.calculate_user_rank(save_stats) >= 1600
 
 
-def get_max_cat_level_special(save_stats: dict[str, Any], cat_id: int) -> int:
+def get_max_cat_level_special(
+    save_stats: dict[str, Any], cat_id: int, context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a special cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
         cat_id (int): The id of the cat
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a special cat
     """
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
     legend = is_legend(cat_id)
-    acient_curse_clear = uncanny.is_ancient_curse_clear(save_stats)
-    user_rank = helper.calculate_user_rank(save_stats)
-    catseyes = catseyes_unlocked(save_stats)
-    eoc_cleared_2 = main_story.has_cleared_chapter(save_stats, 1)
 
-    if not eoc_cleared_2:
+    if not context.eoc_cleared_2:
         return 10
-    if user_rank < 1600:
+    if context.user_rank < 1600:
         return 20
-    if not catseyes:
+    if not context.catseyes:
         return 30
-    if not acient_curse_clear and not legend:
+    if not context.ancient_curse_clear and not legend:
         return 40
-    if not acient_curse_clear and legend:
+    if not context.ancient_curse_clear and legend:
         return 30
-    if acient_curse_clear and legend:
+    if context.ancient_curse_clear and legend:
         return 40
     return 50
 
 
-def get_max_cat_level_rare(save_stats: dict[str, Any]) -> int:
+def get_max_cat_level_rare(
+    save_stats: dict[str, Any], context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a cat
     """
-    user_rank = helper.calculate_user_rank(save_stats)
-    catseyes = catseyes_unlocked(save_stats)
-    cleared_eoc_2 = main_story.has_cleared_chapter(save_stats, 1)
-    acient_curse_clear = uncanny.is_ancient_curse_clear(save_stats)
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
 
-    if not cleared_eoc_2:
+    if not context.eoc_cleared_2:
         return 10
-    if user_rank < 900:
+    if context.user_rank < 900:
         return 20
-    if user_rank < 1200:
+    if context.user_rank < 1200:
         return 25
-    if not catseyes:
+    if not context.catseyes:
         return 30
-    if not acient_curse_clear:
+    if not context.ancient_curse_clear:
         return 40
     return 50
 
 
-def get_max_level_super_rare(save_stats: dict[str, Any], cat_id: int) -> int:
+def get_max_level_super_rare(
+    save_stats: dict[str, Any], cat_id: int, context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a super rare cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
         cat_id (int): The id of the cat
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a super rare cat
     """
-    user_rank = helper.calculate_user_rank(save_stats)
-    cleared_eoc_2 = main_story.has_cleared_chapter(save_stats, 1)
-    acient_curse_clear = uncanny.is_ancient_curse_clear(save_stats)
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
     crazed = is_crazed(cat_id)
-    catseyes = catseyes_unlocked(save_stats)
 
-    if not cleared_eoc_2:
+    if not context.eoc_cleared_2:
         return 10
-    if crazed and user_rank < 3600:
+    if crazed and context.user_rank < 3600:
         return 20
-    if not crazed and user_rank < 1000:
+    if not crazed and context.user_rank < 1000:
         return 20
-    if crazed and user_rank < 3650:
+    if crazed and context.user_rank < 3650:
         return 25
-    if not crazed and user_rank < 1300:
+    if not crazed and context.user_rank < 1300:
         return 25
-    if not catseyes:
+    if not context.catseyes:
         return 30
-    if not acient_curse_clear:
+    if not context.ancient_curse_clear:
         return 40
     return 50
 
 
-def get_max_level_uber_rare(save_stats: dict[str, Any]) -> int:
+def get_max_level_uber_rare(
+    save_stats: dict[str, Any], context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a uber rare cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a uber rare cat
     """
-    user_rank = helper.calculate_user_rank(save_stats)
-    cleared_eoc_2 = main_story.has_cleared_chapter(save_stats, 1)
-    acient_curse_clear = uncanny.is_ancient_curse_clear(save_stats)
-    catseyes = catseyes_unlocked(save_stats)
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
 
-    if not cleared_eoc_2:
+    if not context.eoc_cleared_2:
         return 10
-    if user_rank < 1100:
+    if context.user_rank < 1100:
         return 20
-    if user_rank < 1400:
+    if context.user_rank < 1400:
         return 25
-    if not catseyes:
+    if not context.catseyes:
         return 30
-    if not acient_curse_clear:
+    if not context.ancient_curse_clear:
         return 40
     return 50
 
 
-def get_max_level_legend_rare(save_stats: dict[str, Any]) -> int:
+def get_max_level_legend_rare(
+    save_stats: dict[str, Any], context: Optional[CapContext] = None
+) -> int:
     """
     Get the max level a legend rare cat can be upgraded to
 
     Args:
         save_stats (dict[str, Any]): The save stats
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a legend rare cat
     """
-    user_rank = helper.calculate_user_rank(save_stats)
-    cleared_eoc_2 = main_story.has_cleared_chapter(save_stats, 1)
-    acient_curse_clear = uncanny.is_ancient_curse_clear(save_stats)
-    catseyes = catseyes_unlocked(save_stats)
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
 
-    if not cleared_eoc_2:
+    if not context.eoc_cleared_2:
         return 10
-    if user_rank < 1110:
+    if context.user_rank < 1110:
         return 20
-    if user_rank < 1410:
+    if context.user_rank < 1410:
         return 25
-    if not catseyes:
+    if not context.catseyes:
         return 30
-    if not acient_curse_clear:
+    if not context.ancient_curse_clear:
         return 40
     return 50
 
 
-def get_max_level(save_stats: dict[str, Any], rarity_index: int, cat_id: int) -> int:
+def get_max_level(
+    save_stats: dict[str, Any],
+    rarity_index: int,
+    cat_id: int,
+    context: Optional[CapContext] = None,
+) -> int:
     """
     Get the max level a cat can be upgraded to
 
@@ -339,20 +371,53 @@ def get_max_level(save_stats: dict[str, Any], rarity_index: int, cat_id: int) ->
         save_stats (dict[str, Any]): The save stats
         rarity_index (int): The rarity index of the cat
         cat_id (int): The id of the cat
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
 
     Returns:
         int: The max level of a cat
     """
     if rarity_index == 0:
-        return get_max_cat_level_normal(save_stats)
+        return get_max_cat_level_normal(save_stats, context)
     if rarity_index == 1:
-        return get_max_cat_level_special(save_stats, cat_id)
+        return get_max_cat_level_special(save_stats, cat_id, context)
     if rarity_index == 2:
-        return get_max_cat_level_rare(save_stats)
+        return get_max_cat_level_rare(save_stats, context)
     if rarity_index == 3:
-        return get_max_level_super_rare(save_stats, cat_id)
+        return get_max_level_super_rare(save_stats, cat_id, context)
     if rarity_index == 4:
-        return get_max_level_uber_rare(save_stats)
+        return get_max_level_uber_rare(save_stats, context)
     if rarity_index == 5:
-        return get_max_level_legend_rare(save_stats)
+        return get_max_level_legend_rare(save_stats, context)
     return 0
+
+
+def get_max_levels(
+    save_stats: dict[str, Any],
+    rarities: Sequence[int],
+    context: Optional[CapContext] = None,
+) -> "array.array[int]":
+    """
+    Get the max level every cat can be upgraded to
+
+    The account progress is only computed once, and the max level of each
+    rarity is only worked out once, or once for legend and crazed cats.
+
+    Args:
+        save_stats (dict[str, Any]): The save stats
+        rarities (Sequence[int]): The rarity index of every cat
+        context (Optional[CapContext], optional): The progress of the account, computed from the save stats if not given. Defaults to None.
+
+    Returns:
+        array.array[int]: The max level of each cat in the save, cats without a rarity are treated as normal cats
+    """
+    if context is None:
+        context = CapContext.from_save_stats(save_stats)
+    max_levels: dict[tuple[int, bool, bool], int] = {}
+    caps = array.array("H", bytes(2 * len(save_stats["cats"])))
+    for cat_id in range(len(caps)):
+        rarity = rarities[cat_id] if cat_id < len(rarities) else 0
+        key = (rarity, cat_id in LEGENDS, cat_id in CRAZED)
+        if key not in max_levels:
+            max_levels[key] = get_max_level(save_stats, rarity, cat_id, context)
+        caps[cat_id] = max_levels[key]
+    return caps
@@ -1,18 +1,21 @@
 """Handler for selecting cat ids"""
 
-import os
-from multiprocessing import Process
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 
 from ... import (
     csv_handler,
+    game_data_archive,
     game_data_getter,
+    game_table,
     helper,
+    table_cache,
     user_input_handler,
 )
 from ..levels import treasures
-from . import cat_helper
+from . import cat_helper, cat_name_index
+
+CatNames = Union[list[tuple[str, int, int]], cat_name_index.CatNameIndex]
 
 
 def select_cats(save_stats: dict[str, Any], current: bool = True) -> list[int]:
@@ -95,7 +98,7 @@ def select_cats_gatya_banner(save_stats: dict[str, Any]) -> list[int]:
     if file_data is None:
         helper.colored_text("Failed to get gatya banners")
         return []
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
+    data = csv_handler.parse_int_csv(file_data)
     ids = user_input_handler.get_range(
         user_input_handler.colored_input(
             "Enter gacha banner id (Look up the gacha banners you want, then click on the image at the top, and look for the last digits of the file name (e.g royal fest = 602))(You can enter &all& to get all, a range e.g &1&-&50&, or ids separate by spaces e.g &5 4 7&):"
@@ -125,15 +128,17 @@ def select_cat_names(save_stats: dict[str, Any]) -> list[int]:
     Returns:
         list[int]: cat ids
     """
-    all_names = get_cat_names(save_stats)
-    if all_names is None:
+    name_index = get_cat_name_index(save_stats)
+    if name_index is None:
         return []
     name = user_input_handler.colored_input("Enter cat name:")
-    found_names = search_cat_names(name, all_names)
-    found_names = filter_cat_names(found_names)
+    found_names = filter_cat_names(name_index.search(name))
     if not found_names:
-        print("No cats with that name found")
-        return []
+        found_names = filter_cat_names(name_index.fuzzy_search(name, limit=50))
+        if not found_names:
+            print("No cats with that name found")
+            return []
+        print("No cats with that exact name found, showing the closest names")
 
     cat_ids: list[int] = []
     cat_ids_str: list[str] = []
@@ -161,19 +166,21 @@ def select_cat_names(save_stats: dict[str, Any]) -> list[int]:
 
 
 def get_cat_by_form_and_id(
-    all_names: list[tuple[str, int, int]], cat_id: int, form_id: int
+    all_names: CatNames, cat_id: int, form_id: int
 ) -> Optional[tuple[str, int, int]]:
     """
     Get cat by form and id
 
     Args:
-        all_names (list[tuple[str, int, int]]): all names
+        all_names (CatNames): all names, or an index of them
         cat_id (int): cat id
         form_id (int): form id
 
     Returns:
         Optional[tuple[str, int, int]]: cat data
     """
+    if isinstance(all_names, cat_name_index.CatNameIndex):
+        return all_names.get_by_form_and_id(cat_id, form_id)
     for cat in all_names:
         if cat[1] == cat_id and cat[2] == form_id:
             return cat
@@ -181,18 +188,20 @@ def get_cat_by_form_and_id(
 
 
 def get_cat_by_id(
-    cat_names: list[tuple[str, int, int]], cat_id_to_search: int
+    cat_names: CatNames, cat_id_to_search: int
 ) -> list[tuple[str, int, int]]:
     """
     Get cat by id
 
     Args:
-        cat_names (list[tuple[str, int, int]]): list of cat names
+        cat_names (CatNames): list of cat names, or an index of them
         cat_id_to_search (int): cat id to search for
 
     Returns:
         Optional[tuple[str, int, int]]: cat name, cat id, cat form
     """
+    if isinstance(cat_names, cat_name_index.CatNameIndex):
+        return cat_names.get_by_id(cat_id_to_search)
     cats: list[tuple[str, int, int]] = []
     for cat_name, cat_id, cat_form in cat_names:
         if cat_id == cat_id_to_search:
@@ -212,108 +221,118 @@ def filter_cat_names(
     Returns:
         list[tuple[str, int, int]]: filtered cat names
     """
-    filtered_cat_ids: list[int] = []
+    filtered_cat_ids: set[int] = set()
     cat_data: list[tuple[str, int, int]] = []
     for cat_name, cat_id, cat_form in cat_names:
         if cat_id not in filtered_cat_ids:
-            filtered_cat_ids.append(cat_id)
+            filtered_cat_ids.add(cat_id)
             cat_data.append((cat_name, cat_id, cat_form))
 
     return cat_data
 
 
-def search_cat_names(
-    name: str, cat_names: list[tuple[str, int, int]]
-) -> list[tuple[str, int, int]]:
+def search_cat_names(name: str, cat_names: CatNames) -> list[tuple[str, int, int]]:
     """
     Search cat names
 
     Args:
         name (str): name to search for
-        cat_names (list[tuple[str, int, int]]): list of cat names
+        cat_names (CatNames): list of cat names, or an index of them
 
     Returns:
         list[tuple[str, int, int]]: list of cat names that match the search
     """
+    if isinstance(cat_names, cat_name_index.CatNameIndex):
+        return cat_names.search(name)
 
     found_names: list[tuple[str, int, int]] = []
-
+    name = cat_name_index.normalize_name(name)
     for cat_name, cat_id, form_id in cat_names:
-        if name.lower().replace(" ", "") in cat_name.lower().replace(" ", ""):
+        if name in cat_name_index.normalize_name(cat_name):
             found_names.append((cat_name, cat_id, form_id))
     return found_names
 
 
-def download_10_files(game_version: str, file_names: list[str]) -> None:
+def get_cat_names(save_stats: dict[str, Any]) -> Optional[list[tuple[str, int, int]]]:
     """
-    Download 10 files
+    Get cat names and ids
 
     Args:
-        game_version (str): game version
-        file_names (list[str]): file names
+        save_stats (dict[str, Any]): save stats
+
+    Returns:
+        Optional[list[tuple[str, int, int]]]: cat names and ids
     """
-    for file_name in file_names:
-        game_data_getter.download_file(game_version, "resLocal", file_name, False)
+    name_index = get_cat_name_index(save_stats)
+    if name_index is None:
+        return None
+    return name_index.names
 
 
-def get_cat_names(save_stats: dict[str, Any]) -> Optional[list[tuple[str, int, int]]]:
+def parse_cat_names(
+    manifest: game_data_archive.VersionManifest,
+    keys: list[str],
+    delimeter: str,
+) -> cat_name_index.CatNameIndex:
+    """Build the index of cat names from the Unit_Explanation files of every cat"""
+
+    names: list[tuple[str, int, int]] = []
+    for cat_id, key in enumerate(keys):
+        file_data = manifest.get(key)
+        if file_data is None:
+            continue
+        data = csv_handler.parse_csv(file_data, delimeter=delimeter)
+        for form_id, form in enumerate(data):
+            names.append((form[0], cat_id, form_id))
+    return cat_name_index.CatNameIndex(names)
+
+
+def get_cat_name_index(
+    save_stats: dict[str, Any]
+) -> Optional[cat_name_index.CatNameIndex]:
     """
-    Get cat names and ids
+    Get the index of cat names, built once per game version and kept on disk
 
     Args:
         save_stats (dict[str, Any]): save stats
 
     Returns:
-        Optional[list[tuple[str, int, int]]]: cat names and ids
+        Optional[cat_name_index.CatNameIndex]: cat names, ids and forms
     """
 
     is_jp = helper.is_jp(save_stats)
 
-    path = game_data_getter.get_path("resLocal", "", is_jp)
-    if path is None:
+    version = game_data_getter.get_latest_version(is_jp)
+    if version is None:
         helper.colored_text("Failed to get cat names", helper.RED)
         return None
-    file_path_dir = os.path.dirname(helper.get_file(path))
-    helper.create_dirs(file_path_dir)
-    if len(helper.find_files_in_dir(file_path_dir, "Unit_Explanation")) < len(
-        save_stats["cats"]
-    ):
+    manifest = game_data_archive.get_manifest(version)
+    files: list[tuple[str, str]] = []
+    for cat_id, _ in enumerate(save_stats["cats"]):
+        file_name = f"Unit_Explanation{cat_id+1}_{helper.get_lang(is_jp)}.csv"
+        files.append(("resLocal", file_name))
+    if any(f"{pack}/{file}" not in manifest for pack, file in files):
         helper.colored_text(
             "Downloading cat names for the first time... (This may take some time, but next time it will be much faster)",
             helper.GREEN,
         )
-        funcs: list[Process] = []
-        version = game_data_getter.get_latest_version(is_jp)
-        if version is None:
-            helper.colored_text("Failed to get cat names", helper.RED)
-            return None
-        all_file_names: list[str] = []
-        for cat_id, _ in enumerate(save_stats["cats"]):
-            file_name = f"Unit_Explanation{cat_id+1}_{helper.get_lang(is_jp)}.csv"
-            all_file_names.append(file_name)
-        file_names_split = helper.chunks(all_file_names, 10)
-        for file_names in file_names_split:
-            funcs.append(
-                Process(
-                    target=download_10_files,
-                    args=(version, file_names),
-                )
+        failed = game_data_getter.download_files(version, files)
+        if failed:
+            helper.colored_text(
+                f"Failed to download the names of &{len(failed)}& cats",
+                helper.RED,
+                helper.WHITE,
             )
-        helper.run_in_parallel(funcs)
 
-    names: list[tuple[str, int, int]] = []
-    for cat_id, _ in enumerate(save_stats["cats"]):
-        file_path = os.path.join(
-            file_path_dir, f"Unit_Explanation{cat_id+1}_{helper.get_lang(is_jp)}.csv"
-        )
-        data = csv_handler.parse_csv(
-            helper.read_file_string(file_path),
-            delimeter=helper.get_text_splitter(is_jp),
-        )
-        for form_id, form in enumerate(data):
-            name = form[0]
-            names.append((name, cat_id, form_id))
-    return names
+    keys = [f"{pack}/{file}" for pack, file in files]
+    return table_cache.get_game_data_table(
+        version,
+        keys,
+        "cat_name_index",
+        cat_name_index.INDEX_VERSION,
+        lambda: parse_cat_names(manifest, keys, helper.get_text_splitter(is_jp)),
+        f"resLocal/Unit_Explanation_{helper.get_lang(is_jp)}",
+    )
 
 
 def get_obtainability(save_stats: dict[str, Any]) -> list[int]:
@@ -326,15 +345,13 @@ def get_obtainability(save_stats: dict[str, Any]) -> list[int]:
     Returns:
         list[int]: obtainability of cats (0 = not obtainable, 1 = obtainable)
     """
-    file_data = game_data_getter.get_file_latest(
+    table = game_table.get_game_table(
         "DataLocal", "nyankoPictureBookData.csv", helper.is_jp(save_stats)
     )
-    if file_data is None:
+    if table is None:
         helper.colored_text("Failed to get obtainability", helper.RED)
         return []
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
-    is_obtainable = helper.copy_first_n(data, 0)
-    return is_obtainable
+    return list(table.get_column(0))
 
 
 def get_obtainable_cats(save_stats: dict[str, Any]) -> list[int]:
@@ -0,0 +1,178 @@
+"""Index of cat names for searching by name, id and form"""
+
+from typing import Iterable, Optional
+
+# bump when the layout of the index changes so stored ones are rebuilt
+INDEX_VERSION = 1
+GRAM_SIZE = 3
+
+CatName = tuple[str, int, int]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for searching, ignoring case and spaces"""
+
+    return name.lower().replace(" ", "")
+
+
+def get_grams(text: str) -> set[str]:
+    """Get the trigrams of a normalized name"""
+
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def get_substring_distance(
+    query: str, text: str, max_distance: Optional[int] = None
+) -> int:
+    """
+    Get the edit distance between a query and the part of a text closest to it
+
+    Args:
+        query (str): The query
+        text (str): The text to search in
+        max_distance (Optional[int], optional): Stop once the distance is known to be more than this. Defaults to None.
+
+    Returns:
+        int: The fewest insertions, deletions and substitutions needed for the query to appear in the text, or more than max_distance if it was exceeded
+    """
+    previous = [0] * (len(text) + 1)
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        left = i
+        for j, text_char in enumerate(text):
+            left = min(
+                previous[j + 1] + 1, left + 1, previous[j] + (query_char != text_char)
+            )
+            current.append(left)
+        previous = current
+        if max_distance is not None and min(previous) > max_distance:
+            return max_distance + 1
+    return min(previous)
+
+
+def split_query(query: str, count: int) -> list[str]:
+    """Split a query into parts of about the same length, or an empty part if it is too short"""
+
+    if count > len(query):
+        return [""]
+    return [
+        query[len(query) * i // count : len(query) * (i + 1) // count]
+        for i in range(count)
+    ]
+
+
+class CatNameIndex:
+    """
+    Names of the forms of every cat, with a trigram index of the normalized names
+
+    Entries are kept in the order of the names they were built from, and
+    results are returned in that order unless they are ranked.
+    """
+
+    def __init__(self, names: Iterable[CatName]):
+        self.names = list(names)
+        self.normalized = [normalize_name(name) for name, _, _ in self.names]
+        self.grams: dict[str, list[int]] = {}
+        self.forms: dict[int, list[int]] = {}
+        self.by_form: dict[tuple[int, int], int] = {}
+        for entry_id, (_, cat_id, form_id) in enumerate(self.names):
+            for gram in get_grams(self.normalized[entry_id]):
+                self.grams.setdefault(gram, []).append(entry_id)
+            self.forms.setdefault(cat_id, []).append(entry_id)
+            self.by_form.setdefault((cat_id, form_id), entry_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get_by_id(self, cat_id: int) -> list[CatName]:
+        """Get the names of every form of a cat"""
+
+        return [self.names[entry_id] for entry_id in self.forms.get(cat_id, [])]
+
+    def get_by_form_and_id(self, cat_id: int, form_id: int) -> Optional[CatName]:
+        """Get the name of a form of a cat"""
+
+        entry_id = self.by_form.get((cat_id, form_id))
+        if entry_id is None:
+            return None
+        return self.names[entry_id]
+
+    def search(self, query: str) -> list[CatName]:
+        """
+        Get the names that contain a query, ignoring case and spaces
+
+        Args:
+            query (str): The name to search for
+
+        Returns:
+            list[CatName]: The matching names, in index order
+        """
+        query = normalize_name(query)
+        if len(query) < GRAM_SIZE:
+            entry_ids: Iterable[int] = range(len(self.names))
+        else:
+            postings = sorted(
+                (self.grams.get(gram, []) for gram in get_grams(query)), key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    break
+            entry_ids = sorted(candidates)
+        return [
+            self.names[entry_id]
+            for entry_id in entry_ids
+            if query in self.normalized[entry_id]
+        ]
+
+    def fuzzy_search(
+        self, query: str, limit: int = 10, max_distance: Optional[int] = None
+    ) -> list[CatName]:
+        """
+        Get the names closest to a query, allowing for typos
+
+        Names are ranked by the edit distance between the query and the part of
+        the name closest to it. Only names that share enough trigrams with the
+        query, and contain one of its parts unchanged, can be within the
+        maximum distance, so only those are compared.
+
+        Args:
+            query (str): The name to search for
+            limit (int, optional): The most names to return. Defaults to 10.
+            max_distance (Optional[int], optional): The most edits allowed. Defaults to a third of the length of the query.
+
+        Returns:
+            list[CatName]: The closest names, closest first
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = max(1, len(query) // 3)
+        query_grams = get_grams(query)
+        # each edit changes at most GRAM_SIZE of the trigrams of the query
+        min_shared = len(query_grams) - max_distance * GRAM_SIZE
+        if min_shared <= 0:
+            entry_ids: Iterable[int] = range(len(self.names))
+        else:
+            shared: dict[int, int] = {}
+            for gram in query_grams:
+                for entry_id in self.grams.get(gram, []):
+                    shared[entry_id] = shared.get(entry_id, 0) + 1
+            entry_ids = [
+                entry_id for entry_id, count in shared.items() if count >= min_shared
+            ]
+        # a match with max_distance edits leaves one of max_distance + 1 parts
+        # of the query unchanged
+        pieces = split_query(query, max_distance + 1)
+        ranked: list[tuple[int, int]] = []
+        for entry_id in entry_ids:
+            text = self.normalized[entry_id]
+            if not any(piece in text for piece in pieces):
+                continue
+            distance = get_substring_distance(query, text, max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, entry_id))
+        ranked.sort()
+        return [self.names[entry_id] for _, entry_id in ranked[:limit]]
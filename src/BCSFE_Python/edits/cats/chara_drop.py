@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from ... import helper, user_input_handler, csv_handler, game_data_getter
+from ... import helper, user_input_handler, game_table
 from . import cat_id_selector
 
 
@@ -62,17 +62,16 @@ def get_character_drops(save_stats: dict[str, Any]) -> dict[str, Any]:
 def get_data(is_jp: bool) -> dict[str, Any]:
     """gets all of the cat ids and treasure ids that can be dropped"""
 
-    file_data = game_data_getter.get_file_latest("DataLocal", "drop_chara.csv", is_jp)
-    if file_data is None:
+    table = game_table.get_game_table(
+        "DataLocal", "drop_chara.csv", is_jp, has_header=True
+    )
+    if table is None:
         helper.error_text("Failed to get drop_chara.csv")
         return {"t_ids": [], "c_ids": [], "indexes": []}
-    character_data = helper.parse_int_list_list(
-        csv_handler.parse_csv(file_data.decode("utf-8"))[1:]
-    )
 
-    treasure_ids = helper.copy_first_n(character_data, 0)
-    indexes = helper.copy_first_n(character_data, 1)
-    cat_ids = helper.copy_first_n(character_data, 2)
+    treasure_ids = list(table.get_column(0))
+    indexes = list(table.get_column(1))
+    cat_ids = list(table.get_column(2))
 
     return {"t_ids": treasure_ids, "indexes": indexes, "c_ids": cat_ids}
 
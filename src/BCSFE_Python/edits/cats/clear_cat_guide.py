@@ -3,7 +3,7 @@
 from typing import Any
 
 from ... import helper
-from . import cat_id_selector
+from . import bulk_cats, cat_id_selector
 
 
 def collect_cat_guide(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -30,8 +30,8 @@ def cat_guide_ids(
     """Clear cat guide for a set of cat ids"""
     ids = helper.check_cat_ids(ids, save_stats)
     cat_guide_collected = save_stats["cat_guide_collected"]
-    for cat_id in ids:
-        cat_guide_collected[cat_id] = val
+    mask = bulk_cats.CatMask.from_ids(ids, len(cat_guide_collected))
+    bulk_cats.fill(cat_guide_collected, mask, val)
 
     save_stats["cat_guide_collected"] = cat_guide_collected
     print(f"Successfully {string} cat guide")
@@ -1,8 +1,8 @@
 """Handler for evolving cats"""
 from typing import Any
 
-from ... import helper, csv_handler, game_data_getter
-from . import cat_id_selector
+from ... import helper, game_table
+from . import bulk_cats, cat_id_selector
 
 
 def get_evolve(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -56,16 +56,13 @@ def evolve_handler(
 def get_evolve_data(is_jp: bool) -> list[int]:
     """Get max form of cats"""
 
-    file_data = game_data_getter.get_file_latest(
+    table = game_table.get_game_table(
         "DataLocal", "nyankoPictureBookData.csv", is_jp
     )
-    if file_data is None:
+    if table is None:
         helper.error_text("Failed to get evolve data")
         return []
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
-    forms = helper.copy_first_n(data, 2)
-    forms = helper.offset_list(forms, -1)
-    return forms
+    return [form - 1 for form in table.get_column(2)]
 
 
 def evolve_handler_ids(
@@ -74,24 +71,16 @@ def evolve_handler_ids(
     """Evolve specific cats by ids"""
     ids = helper.check_cat_ids(ids, save_stats)
     evolves = save_stats["unlocked_forms"]
+    mask = bulk_cats.CatMask.from_ids(ids, len(evolves))
     if not forced:
         form_data = get_evolve_data(helper.check_data_is_jp(save_stats))
-        length = min([len(ids), len(form_data)])
-        for i in range(length):
-            try:
-                evolves[ids[i]] = form_data[ids[i]]
-            except IndexError:
-                pass
+        bulk_cats.copy_from(evolves, mask, form_data)
     else:
-        for cat_id in ids:
-            evolves[cat_id] = val
-    for cat_id, (unlocked_flag, current_flag) in enumerate(
-        zip(evolves, save_stats["current_forms"])
-    ):
-        save_stats["current_forms"][cat_id] = max(unlocked_flag, current_flag)
-
-    flags_evolved = [0 if form == 1 else form for form in evolves]
-    save_stats["unlocked_forms"] = flags_evolved
+        bulk_cats.fill(evolves, mask, val)
+    bulk_cats.maximum(save_stats["current_forms"], evolves)
+
+    bulk_cats.replace(evolves, 1, 0)
+    save_stats["unlocked_forms"] = evolves
 
     print(f"Successfully {string} true forms of cats")
     return save_stats
@@ -1,8 +1,8 @@
 """Handler to add and remove cats"""
 from typing import Any
 
-from ... import helper
-from . import cat_id_selector
+from ... import helper, user_rank
+from . import bulk_cats, cat_id_selector
 
 
 def get_cat(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -39,16 +39,12 @@ def get_cat_ids(
     """Get specific cats by ids"""
 
     ids = helper.check_cat_ids(ids, save_stats)
+    mask = bulk_cats.CatMask.from_ids(ids, len(save_stats["cats"]))
 
-    cats = save_stats["cats"]
-    seen_cats = save_stats["gatya_seen_cats"]
+    bulk_cats.fill(save_stats["cats"], mask, val)
+    bulk_cats.fill(save_stats["gatya_seen_cats"], mask, val)
 
-    for cat_id in ids:
-        cats[cat_id] = val
-        seen_cats[cat_id] = val
-
-    save_stats["cats"] = cats
-    save_stats["gatya_seen_cats"] = seen_cats
     save_stats["menu_unlocks"][2] = 1
+    user_rank.refresh_cats(save_stats, mask.get_ids())
     print(f"Successfully {string} cats")
     return save_stats
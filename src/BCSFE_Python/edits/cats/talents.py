@@ -1,128 +1,165 @@
 """Handler to edit cat talents"""
 from typing import Any, Optional
 
-from ... import helper, item, csv_handler, game_data_getter, user_input_handler
+from ... import (
+    csv_handler,
+    game_data_archive,
+    game_data_getter,
+    game_table,
+    helper,
+    item,
+    table_cache,
+    user_input_handler,
+)
 from . import cat_id_selector
 
+LETTERS = ["A", "B", "C", "D", "E", "F", "G", "H"]
 
-def get_talent_data(save_stats: dict[str, Any]) -> Optional[dict[Any, Any]]:
-    """Get talent data for all cats"""
 
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "SkillAcquisition.csv", helper.check_data_is_jp(save_stats)
+class TalentDB:
+    """
+    The talents of every cat, with their names and max levels
+
+    Talents are looked up by cat id and then by ability id, which is the id
+    the talents of a cat have in the save data.
+    """
+
+    # bump when the layout of the database changes so stored ones are rebuilt
+    LAYOUT_VERSION = 1
+
+    def __init__(self, talents: dict[int, dict[int, tuple[str, int]]]):
+        self.talents = talents
+
+    def __contains__(self, cat_id: int) -> bool:
+        return cat_id in self.talents
+
+    def get_talent(self, cat_id: int, talent_id: int) -> Optional[tuple[str, int]]:
+        """Get the name and max level of a talent of a cat"""
+
+        return self.talents.get(cat_id, {}).get(talent_id)
+
+    @staticmethod
+    def from_tables(
+        talent_table: game_table.GameTable, talent_names: list[list[str]]
+    ) -> "TalentDB":
+        """
+        Build the talents of every cat from SkillAcquisition.csv and SkillDescriptions.csv
+
+        Args:
+            talent_table (game_table.GameTable): SkillAcquisition.csv, keyed by cat id
+            talent_names (list[list[str]]): SkillDescriptions.csv
+
+        Returns:
+            TalentDB: The talents
+        """
+        talents: dict[int, dict[int, tuple[str, int]]] = {}
+        for cat_id, row_id in talent_table.index.items():
+            cat_talents: dict[int, tuple[str, int]] = {}
+            for letter in LETTERS:
+                ability_id = talent_table.get_value(row_id, f"abilityID_{letter}", None)
+                if ability_id is None or ability_id in cat_talents:
+                    continue
+                text_id = talent_table.get_value(row_id, get_text_column(letter), None)
+                name = ""
+                if isinstance(text_id, int) and 0 <= text_id < len(talent_names):
+                    name = get_talent_name(talent_names[text_id]).strip("\n")
+                max_level = int(talent_table.get_value(row_id, f"MAXLv_{letter}"))
+                cat_talents[int(ability_id)] = (name, max_level or 1)
+            talents[cat_id] = cat_talents
+        return TalentDB(talents)
+
+
+def get_text_column(letter: str) -> str:
+    """Get the column with the text id of a talent slot"""
+
+    if letter == "F":
+        return "tFxtID_F"  # ponos made a typo, should be textID_F
+    return f"textID_{letter}"
+
+
+def get_talent_name(description: list[str]) -> str:
+    """Get the name of a talent from its row of SkillDescriptions.csv"""
+
+    if len(description) < 2:
+        return ""
+    return description[1].split("<br>")[0]
+
+
+def parse_talent_db(skill_data: bytes, names_data: bytes, delimeter: str) -> TalentDB:
+    """Build the talents of every cat from the data of their game data files"""
+
+    return TalentDB.from_tables(
+        game_table.parse_game_table(skill_data, ",", True, 0),
+        csv_handler.parse_csv(names_data, delimeter),
     )
-    if file_data is None:
+
+
+def get_talent_db(save_stats: dict[str, Any]) -> Optional[TalentDB]:
+    """
+    Get the talents of every cat, built once per game version and kept on disk
+
+    Args:
+        save_stats (dict[str, Any]): The save stats
+
+    Returns:
+        Optional[TalentDB]: The talents, None if the game data couldn't be got
+    """
+    is_jp = helper.check_data_is_jp(save_stats)
+    version = game_data_getter.get_latest_version(is_jp)
+    if version is None:
         helper.error_text("Failed to get talent data")
         return None
-    talent_data_raw = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
+    files = [
+        ("DataLocal", "SkillAcquisition.csv"),
+        ("resLocal", "SkillDescriptions.csv"),
+    ]
+    for pack_name, file_name in files:
+        game_data_getter.download_file(
+            version, pack_name, file_name, get_data=False, print_progress=False
         )
+    manifest = game_data_archive.get_manifest(version)
+    keys = [f"{pack_name}/{file_name}" for pack_name, file_name in files]
+    return table_cache.get_game_data_table(
+        version,
+        keys,
+        "talent_db",
+        TalentDB.LAYOUT_VERSION,
+        lambda: parse_talent_db(
+            manifest.get(keys[0]) or b"",
+            manifest.get(keys[1]) or b"",
+            helper.get_text_splitter(is_jp),
+        ),
     )
-    file_data = game_data_getter.get_file_latest(
-        "resLocal", "SkillDescriptions.csv", helper.check_data_is_jp(save_stats)
-    )
-    if file_data is None:
-        helper.error_text("Failed to get talent names")
-        return None
-    talent_names = csv_handler.parse_csv(
-        file_data.decode("utf-8"),
-        helper.get_text_splitter(helper.check_data_is_jp(save_stats)),
-    )
-    columns = helper.int_to_str_ls(talent_data_raw[0])
-    new_talent_data: dict[Any, Any] = {}
-    for j in range(1, len(talent_data_raw)):
-        data = talent_data_raw[j]
-        cat_id: int = int(data[0])
-        new_talent_data[cat_id] = {}
-
-        for data_i, column in zip(data, columns):
-            new_talent_data = replace_name(
-                cat_id=cat_id,
-                column=column,
-                data=data_i,
-                talent_names=talent_names,
-                new_data=new_talent_data,
-            )
-    return new_talent_data
-
-
-def replace_name(
-    cat_id: int,
-    column: str,
-    data: int,
-    talent_names: list[list[str]],
-    new_data: dict[Any, Any],
-) -> dict[str, Any]:
-    """Replace the text ids with the corresponding names"""
-
-    new_data[cat_id][column] = data
-    if (
-        "textID" in column or "tFxtID_F" in column
-    ):  # ponos made a typo, should be textID_F
-        new_data[cat_id][column] = talent_names[data][1]
-        stop_at = "<br>"
-        if stop_at in new_data[cat_id][column]:
-            index = new_data[cat_id][column].index(stop_at)
-            new_data[cat_id][column] = new_data[cat_id][column][:index]
-    return new_data
-
-
-def find_order(
-    cat_talents: list[dict[str, Any]], cat_talent_data: dict[str, Any]
-) -> list[str]:
-    """Find what talent slot each letter corresponds to"""
-
-    letters = ["A", "B", "C", "D", "E", "F", "G", "H"]
-    letter_order: list[str] = []
-
-    for talent in cat_talents:
-        talent_id = talent["id"]
-        for letter in letters:
-            key = f"abilityID_{letter}"
-            if key not in cat_talent_data:
-                continue
-            ability_id = int(cat_talent_data[key])
-            if ability_id == talent_id:
-                letter_order.append(letter)
-                break
-    return letter_order
-
-
-def get_cat_talents(
-    cat_talents: list[dict[str, Any]], cat_talent_data: dict[str, Any]
-) -> dict[Any, Any]:
-    """Get the name and max value of each talent for a specific cat"""
-
-    data: dict[Any, Any] = {}
-    letter_order = find_order(cat_talents, cat_talent_data)
-    for i, letter in enumerate(letter_order):
-        cat_data = {}
-        if letter == "F":
-            text_id_str = "tFxtID_F"  # ponos made a typo, should be textID_F
-        else:
-            text_id_str = f"textID_{letter}"
-        cat_data["name"] = cat_talent_data[text_id_str].strip("\n")
-        cat_data["max"] = int(cat_talent_data[f"MAXLv_{letter}"])
-        if cat_data["max"] == 0:
-            cat_data["max"] = 1
-        data[i] = cat_data
-    return data
-
-
-def get_talent_levels(
-    talent_data: dict[int, Any], talents: dict[int, Any], cat_id: int
-) -> list[int]:
-    """Get the level of each talent for a specific cat"""
-
-    cat_talent_data = talent_data[cat_id]
-    cat_talents = talents[cat_id]
-    cat_talent_data_formatted = get_cat_talents(cat_talents, cat_talent_data)
-    cat_talents_levels: list[int] = []
-    for talent_formatted in cat_talent_data_formatted.values():
-        max_val = talent_formatted["max"]
-        cat_talents_levels.append(max_val)
-    return cat_talents_levels
+
+
+def set_all_talents(
+    save_stats: dict[str, Any], ids: list[int], talent_db: TalentDB, maxed: bool
+) -> int:
+    """
+    Set the level of every talent of some cats to its max level or to 0
+
+    Args:
+        save_stats (dict[str, Any]): The save stats
+        ids (list[int]): The cat ids
+        talent_db (TalentDB): The talents of every cat
+        maxed (bool): Whether to max the talents, or reset them
+
+    Returns:
+        int: The number of cats that had talents to set
+    """
+    talents = save_stats["talents"]
+    total = 0
+    for cat_id in ids:
+        cat_talents = talents.get(cat_id)
+        cat_talent_data = talent_db.talents.get(cat_id)
+        if cat_talents is None or cat_talent_data is None:
+            continue
+        for talent in cat_talents:
+            talent_info = cat_talent_data.get(talent["id"])
+            if talent_info is not None:
+                talent["level"] = talent_info[1] if maxed else 0
+        total += 1
+    return total
 
 
 def max_all_talents(save_stats: dict[str, Any]):
@@ -135,22 +172,12 @@ def max_all_talents(save_stats: dict[str, Any]):
     )
     if not max_all:
         return remove_all_talents(save_stats)
-    talents = save_stats["talents"]
-
     ids = cat_id_selector.select_cats(save_stats)
 
-    talent_data = get_talent_data(save_stats)
-    if talent_data is None:
+    talent_db = get_talent_db(save_stats)
+    if talent_db is None:
         return save_stats
-    cat_talents_levels: list[int] = []
-    for cat_id in ids:
-        if cat_id not in talents or cat_id not in talent_data:
-            continue
-        cat_talents = talents[cat_id]
-        cat_talents_levels = get_talent_levels(talent_data, talents, cat_id)
-        for i, cat_talent_level in enumerate(cat_talents_levels):
-            cat_talents[i]["level"] = cat_talent_level
-        save_stats["talents"] = talents
+    set_all_talents(save_stats, ids, talent_db, True)
 
     print("Successfully set talents")
     return save_stats
@@ -166,22 +193,12 @@ def remove_all_talents(save_stats: dict[str, Any]) -> dict[str, Any]:
     Returns:
         dict[str, Any]: The save stats
     """
-    talents = save_stats["talents"]
-
     ids = cat_id_selector.select_cats(save_stats)
 
-    talent_data = get_talent_data(save_stats)
-    if talent_data is None:
+    talent_db = get_talent_db(save_stats)
+    if talent_db is None:
         return save_stats
-    cat_talents_levels: list[int] = []
-    for cat_id in ids:
-        if cat_id not in talents or cat_id not in talent_data:
-            continue
-        cat_talents = talents[cat_id]
-        cat_talents_levels = get_talent_levels(talent_data, talents, cat_id)
-        for i in range(len(cat_talents_levels)):
-            cat_talents[i]["level"] = 0
-        save_stats["talents"] = talents
+    set_all_talents(save_stats, ids, talent_db, False)
 
     print("Successfully removed talents")
     return save_stats
@@ -193,12 +210,12 @@ def edit_talents_individual(save_stats: dict[str, Any]) -> dict[str, Any]:
     talents = save_stats["talents"]
     ids = cat_id_selector.select_cats(save_stats)
 
-    talent_data = get_talent_data(save_stats)
-    if talent_data is None:
+    talent_db = get_talent_db(save_stats)
+    if talent_db is None:
         return save_stats
     for cat_id in ids:
         cat_talents_levels: list[int] = []
-        if cat_id not in talents or cat_id not in talent_data:
+        if cat_id not in talents or cat_id not in talent_db:
             # don't spam the user with messages if they selected alot of ids at once
             if len(ids) < 20:
                 helper.colored_text(
@@ -207,15 +224,18 @@ def edit_talents_individual(save_stats: dict[str, Any]) -> dict[str, Any]:
                     helper.WHITE,
                 )
             continue
-        cat_talent_data = talent_data[cat_id]
         cat_talents = talents[cat_id]
-        cat_talent_data_formatted = get_cat_talents(cat_talents, cat_talent_data)
         names: list[str] = []
         maxes: list[int] = []
-        for talent_index, cat_talent_formatted in cat_talent_data_formatted.items():
-            names.append(cat_talent_formatted["name"])
-            cat_talents_levels.append(cat_talents[talent_index]["level"])
-            maxes.append(cat_talent_formatted["max"])
+        talent_indexes: list[int] = []
+        for talent_index, talent in enumerate(cat_talents):
+            talent_info = talent_db.get_talent(cat_id, talent["id"])
+            if talent_info is None:
+                continue
+            names.append(talent_info[0])
+            maxes.append(talent_info[1])
+            cat_talents_levels.append(talent["level"])
+            talent_indexes.append(talent_index)
         helper.colored_text(f"Cat &{cat_id}& is selected:")
         cat_talents_levels_g = item.IntItemGroup.from_lists(
             names=names,
@@ -225,8 +245,8 @@ def edit_talents_individual(save_stats: dict[str, Any]) -> dict[str, Any]:
         )
         cat_talents_levels_g.edit()
         cat_talents_levels = cat_talents_levels_g.get_values()
-        for i, cat_talent_level in enumerate(cat_talents_levels):
-            cat_talents[i]["level"] = cat_talent_level
+        for talent_index, cat_talent_level in zip(talent_indexes, cat_talents_levels):
+            cat_talents[talent_index]["level"] = cat_talent_level
 
         talents[cat_id] = cat_talents
 
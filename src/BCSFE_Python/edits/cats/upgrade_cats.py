@@ -1,8 +1,8 @@
 """Handler for cat upgrades"""
-from typing import Any, Union
+from typing import Any, Optional, Sequence, Union
 
-from ... import helper, user_input_handler
-from . import cat_id_selector, cat_helper
+from ... import helper, user_input_handler, user_rank
+from . import bulk_cats, cat_id_selector, cat_helper
 
 
 def set_level_caps(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -16,24 +16,28 @@ def set_level_caps(save_stats: dict[str, Any]) -> dict[str, Any]:
         dict[str, Any]: The save stats
     """
 
-    unit_max_data = cat_helper.get_unit_max_levels(helper.is_jp(save_stats))
-    rarities = cat_helper.get_rarities(helper.is_jp(save_stats))
-    for cat_id in range(len(save_stats["cats"])):
-        base_level = save_stats["cat_upgrades"]["Base"][cat_id]
-        if unit_max_data is not None:
-            max_base_level = cat_helper.get_unit_max_level(unit_max_data, cat_id)[0]
-        else:
-            max_base_level = 50000
-        try:
-            rarity = rarities[cat_id]
-        except IndexError:
-            rarity = 0
-        max_base_level_ur = cat_helper.get_max_level(save_stats, rarity, cat_id)
-        level_cap = cat_helper.get_level_cap_increase_amount(
-            min(base_level, max_base_level, max_base_level_ur)
-        )
-        save_stats["catseye_cat_data"][cat_id] = level_cap
-        save_stats["catseye_related_data"]["Base"][cat_id] = level_cap + 10
+    is_jp = helper.is_jp(save_stats)
+    unit_max_data = cat_helper.get_unit_max_levels(is_jp)
+    rarities = cat_helper.get_rarities(is_jp)
+    max_levels_ur = cat_helper.get_max_levels(save_stats, rarities)
+    cat_count = len(save_stats["cats"])
+    max_base_levels: Sequence[int]
+    if unit_max_data is not None:
+        max_base_levels = unit_max_data[0]
+    else:
+        max_base_levels = [50000] * cat_count
+    level_caps = bulk_cats.get_level_caps(
+        save_stats["cat_upgrades"]["Base"][:cat_count],
+        [max_base_levels, max_levels_ur],
+        cat_helper.LEVEL_CAP_START,
+    )
+    mask = bulk_cats.CatMask.select_all(cat_count)
+    bulk_cats.copy_from(save_stats["catseye_cat_data"], mask, level_caps)
+    bulk_cats.copy_from(
+        save_stats["catseye_related_data"]["Base"],
+        mask,
+        [level_cap + 10 for level_cap in level_caps],
+    )
     return save_stats
 
 
@@ -59,6 +63,27 @@ def get_plus_base(usr_input: str) -> tuple[Union[int, None], Union[int, None]]:
     return base, plus
 
 
+def set_levels(
+    data: dict[str, Any],
+    mask: bulk_cats.CatMask,
+    base_lvl: Optional[int],
+    plus_lvl: Optional[int],
+) -> None:
+    """
+    Set the upgrade levels of the selected cats
+
+    Args:
+        data (dict[str, Any]): The base and plus levels of every cat
+        mask (bulk_cats.CatMask): The cats to upgrade
+        base_lvl (Optional[int]): The base level, starting at 1, None or 0 to leave it
+        plus_lvl (Optional[int]): The plus level, None to leave it
+    """
+    if base_lvl is not None and base_lvl > 0:
+        bulk_cats.fill(data["Base"], mask, helper.clamp(base_lvl, 0, 50000) - 1)
+    if plus_lvl is not None:
+        bulk_cats.fill(data["Plus"], mask, helper.clamp(plus_lvl, 0, 50000))
+
+
 def upgrade_cats(save_stats: dict[str, Any]) -> dict[str, Any]:
     """Upgrade specific cats"""
 
@@ -81,39 +106,33 @@ def upgrade_handler(
         individual = user_input_handler.ask_if_individual(
             f"upgrades for each {item_name}"
         )
-    first = True
-    base_lvl = None
-    plus_lvl = None
-    for cat_id in ids:
-        if not individual and first:
-            levels = get_plus_base(
-                user_input_handler.colored_input(
-                    'Enter the base level followed by a "&+&" then the plus level, e.g 5&+&12. If you want to ignore the base level do &+&12, if you want to ignore the plus level do 5&+&:\n'
-                )
+    if not individual:
+        base_lvl, plus_lvl = get_plus_base(
+            user_input_handler.colored_input(
+                'Enter the base level followed by a "&+&" then the plus level, e.g 5&+&12. If you want to ignore the base level do &+&12, if you want to ignore the plus level do 5&+&:\n'
             )
-            base_lvl = levels[0]
-            plus_lvl = levels[1]
-            first = False
-        elif individual:
+        )
+        set_levels(data, bulk_cats.CatMask.from_ids(ids, len(base)), base_lvl, plus_lvl)
+    else:
+        for cat_id in ids:
             helper.colored_text(
                 f"The current upgrade level of id &{cat_id}& is &{base[cat_id]+1}&+&{plus[cat_id]}&"
             )
-            levels = get_plus_base(
+            base_lvl, plus_lvl = get_plus_base(
                 user_input_handler.colored_input(
                     f'Enter the base level for {item_name}: &{cat_id}& followed by a "&+&" then the plus level, e.g 5&+&12. If you want to ignore the base level do &+&12, if you want to ignore the plus level do 5&+&:\n'
                 )
             )
-            base_lvl = levels[0]
-            plus_lvl = levels[1]
-        if base_lvl is not None:
-            if base_lvl > 0:
-                base_lvl = helper.clamp(base_lvl, 0, 50000)
-                base[cat_id] = base_lvl - 1
-        if plus_lvl is not None:
-            plus_lvl = helper.clamp(plus_lvl, 0, 50000)
-            plus[cat_id] = plus_lvl
+            if base_lvl is not None and base_lvl > 0:
+                base[cat_id] = helper.clamp(base_lvl, 0, 50000) - 1
+            if plus_lvl is not None:
+                plus[cat_id] = helper.clamp(plus_lvl, 0, 50000)
     data["Base"] = base
     data["Plus"] = plus
+    if data is save_stats.get("cat_upgrades"):
+        user_rank.refresh_cats(save_stats, ids)
+    elif data is save_stats.get("blue_upgrades"):
+        user_rank.refresh_skills(save_stats, ids)
 
     return data
 
@@ -1,20 +1,30 @@
 """Handler for editing gamatoto xp"""
 from typing import Any, Optional
 
-from ... import helper, user_input_handler, item, game_data_getter
+from ... import helper, user_input_handler, item, table_cache
+from ...level_table import LevelTable
 
 
-def get_boundaries(is_jp: bool) -> Optional[list[int]]:
-    """Get the xp requirements for each level"""
+def get_level_table(is_jp: bool) -> Optional[LevelTable]:
+    """Get the xp requirements for each level, parsed once per game version"""
 
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "GamatotoExpedition.csv", is_jp
+    level_table = table_cache.get_table(
+        "DataLocal",
+        "GamatotoExpedition.csv",
+        is_jp,
+        parse_level_table,
+        layout_version=LevelTable.LAYOUT_VERSION,
     )
-    if file_data is None:
+    if level_table is None:
         helper.error_text("Failed to get gamatoto xp requirements")
         return None
+    return level_table
+
+
+def parse_level_table(file_data: bytes) -> LevelTable:
+    """Parse GamatotoExpedition.csv"""
+
     boundaries = file_data.decode("utf-8").splitlines()
-    previous = 0
     xp_requirements: list[int] = []
     previous = 0
     for line in boundaries:
@@ -23,37 +33,34 @@ def get_boundaries(is_jp: bool) -> Optional[list[int]]:
             break
         xp_requirements.append(requirement)
         previous = requirement
-    return xp_requirements
+    return LevelTable(xp_requirements)
+
+
+def get_boundaries(is_jp: bool) -> Optional[list[int]]:
+    """Get the xp requirements for each level"""
+
+    level_table = get_level_table(is_jp)
+    if level_table is None:
+        return None
+    return level_table.thresholds.tolist()
 
 
 def get_level_from_xp(gamatoto_xp: int, is_jp: bool) -> Optional[dict[str, Any]]:
     """Get the level from the xp amount"""
 
-    xp_requirements = get_boundaries(is_jp)
-    if xp_requirements is None:
+    level_table = get_level_table(is_jp)
+    if level_table is None:
         return None
-    level = 1
-    for requirement in xp_requirements:
-        if gamatoto_xp >= requirement:
-            level += 1
-    return {
-        "level": level,
-        "max_level": len(xp_requirements),
-        "max_xp": xp_requirements[-2],
-    }
+    return level_table.get_level_data(gamatoto_xp)
 
 
 def get_xp_from_level(level: int, is_jp: bool) -> Optional[int]:
     """Get the xp amount from the level"""
 
-    xp_requirements = get_boundaries(is_jp)
-    if xp_requirements is None:
+    level_table = get_level_table(is_jp)
+    if level_table is None:
         return None
-    if level <= 1:
-        gamatoto_xp = 0
-    else:
-        gamatoto_xp = xp_requirements[level - 2]
-    return gamatoto_xp
+    return level_table.get_xp(level)
 
 
 def edit_gamatoto_xp(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -31,7 +31,7 @@ def get_cannon_maxes(is_jp: bool) -> Optional[dict[int, dict[int, int]]]:
     if file_data is None:
         helper.error_text("Could not find CastleRecipeUnlock.csv")
         return None
-    data = helper.parse_int_list_list(csv_handler.parse_csv(file_data.decode("utf-8")))
+    data = csv_handler.parse_int_csv(file_data)
     maxes: dict[int, dict[int, int]] = {}
     for cannon in data:
         cannon_id = cannon[0]
@@ -71,28 +71,24 @@ def set_medals(
 
     unlock_next = stage_stats["Value"]["unlock_next"]
 
-    for medal in medal_data.stages:
+    def is_completed(medal: meow_medals.StageMedal) -> bool:
         if not medal.maps:
-            continue
-        completed = True
+            return False
         for map_id in medal.maps:
             star = medal.star
             if map_id < 0:
                 continue
             if map_id < valid_range[0] or map_id > valid_range[1]:
-                completed = False
-                break
+                return False
             map_id += offset
             next_chapter = unlock_next[map_id + 1]
             if star is None:
                 star = 0
             if next_chapter[star] == 0:
-                completed = False
-                break
-        if completed:
-            if medal.medal_id not in medal_stats["medal_data_1"]:
-                medal_stats["medal_data_1"].append(medal.medal_id)
-            medal_stats["medal_data_2"][medal.medal_id] = 1
+                return False
+        return True
+
+    meow_medals.award_medals(medal_stats, medal_data, is_completed, "stage", 1)
     return stage_stats, medal_stats
 
 
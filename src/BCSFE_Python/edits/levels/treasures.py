@@ -1,7 +1,14 @@
 """Handler for editing main story treasures"""
 from typing import Any, Optional
 
-from ... import helper, user_input_handler, item, csv_handler, game_data_getter
+from ... import (
+    helper,
+    user_input_handler,
+    item,
+    csv_handler,
+    game_data_getter,
+    table_cache,
+)
 from . import story_level_id_selector, main_story
 
 
@@ -9,39 +16,21 @@ def get_stages(is_jp: bool) -> Optional[list[list[list[int]]]]:
     """Get what stages belong to which treasure group"""
 
     treasures_values: list[list[list[int]]] = []
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "treasureData0.csv", is_jp
-    )
-    if file_data is None:
+    data = table_cache.get_table("DataLocal", "treasureData0.csv", is_jp)
+    if data is None:
         helper.error_text("Failed to get treasureData0.csv")
         return None
-    eoc_treasures = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-        )
-    )[11:22]
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "treasureData1.csv", is_jp
-    )
-    if file_data is None:
+    eoc_treasures = data[11:22]
+    data = table_cache.get_table("DataLocal", "treasureData1.csv", is_jp)
+    if data is None:
         helper.error_text("Failed to get treasureData1.csv")
         return None
-    itf_treasures = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-        )
-    )[11:22]
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "treasureData2_0.csv", is_jp
-    )
-    if file_data is None:
+    itf_treasures = data[11:22]
+    data = table_cache.get_table("DataLocal", "treasureData2_0.csv", is_jp)
+    if data is None:
         helper.error_text("Failed to get treasureData2_0.csv")
         return None
-    cotc_treasures = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            file_data.decode("utf-8"),
-        )
-    )[11:22]
+    cotc_treasures = data[11:22]
 
     treasures_values.append(remove_negative_1(eoc_treasures))
     treasures_values.append(remove_negative_1(itf_treasures))
@@ -1,7 +1,41 @@
 """Handler for editing cata shrine xp and level"""
 from typing import Any, Optional
 
-from ... import game_data_getter, helper, item, user_input_handler
+from ... import helper, item, table_cache, user_input_handler
+from ...level_table import LevelTable
+
+
+def get_level_table(is_jp: bool) -> Optional[LevelTable]:
+    """
+    Returns the xp requirements for each level, parsed once per game version
+
+    Args:
+        is_jp (bool): If the save file is japanese
+
+    Returns:
+        Optional[LevelTable]: The xp requirements for each level
+    """
+    level_table = table_cache.get_table(
+        "resLocal",
+        "jinja_level.csv",
+        is_jp,
+        parse_level_table,
+        helper.get_text_splitter(is_jp),
+        layout_version=LevelTable.LAYOUT_VERSION,
+    )
+    if level_table is None:
+        helper.error_text("Failed to get jinja level data")
+        return None
+    return level_table
+
+
+def parse_level_table(file_data: bytes, delimeter: str) -> LevelTable:
+    """Parse jinja_level.csv, which has the xp needed to go from each level to the next"""
+
+    boundaries = file_data.decode("utf-8").splitlines()
+    return LevelTable.from_increments(
+        (int(line.split(delimeter)[0]) for line in boundaries), clamp=True
+    )
 
 
 def get_boundaries(is_jp: bool) -> Optional[list[int]]:
@@ -14,18 +48,10 @@ def get_boundaries(is_jp: bool) -> Optional[list[int]]:
     Returns:
         list[int]: The xp requirements for each level
     """
-    file_data = game_data_getter.get_file_latest("resLocal", "jinja_level.csv", is_jp)
-    if file_data is None:
-        helper.error_text("Failed to get jinja level data")
+    level_table = get_level_table(is_jp)
+    if level_table is None:
         return None
-    boundaries = file_data.decode("utf-8").splitlines()
-    xp_requirements: list[int] = []
-    counter = 0
-    for line in boundaries:
-        requirement = int(line.split(helper.get_text_splitter(is_jp))[0])
-        counter += requirement
-        xp_requirements.append(counter)
-    return xp_requirements
+    return level_table.thresholds.tolist()
 
 
 def get_level_from_xp(shrine_xp: int, is_jp: bool) -> Optional[dict[str, Any]]:
@@ -39,20 +65,10 @@ def get_level_from_xp(shrine_xp: int, is_jp: bool) -> Optional[dict[str, Any]]:
     Returns:
         dict[str, Any]: The level, max level, and max xp
     """
-    xp_requirements = get_boundaries(is_jp)
-    if xp_requirements is None:
+    level_table = get_level_table(is_jp)
+    if level_table is None:
         return None
-    level = 1
-    for requirement in xp_requirements:
-        if shrine_xp >= requirement:
-            level += 1
-    if level > len(xp_requirements):
-        level = len(xp_requirements)
-    return {
-        "level": level,
-        "max_level": len(xp_requirements),
-        "max_xp": xp_requirements[-2],
-    }
+    return level_table.get_level_data(shrine_xp)
 
 
 def get_xp_from_level(level: int, is_jp: bool) -> Optional[int]:
@@ -62,14 +78,10 @@ def get_xp_from_level(level: int, is_jp: bool) -> Optional[int]:
     Returns:
         _type_: int
     """
-    xp_requirements = get_boundaries(is_jp)
-    if xp_requirements is None:
+    level_table = get_level_table(is_jp)
+    if level_table is None:
         return None
-    if level <= 1:
-        shrine_xp = 0
-    else:
-        shrine_xp = xp_requirements[level - 2]
-    return shrine_xp
+    return level_table.get_xp(level)
 
 
 def edit_shrine_xp(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -1,9 +1,9 @@
 """Handler for editting meow medals"""
 from enum import Enum
 import json
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-from ... import helper, user_input_handler, game_data_getter
+from ... import helper, user_input_handler, game_data_getter, table_cache
 
 
 def get_medal_names(is_jp: bool) -> Optional[list[str]]:
@@ -31,13 +31,15 @@ def get_medal_names(is_jp: bool) -> Optional[list[str]]:
 def set_medals(medal_stats: dict[str, Any], ids: list[int]) -> dict[str, Any]:
     """Set the medal stats of a set of medals"""
 
+    owned = set(medal_stats["medal_data_1"])
     for medal_id in ids:
         if medal_id == 0:
             continue
         medal_id -= 1
-        if medal_id not in medal_stats["medal_data_1"]:
+        if medal_id not in owned:
             if medal_id not in medal_stats["medal_data_2"]:
                 medal_stats["medal_data_1"].append(medal_id)
+                owned.add(medal_id)
             medal_stats["medal_data_2"][medal_id] = 0
     return medal_stats
 
@@ -45,14 +47,12 @@ def set_medals(medal_stats: dict[str, Any], ids: list[int]) -> dict[str, Any]:
 def remove_medals(medal_stats: dict[str, Any], ids: list[int]) -> dict[str, Any]:
     """Remove the medal stats of a set of medals"""
 
-    for medal_id in ids:
-        if medal_id == 0:
-            continue
-        medal_id -= 1
-        if medal_id in medal_stats["medal_data_1"]:
-            medal_stats["medal_data_1"].remove(medal_id)
-        if medal_id in medal_stats["medal_data_2"]:
-            medal_stats["medal_data_2"].pop(medal_id)
+    removed = {medal_id - 1 for medal_id in ids if medal_id != 0}
+    medal_stats["medal_data_1"][:] = [
+        medal_id for medal_id in medal_stats["medal_data_1"] if medal_id not in removed
+    ]
+    for medal_id in removed:
+        medal_stats["medal_data_2"].pop(medal_id, None)
     return medal_stats
 
 
@@ -86,15 +86,30 @@ class ActionTypes(Enum):
 class Medal:
     """Medal"""
 
+    __slots__ = ("medal_id", "grade", "line")
+    medal_type = "medal"
+
     def __init__(self, medal_id: int, grade: int, line: int):
         self.medal_id = medal_id
         self.grade = grade
         self.line = line
 
+    def get_fields(self) -> dict[str, Any]:
+        """Get the fields of the medal by name"""
+
+        fields: dict[str, Any] = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, "__slots__", ()):
+                fields[name] = getattr(self, name)
+        return fields
+
 
 class StageMedal(Medal):
     """Stage medal"""
 
+    __slots__ = ("maps", "condition", "star")
+    medal_type = "stage"
+
     def __init__(
         self,
         medal_id: int,
@@ -113,6 +128,9 @@ class StageMedal(Medal):
 class TreasureMedal(StageMedal):
     """Treasure medal"""
 
+    __slots__ = ("treasure",)
+    medal_type = "treasure"
+
     def __init__(
         self,
         medal_id: int,
@@ -129,6 +147,9 @@ class TreasureMedal(StageMedal):
 class ActionMedal(Medal):
     """Action medal"""
 
+    __slots__ = ("action",)
+    medal_type = "action"
+
     def __init__(self, medal_id: int, grade: int, line: int, action: ActionTypes):
         super().__init__(medal_id, grade, line)
         self.action = action
@@ -137,6 +158,9 @@ class ActionMedal(Medal):
 class CharacterMedal(StageMedal):
     """Character medal"""
 
+    __slots__ = ("chara",)
+    medal_type = "character"
+
     def __init__(
         self,
         medal_id: int,
@@ -166,13 +190,111 @@ class Medals:
         self.stages = stages
 
 
-def get_medal_data(is_jp: bool) -> Optional[Medals]:
-    """Get the medal data"""
+class MedalCatalogue(Medals):
+    """Medals indexed by id and by type"""
 
-    file_data = game_data_getter.get_file_latest("DataLocal", "medallist.json", is_jp)
-    if file_data is None:
+    # bump when the layout of the medal classes changes so stored catalogues
+    # are rebuilt
+    LAYOUT_VERSION = 1
+
+    def __init__(
+        self,
+        treasures: list[TreasureMedal],
+        characters: list[CharacterMedal],
+        actions: list[ActionMedal],
+        stages: list[StageMedal],
+    ):
+        super().__init__(treasures, characters, actions, stages)
+        all_medals: list[Medal] = [*treasures, *characters, *actions, *stages]
+        all_medals.sort(key=lambda medal: medal.medal_id)
+        self.medals: list[Optional[Medal]] = [None] * (
+            all_medals[-1].medal_id + 1 if all_medals else 0
+        )
+        self.ids_by_type: dict[str, list[int]] = {}
+        for medal in all_medals:
+            self.medals[medal.medal_id] = medal
+            self.ids_by_type.setdefault(medal.medal_type, []).append(medal.medal_id)
+
+    def get_medal(self, medal_id: int) -> Optional[Medal]:
+        """Get a medal by id"""
+
+        if 0 <= medal_id < len(self.medals):
+            return self.medals[medal_id]
+        return None
+
+    def get_ids(
+        self,
+        predicate: Optional[Callable[[Any], bool]] = None,
+        medal_type: Optional[str] = None,
+    ) -> list[int]:
+        """
+        Get the ids of the medals matching a predicate
+
+        Args:
+            predicate (Optional[Callable[[Any], bool]], optional): Whether a medal matches, all medals match if None. Defaults to None.
+            medal_type (Optional[str], optional): Only look at medals of this type, e.g stage. Defaults to None.
+
+        Returns:
+            list[int]: The ids of the matching medals, in order
+        """
+        if medal_type is None:
+            ids = [medal.medal_id for medal in self.medals if medal is not None]
+        else:
+            ids = self.ids_by_type.get(medal_type, [])
+        if predicate is None:
+            return list(ids)
+        return [medal_id for medal_id in ids if predicate(self.medals[medal_id])]
+
+
+def award_medals(
+    medal_stats: dict[str, Any],
+    catalogue: MedalCatalogue,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    medal_type: Optional[str] = None,
+    value: int = 0,
+) -> int:
+    """
+    Give every medal matching a predicate in one pass
+
+    Args:
+        medal_stats (dict[str, Any]): The medal stats of the save
+        catalogue (MedalCatalogue): The medals
+        predicate (Optional[Callable[[Any], bool]], optional): Whether a medal should be given, all medals are given if None. Defaults to None.
+        medal_type (Optional[str], optional): Only give medals of this type, e.g stage. Defaults to None.
+        value (int, optional): The value stored for each given medal. Defaults to 0.
+
+    Returns:
+        int: The number of medals that matched
+    """
+    ids = catalogue.get_ids(predicate, medal_type)
+    owned = set(medal_stats["medal_data_1"])
+    for medal_id in ids:
+        if medal_id not in owned:
+            medal_stats["medal_data_1"].append(medal_id)
+            owned.add(medal_id)
+        medal_stats["medal_data_2"][medal_id] = value
+    return len(ids)
+
+
+def get_medal_data(is_jp: bool) -> Optional[MedalCatalogue]:
+    """Get the medal data, parsed once per game version and kept on disk"""
+
+    medal_data = table_cache.get_table(
+        "DataLocal",
+        "medallist.json",
+        is_jp,
+        parse_medal_catalogue,
+        layout_version=MedalCatalogue.LAYOUT_VERSION,
+    )
+    if medal_data is None:
         helper.error_text("Failed to get medal data")
         return None
+    return medal_data
+
+
+def parse_medal_catalogue(file_data: bytes) -> MedalCatalogue:
+    """Parse medallist.json"""
+
     medal_data = json.loads(file_data.decode("utf-8"))["iconID"]
 
     treasures: list[TreasureMedal] = []
@@ -230,7 +352,7 @@ def get_medal_data(is_jp: bool) -> Optional[Medals]:
                 )
             )
 
-    return Medals(treasures, characters, actions, stages)
+    return MedalCatalogue(treasures, characters, actions, stages)
 
 
 def medals(save_stats: dict[str, Any]) -> dict[str, Any]:
@@ -1,22 +1,31 @@
 """Handler for editing catnip missions"""
 from typing import Any, Optional
 
-from ... import user_input_handler, game_data_getter, csv_handler, helper
+from ... import (
+    user_input_handler,
+    game_data_getter,
+    csv_handler,
+    helper,
+    table_cache,
+)
 
 
 def get_mission_conditions(is_jp: bool) -> Optional[dict[Any, Any]]:
     """Get the mission data and what you need to do to complete it"""
 
-    file_data = game_data_getter.get_file_latest(
-        "DataLocal", "Mission_Condition.csv", is_jp
+    mission_conditions = table_cache.get_table(
+        "DataLocal", "Mission_Condition.csv", is_jp, parse_mission_conditions
     )
-    if file_data is None:
+    if mission_conditions is None:
         helper.error_text("Failed to get mission conditions")
         return None
-    mission_condition_data = file_data.decode("utf-8")
-    mission_conditions_list = helper.parse_int_list_list(
-        csv_handler.parse_csv(mission_condition_data)
-    )
+    return mission_conditions
+
+
+def parse_mission_conditions(file_data: bytes) -> dict[Any, Any]:
+    """Parse Mission_Condition.csv"""
+
+    mission_conditions_list = csv_handler.parse_int_csv(file_data)
     mission_conditions: dict[Any, Any] = {}
     for line in mission_conditions_list[1:]:
         mission_id = line[0]
@@ -46,12 +46,7 @@ def get_scheme_data(is_jp: bool) -> list[list[int]]:
         helper.error_text("Failed to get scheme data")
         return []
 
-    scheme_data_data = helper.parse_int_list_list(
-        csv_handler.parse_csv(
-            scheme_data.decode("utf-8"),
-            delimeter="\t",
-        )
-    )
+    scheme_data_data = csv_handler.parse_int_csv(scheme_data, delimeter="\t")
     return scheme_data_data
 
 
@@ -1,5 +1,7 @@
 from typing import Any, Optional
-from ... import user_input_handler, server_handler, helper, adb_handler
+import datetime
+import os
+from ... import user_input_handler, server_handler, helper, adb_handler, backup_handler
 from ..levels import clear_tutorial
 
 
@@ -10,6 +12,7 @@ def select(save_stats: dict[str, Any]) -> dict[str, Any]:
         "Select a save file from file",
         "Use adb to pull the save from a rooted device",
         "Load save data from json",
+        "Restore save data from a backup",
     ]
     index = (
         user_input_handler.select_single(
@@ -67,7 +70,43 @@ def handle_index(index: int) -> Optional[str]:
         )
         if js_path:
             path = helper.load_json_handler(js_path)
+    elif index == 4:
+        path = restore_backup()
     else:
         helper.colored_text("Please enter a recognised option", base=helper.RED)
         return None
     return path
+
+
+def restore_backup() -> Optional[str]:
+    """Select a backup of the current save and write it to a file"""
+
+    save_path = helper.get_save_path()
+    generations = backup_handler.get_generations(save_path)
+    if not generations:
+        helper.colored_text(
+            f"No backups found for &{os.path.abspath(save_path)}&", base=helper.RED
+        )
+        return None
+    options: list[str] = []
+    for manifest in generations:
+        backup_time = datetime.datetime.fromtimestamp(manifest["time"])
+        options.append(
+            f"{backup_time.isoformat(' ', 'seconds')} ({manifest['size']} bytes)"
+        )
+    index = (
+        user_input_handler.select_single(
+            options, title="Select a backup to restore (newest first):"
+        )
+        - 1
+    )
+    save_data = backup_handler.load_backup(generations[index])
+    path = helper.save_file(
+        "Save file",
+        helper.get_save_file_filetype(),
+        helper.get_save_path_home(),
+    )
+    if path is None:
+        return None
+    helper.write_file_bytes(path, save_data)
+    return path
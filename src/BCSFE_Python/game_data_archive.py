@@ -0,0 +1,514 @@
+"""Content addressed store for the downloaded game data of every game version
+
+Files are stored once, in a packed archive of blobs keyed by the SHA-256 of
+their content that is shared by every game version. Each game version has a
+manifest of the blob of each of its files, so a file that doesn't change
+between game versions is only stored once. Blobs that no manifest refers to
+are removed by collect_garbage.
+
+The archive is a single append only file: a magic header followed by records
+of a name length, a data length, the name and the data. The offset of each
+record is indexed when the archive is opened, and reads are slices of a memory
+map of the file. A record left incomplete by a crash is ignored and replaced
+by the next write.
+
+Several processes may share the archive. Writes take a lock file and append
+at the end of the file, and a process indexes records added by the others
+when it finds the file has grown or has been rewritten. Manifests are read
+again under their own lock file before they are written, and only refer to
+new blobs while the archive is locked, which collect_garbage holds too.
+"""
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator, Optional
+
+from . import helper
+
+MAGIC = b"BCSFEGD1"
+RECORD_HEADER = struct.Struct("<HI")
+# rewrite the archive once more than this share of it is replaced records
+MAX_WASTE = 0.5
+MIN_COMPACT_SIZE = 1024 * 1024
+
+_archives_lock = threading.Lock()
+_archives: dict[str, "GameDataArchive"] = {}
+_manifests: dict[str, "VersionManifest"] = {}
+_held_locks = threading.local()
+
+
+@contextlib.contextmanager
+def lock_file(path: str) -> Iterator[None]:
+    """Hold an exclusive lock shared with other processes while writing a file
+
+    A thread that already holds the lock of a file can take it again.
+    """
+
+    held: dict[str, int] = _held_locks.__dict__.setdefault("counts", {})
+    if held.get(path):
+        held[path] += 1
+        try:
+            yield
+        finally:
+            held[path] -= 1
+        return
+    helper.create_dirs(os.path.dirname(path))
+    with open(f"{path}.lock", "a+b") as file:
+        if os.name == "nt":
+            import msvcrt  # pylint: disable=import-outside-toplevel
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore
+            held[path] = 1
+            try:
+                yield
+            finally:
+                del held[path]
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore
+        else:
+            import fcntl  # pylint: disable=import-outside-toplevel
+
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            held[path] = 1
+            try:
+                yield
+            finally:
+                del held[path]
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def get_file_id(path: str) -> Optional[tuple[int, int]]:
+    """Get what identifies a file, which changes when it is replaced"""
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+class GameDataArchive:
+    """Packed game data files of a game version, keyed by pack/file name"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: dict[str, tuple[int, int]] = {}
+        self.end = len(MAGIC)
+        self.waste = 0
+        self.file_id: Optional[tuple[int, int]] = None
+        self.lock = threading.RLock()
+        self.file = None
+        self.map: Optional[mmap.mmap] = None
+        self.load()
+
+    def load(self) -> None:
+        """Index the records of the archive"""
+
+        with self.lock:
+            self.close()
+            self.index = {}
+            self.end = len(MAGIC)
+            self.waste = 0
+            self.file_id = get_file_id(self.path)
+            if self.file_id is None:
+                return
+            self.open_map()
+            if self.map is None or self.map[: len(MAGIC)] != MAGIC:
+                self.close()
+                return
+            self.scan()
+
+    def scan(self) -> None:
+        """Index the records after the last indexed record"""
+
+        if self.map is None:
+            return
+        data = self.map
+        offset = self.end
+        size = len(data)
+        while offset + RECORD_HEADER.size <= size:
+            name_length, data_length = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size + name_length
+            if start + data_length > size:
+                break
+            name = data[offset + RECORD_HEADER.size : start].decode("utf-8")
+            if name in self.index:
+                self.waste += self.get_record_size(name)
+            self.index[name] = (start, data_length)
+            offset = start + data_length
+        self.end = offset
+
+    def refresh(self) -> None:
+        """Index the records other processes added, or everything if they rewrote the archive"""
+
+        with self.lock:
+            file_id = get_file_id(self.path)
+            if file_id != self.file_id:
+                self.load()
+                return
+            if file_id is None or os.path.getsize(self.path) <= self.end:
+                return
+            if self.map is None:
+                self.load()
+                return
+            self.close()
+            self.open_map()
+            self.scan()
+
+    def open_map(self) -> None:
+        """Memory map the archive"""
+
+        if os.path.getsize(self.path) == 0:
+            return
+        self.file = open(self.path, "rb")  # pylint: disable=consider-using-with
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get_record_size(self, name: str) -> int:
+        """Get the size of the record of a file"""
+
+        return RECORD_HEADER.size + len(name.encode("utf-8")) + self.index[name][1]
+
+    def __contains__(self, name: str) -> bool:
+        with self.lock:
+            if name not in self.index:
+                # another process may have added it
+                self.refresh()
+            return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get_names(self, prefix: str = "") -> list[str]:
+        """Get the names of the files in the archive that start with a prefix"""
+
+        return [name for name in self.index if name.startswith(prefix)]
+
+    def get(self, name: str) -> Optional[bytes]:
+        """
+        Get the data of a file
+
+        Args:
+            name (str): The pack and file name, e.g DataLocal/unitbuy.csv
+
+        Returns:
+            Optional[bytes]: The data, None if the file isn't in the archive
+        """
+        with self.lock:
+            location = self.index.get(name)
+            if location is None:
+                # another process may have added it
+                self.refresh()
+                location = self.index.get(name)
+            if location is None:
+                return None
+            if self.map is None or len(self.map) < location[0] + location[1]:
+                self.close()
+                self.open_map()
+            if self.map is None:
+                return None
+            start, length = location
+            return self.map[start : start + length]
+
+    def add(self, name: str, data: bytes) -> None:
+        """Add a file to the archive, replacing any file with the same name"""
+
+        self.add_many({name: data})
+
+    def add_many(self, files: dict[str, bytes]) -> None:
+        """Add files to the archive with a single write"""
+
+        if not files:
+            return
+        with self.lock, lock_file(self.path):
+            self.refresh()
+            records: list[bytes] = []
+            offset = self.end
+            new_index: dict[str, tuple[int, int]] = {}
+            for name, data in files.items():
+                name_bytes = name.encode("utf-8")
+                records.append(RECORD_HEADER.pack(len(name_bytes), len(data)))
+                records.append(name_bytes)
+                records.append(data)
+                start = offset + RECORD_HEADER.size + len(name_bytes)
+                new_index[name] = (start, len(data))
+                offset = start + len(data)
+
+            helper.create_dirs(os.path.dirname(self.path))
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0))
+            with os.fdopen(fd, "r+b") as file:
+                size = file.seek(0, 2)
+                file.seek(0)
+                if size < len(MAGIC) or file.read(len(MAGIC)) != MAGIC:
+                    # a new archive, or one that was never written to
+                    file.seek(0)
+                    file.truncate(0)
+                    file.write(MAGIC)
+                elif size > self.end:
+                    # every complete record is indexed since the archive is
+                    # locked, so this only drops an incomplete record left by
+                    # a crash
+                    file.truncate(self.end)
+                file.seek(0, 2)
+                file.write(b"".join(records))
+            self.file_id = get_file_id(self.path)
+            for name, location in new_index.items():
+                if name in self.index:
+                    self.waste += self.get_record_size(name)
+                self.index[name] = location
+            self.end = offset
+            if self.waste > MIN_COMPACT_SIZE and self.waste > self.end * MAX_WASTE:
+                self.compact()
+
+    def compact(self, remove: Optional[set[str]] = None) -> None:
+        """
+        Rewrite the archive without replaced records
+
+        Args:
+            remove (Optional[set[str]], optional): Files to leave out as well. Defaults to None.
+        """
+        with self.lock, lock_file(self.path):
+            self.refresh()
+            files = {
+                name: self.get(name) or b""
+                for name in self.index
+                if remove is None or name not in remove
+            }
+            self.close()
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            archive = GameDataArchive(temp_path)
+            archive.add_many(files)
+            archive.close()
+            os.replace(temp_path, self.path)
+            os.remove(f"{temp_path}.lock")
+            self.load()
+
+    def close(self) -> None:
+        """Close the memory map of the archive"""
+
+        with self.lock:
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class VersionManifest:
+    """The blob of each game data file of a game version"""
+
+    def __init__(self, game_version: str):
+        self.game_version = game_version
+        self.path = get_manifest_path(game_version)
+        self.files: dict[str, str] = {}
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the manifest, moving in files packed before blobs were shared"""
+
+        self.files = load_manifest(self.path)
+        legacy_path = helper.get_file(
+            os.path.join("game_data", self.game_version, "archive.bin")
+        )
+        if os.path.exists(legacy_path):
+            archive = GameDataArchive(legacy_path)
+            files = {name: archive.get(name) or b"" for name in archive.get_names()}
+            archive.close()
+            self.add_many(files)
+            os.remove(legacy_path)
+
+    def save(self) -> None:
+        """Write the manifest"""
+
+        helper.create_dirs(os.path.dirname(self.path))
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        helper.write_file_string(temp_path, json.dumps(self.files))
+        os.replace(temp_path, self.path)
+
+    def __contains__(self, name: str) -> bool:
+        blob_hash = self.files.get(name)
+        return blob_hash is not None and blob_hash in get_blob_store()
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def get_names(self, prefix: str = "") -> list[str]:
+        """Get the names of the files of the game version that start with a prefix"""
+
+        return [name for name in self.files if name.startswith(prefix)]
+
+    def get_hash(self, name: str) -> Optional[str]:
+        """Get the hash of the content of a file"""
+
+        return self.files.get(name)
+
+    def get(self, name: str) -> Optional[bytes]:
+        """
+        Get the data of a file
+
+        Args:
+            name (str): The pack and file name, e.g DataLocal/unitbuy.csv
+
+        Returns:
+            Optional[bytes]: The data, None if the file isn't downloaded
+        """
+        blob_hash = self.files.get(name)
+        if blob_hash is None:
+            return None
+        return get_blob_store().get(blob_hash)
+
+    def add(self, name: str, data: bytes) -> None:
+        """Add a file, replacing any file with the same name"""
+
+        self.add_many({name: data})
+
+    def update(self, hashes: dict[str, str]) -> None:
+        """
+        Write the blobs of some files, keeping the files other processes added
+
+        The caller holds the lock of the blob archive, so its blobs can't be
+        collected before the manifest refers to them.
+        """
+        with self.lock, lock_file(self.path):
+            self.files = load_manifest(self.path)
+            self.files.update(hashes)
+            self.save()
+
+    def add_many(self, files: dict[str, bytes]) -> None:
+        """Add files, storing the content that isn't stored yet with a single write"""
+
+        if not files:
+            return
+        store = get_blob_store()
+        hashes = {name: get_hash(data) for name, data in files.items()}
+        with store.lock, lock_file(store.path):
+            blobs = {
+                blob_hash: files[name]
+                for name, blob_hash in hashes.items()
+                if blob_hash not in store
+            }
+            store.add_many(blobs)
+            self.update(hashes)
+
+    def link(self, name: str, blob_hash: str) -> bool:
+        """
+        Add a file with the same content as an already stored file
+
+        Args:
+            name (str): The pack and file name
+            blob_hash (str): The hash of the content
+
+        Returns:
+            bool: Whether the content is stored
+        """
+        store = get_blob_store()
+        with store.lock, lock_file(store.path):
+            if blob_hash not in store:
+                return False
+            self.update({name: blob_hash})
+        return True
+
+
+def get_hash(data: bytes) -> str:
+    """Get the key of the blob of some content"""
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_manifest_path(game_version: str) -> str:
+    """Get the path of the manifest of a game version"""
+
+    return helper.get_file(os.path.join("game_data", game_version, "manifest.json"))
+
+
+def load_manifest(path: str) -> dict[str, str]:
+    """Load the hash of each file of a manifest"""
+
+    if not os.path.exists(path):
+        return {}
+    try:
+        files = json.loads(helper.read_file_string(path))
+    except ValueError:
+        return {}
+    if not isinstance(files, dict):
+        return {}
+    return files
+
+
+def get_blob_store_path() -> str:
+    """Get the path of the archive of blobs"""
+
+    return helper.get_file(os.path.join("game_data", "blobs.bin"))
+
+
+def get_blob_store() -> GameDataArchive:
+    """Get the archive of blobs shared by every game version, opened once"""
+
+    path = get_blob_store_path()
+    with _archives_lock:
+        archive = _archives.get(path)
+        if archive is None:
+            archive = GameDataArchive(path)
+            _archives[path] = archive
+        return archive
+
+
+def get_manifest(game_version: str) -> VersionManifest:
+    """Get the manifest of a game version, loaded once and shared"""
+
+    path = get_manifest_path(game_version)
+    with _archives_lock:
+        manifest = _manifests.get(path)
+    if manifest is None:
+        manifest = VersionManifest(game_version)
+        with _archives_lock:
+            manifest = _manifests.setdefault(path, manifest)
+    return manifest
+
+
+def get_reference_counts() -> dict[str, int]:
+    """Get how many files of all downloaded game versions refer to each blob"""
+
+    counts: dict[str, int] = {}
+    for version in helper.get_dirs(helper.get_file("game_data")):
+        for blob_hash in load_manifest(get_manifest_path(version)).values():
+            counts[blob_hash] = counts.get(blob_hash, 0) + 1
+    return counts
+
+
+def collect_garbage() -> int:
+    """
+    Remove the blobs that no game version refers to anymore
+
+    Returns:
+        int: The number of blobs removed
+    """
+    if not os.path.exists(get_blob_store_path()):
+        return 0
+    store = get_blob_store()
+    # manifests only refer to new blobs while holding the lock of the blob
+    # archive, so none can be added between reading them and compacting
+    with store.lock, lock_file(store.path):
+        store.refresh()
+        counts = get_reference_counts()
+        unreferenced = {name for name in store.get_names() if not counts.get(name)}
+        if unreferenced:
+            store.compact(unreferenced)
+    return len(unreferenced)
+
+
+def close_archives() -> None:
+    """Close the blob archive and forget loaded manifests, e.g before deleting old game data"""
+
+    with _archives_lock:
+        for archive in _archives.values():
+            archive.close()
+        _archives.clear()
+        _manifests.clear()
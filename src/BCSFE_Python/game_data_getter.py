@@ -1,11 +1,136 @@
 """Get game data from the BCData GitHub repository."""
+
+import atexit
+import json
 import os
+import threading
+import time
 from typing import Optional
-import requests
 
-from . import helper
+from . import cache_handler, game_data_archive, helper, network_handler
 
 URL = "https://raw.githubusercontent.com/fieryhenry/BCData/master/"
+# seconds between checks for out of date game data
+HOUSEKEEPING_INTERVAL = 24 * 60 * 60
+# seconds latest.txt is cached for
+LATEST_VERSIONS_TTL = 60 * 60
+# seconds before latest.txt is downloaded again after it couldn't be
+FAILED_VERSIONS_TTL = 60
+# older game versions kept per language, so unchanged files of the next
+# game version can be shared instead of downloaded
+KEEP_OLD_VERSIONS = 1
+
+_removal_lock = threading.Lock()
+_pending_removals: list[str] = []
+_versions_lock = threading.Lock()
+_validators_lock = threading.Lock()
+_latest_versions: Optional[tuple[float, float, Optional[list[str]]]] = None
+_offline = False
+
+
+def get_validators_path(game_version: str) -> str:
+    """Get the path of the ETags and modification times of the files of a game version"""
+
+    return helper.get_file(os.path.join("game_data", game_version, "validators.json"))
+
+
+def load_validators(game_version: str) -> dict[str, dict[str, str]]:
+    """Load the ETags and modification times of the files of a game version"""
+
+    path = get_validators_path(game_version)
+    if not os.path.exists(path):
+        return {}
+    try:
+        return json.loads(helper.read_file_string(path))
+    except ValueError:
+        return {}
+
+
+def save_validators(game_version: str, key: str, validators: dict[str, str]) -> None:
+    """Store the ETag and modification time of a downloaded file"""
+
+    save_all_validators(game_version, {key: validators})
+
+
+def save_all_validators(
+    game_version: str, validators: dict[str, dict[str, str]]
+) -> None:
+    """Store the ETags and modification times of downloaded files"""
+
+    if not validators:
+        return
+    with _validators_lock:
+        all_validators = load_validators(game_version)
+        all_validators.update(validators)
+        path = get_validators_path(game_version)
+        helper.create_dirs(os.path.dirname(path))
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        helper.write_file_string(temp_path, json.dumps(all_validators))
+        os.replace(temp_path, path)
+
+
+def get_previous_version(game_version: str) -> Optional[str]:
+    """
+    Gets the newest downloaded game version older than a game version.
+
+    Args:
+        game_version (str): The game version.
+
+    Returns:
+        Optional[str]: The previous game version, None if there isn't one.
+    """
+    is_jp = "jp" in game_version
+    versions = [
+        version
+        for version in helper.get_dirs(helper.get_file("game_data"))
+        if ("jp" in version) == is_jp
+        and get_version_key(version) < get_version_key(game_version)
+        and os.path.exists(game_data_archive.get_manifest_path(version))
+    ]
+    if not versions:
+        return None
+    return max(versions, key=get_version_key)
+
+
+def get_previous_file(
+    previous_version: Optional[str], key: str
+) -> Optional[tuple[str, dict[str, str]]]:
+    """
+    Gets a file of the previous game version that can be reused if it didn't change.
+
+    Args:
+        previous_version (Optional[str]): The previous game version.
+        key (str): The pack and file name.
+
+    Returns:
+        Optional[tuple[str, dict[str, str]]]: The hash of the content and the validators of the file, None if it can't be reused.
+    """
+    if previous_version is None:
+        return None
+    blob_hash = game_data_archive.get_manifest(previous_version).get_hash(key)
+    validators = load_validators(previous_version).get(key)
+    if blob_hash is None or not validators or not validators.get("etag"):
+        return None
+    return blob_hash, validators
+
+
+def import_loose_files(
+    manifest: game_data_archive.VersionManifest, files: dict[str, str]
+) -> None:
+    """
+    Move downloaded files into the game data store.
+
+    Args:
+        manifest (game_data_archive.VersionManifest): The manifest of the game version of the files.
+        files (dict[str, str]): The path of each file by pack and file name.
+    """
+    data: dict[str, bytes] = {}
+    for key, file_path in files.items():
+        if os.path.exists(file_path):
+            data[key] = helper.read_file_bytes(file_path)
+    manifest.add_many(data)
+    for key in data:
+        os.remove(files[key])
 
 
 def download_file(
@@ -14,9 +139,13 @@ def download_file(
     file_name: str,
     get_data: bool = True,
     print_progress: bool = True,
+    revalidate: bool = False,
 ) -> bytes:
     """
-    Downloads the file.
+    Downloads the file into the game data store.
+
+    If the previous game version has the file it is only downloaded if its
+    ETag changed, otherwise the stored content is shared.
 
     Args:
         game_version (str): The game version to download from.
@@ -24,47 +153,293 @@ def download_file(
         file_name (str): The file name to download.
         get_data (bool, optional): Whether to return the data. Defaults to True.
         print_progress (bool, optional): Whether to print the progress. Defaults to True.
+        revalidate (bool, optional): Whether to check if an already downloaded file has changed. Defaults to False.
+
+    Raises:
+        Exception: If the file could not be downloaded.
 
     Returns:
         bytes: The data of the file.
     """
 
-    path = helper.get_file(os.path.join("game_data", game_version, pack_name))
-    file_path = os.path.join(path, file_name)
-    if os.path.exists(file_path):
-        if get_data:
-            return helper.read_file_bytes(file_path)
-        return b""
-
-    if print_progress:
+    manifest = game_data_archive.get_manifest(game_version)
+    key = f"{pack_name}/{file_name}"
+    file_path = helper.get_file(
+        os.path.join("game_data", game_version, pack_name, file_name)
+    )
+    if key not in manifest and os.path.exists(file_path):
+        # downloaded before game data was archived
+        import_loose_files(manifest, {key: file_path})
+    exists = key in manifest
+    if exists and not revalidate:
+        if not get_data:
+            return b""
+        data = manifest.get(key)
+        if data is not None:
+            return data
+        # the blob of the file was removed since, so download it again
+        exists = False
+
+    if print_progress and not exists:
         helper.colored_text(
             f"Downloading game data file &{file_name}& from &{pack_name}& with game version &{game_version}&",
             helper.GREEN,
             helper.WHITE,
         )
+    previous = None
+    if exists:
+        validators = load_validators(game_version).get(key)
+    else:
+        previous = get_previous_file(get_previous_version(game_version), key)
+        validators = previous[1] if previous is not None else None
     url = URL + game_version + "/" + pack_name + "/" + file_name
-    response = requests.get(url)
+    try:
+        new_validators = network_handler.download(url, file_path, validators)
+        if (
+            new_validators is None
+            and previous is not None
+            and not manifest.link(key, previous[0])
+        ):
+            new_validators = network_handler.download(url, file_path)
+    except network_handler.DownloadError as err:
+        raise Exception(
+            f"Failed to download game data file {file_name}: {err}"
+        ) from err
+    if new_validators is None:
+        if previous is not None:
+            save_validators(game_version, key, previous[1])
+    else:
+        import_loose_files(manifest, {key: file_path})
+        save_validators(game_version, key, new_validators)
 
-    helper.create_dirs(path)
-    helper.write_file_bytes(file_path, response.content)
-    return response.content
+    if get_data:
+        return manifest.get(key) or b""
+    return b""
 
 
-def get_latest_versions() -> Optional[list[str]]:
+def download_files(
+    game_version: str,
+    files: list[tuple[str, str]],
+    print_progress: bool = True,
+) -> list[tuple[str, str]]:
     """
-    Gets the latest versions of the game data.
+    Downloads the files that aren't downloaded yet, several at a time, into
+    the game data store. Files of the previous game version whose ETag didn't
+    change are shared instead of downloaded.
+
+    Args:
+        game_version (str): The game version to download from.
+        files (list[tuple[str, str]]): The pack name and file name of each file.
+        print_progress (bool, optional): Whether to print the progress. Defaults to True.
+
+    Returns:
+        list[tuple[str, str]]: The pack name and file name of the files that failed to download.
+    """
+    manifest = game_data_archive.get_manifest(game_version)
+    previous_version = get_previous_version(game_version)
+    loose_files: dict[str, str] = {}
+    jobs: dict[str, tuple[tuple[str, str], network_handler.DownloadJob]] = {}
+    previous_files: dict[str, tuple[str, dict[str, str]]] = {}
+    for pack_name, file_name in files:
+        key = f"{pack_name}/{file_name}"
+        if key in manifest or key in jobs:
+            continue
+        file_path = helper.get_file(
+            os.path.join("game_data", game_version, pack_name, file_name)
+        )
+        if os.path.exists(file_path):
+            loose_files[key] = file_path
+            continue
+        previous = get_previous_file(previous_version, key)
+        if previous is not None:
+            previous_files[key] = previous
+        url = URL + game_version + "/" + pack_name + "/" + file_name
+        jobs[key] = (
+            (pack_name, file_name),
+            network_handler.DownloadJob(
+                url, file_path, previous[1] if previous is not None else None
+            ),
+        )
+    import_loose_files(manifest, loose_files)
+    if not jobs:
+        return []
+
+    def progress(done: int, total: int) -> None:
+        helper.colored_text(
+            f"\rDownloading game data files: &{done}&/&{total}&",
+            helper.GREEN,
+            helper.WHITE,
+            end="\n" if done == total else "",
+        )
+
+    job_list = [job for _, job in jobs.values()]
+    failed = network_handler.download_many(
+        job_list, progress=progress if print_progress else None
+    )
+    retry: list[network_handler.DownloadJob] = []
+    for key, (_, job) in jobs.items():
+        if job.not_modified and not manifest.link(key, previous_files[key][0]):
+            # the content of the previous version was removed
+            job.validators = None
+            job.not_modified = False
+            retry.append(job)
+    if retry:
+        failed += network_handler.download_many(retry)
+    import_loose_files(
+        manifest,
+        {
+            key: job.path
+            for key, (_, job) in jobs.items()
+            if job.error is None and not job.not_modified
+        },
+    )
+    save_all_validators(
+        game_version,
+        {
+            key: job.validators
+            for key, (_, job) in jobs.items()
+            if job.error is None and job.validators
+        },
+    )
+    failed_paths = {job.path for job in failed}
+    return [file for file, job in jobs.values() if job.path in failed_paths]
+
+
+def download_files_latest(paths: list[str], is_jp: bool) -> bool:
+    """
+    Downloads the latest version of the files that aren't downloaded yet, several at a time.
+
+    Args:
+        paths (list[str]): The paths of the files, e.g DataLocal/unitbuy.csv.
+        is_jp (bool): Whether to get the japanese version.
+
+    Returns:
+        bool: Whether all of the files were downloaded.
+    """
+    version = get_latest_version(is_jp)
+    if version is None:
+        return False
+    files: list[tuple[str, str]] = []
+    for path in paths:
+        pack_name, file_name = path.split("/")
+        files.append((pack_name, file_name))
+    return not download_files(version, files)
+
+
+def set_offline(offline: bool) -> None:
+    """Set if game data should only be read from already downloaded versions"""
+
+    global _offline  # pylint: disable=global-statement
+    _offline = offline
+
+
+def is_offline() -> bool:
+    """Check if game data should only be read from already downloaded versions"""
+
+    return _offline
+
+
+def get_version_key(version: str) -> tuple[int, ...]:
+    """Get a key to sort game data versions by, e.g 12.1.0jp -> (12, 1, 0)"""
+
+    parts = version.replace("jp", "").split(".")
+    return tuple(int(part) if part.isdigit() else -1 for part in parts)
+
+
+def get_local_version(is_jp: bool) -> Optional[str]:
+    """
+    Gets the newest downloaded version of the game data of a language.
+
+    Args:
+        is_jp (bool): Whether to get the japanese version.
+
+    Returns:
+        Optional[str]: The newest downloaded version, None if none is downloaded.
+    """
+    versions = [
+        version
+        for version in helper.get_dirs(helper.get_file("game_data"))
+        if ("jp" in version) == is_jp
+    ]
+    if not versions:
+        return None
+    return max(versions, key=get_version_key)
+
+
+def get_local_versions() -> Optional[list[str]]:
+    """
+    Gets the newest downloaded versions of the game data.
+
+    Returns:
+        Optional[list[str]]: The newest downloaded en and jp versions, None if either isn't downloaded.
+    """
+    en_version = get_local_version(False)
+    jp_version = get_local_version(True)
+    if en_version is None or jp_version is None:
+        return None
+    return [en_version, jp_version]
+
+
+def fetch_latest_versions() -> Optional[list[str]]:
+    """
+    Downloads latest.txt, revalidating the last downloaded versions if there are any.
 
     Returns:
         Optional[list[str]]: The latest versions of the game data.
     """
+    cached = cache_handler.load("latest_versions")
+    validators = None
+    if cached is not None:
+        validators = cache_handler.load("latest_versions_validators")
     try:
-        response = requests.get(URL + "latest.txt")
-    except requests.exceptions.ConnectionError:
+        response = network_handler.get(URL + "latest.txt", validators)
+    except network_handler.DownloadError:
         return None
+    if response.status_code == 304 and cached is not None:
+        return cached
+    cache_handler.save(
+        "latest_versions_validators", network_handler.get_validators(response)
+    )
     versions = response.text.splitlines()
     return versions
 
 
+def get_latest_versions() -> Optional[list[str]]:
+    """
+    Gets the latest versions of the game data.
+
+    latest.txt is downloaded at most once every LATEST_VERSIONS_TTL seconds,
+    and kept in memory and in the app data folder in between. If it can't be
+    downloaded the last downloaded versions are used, and the download isn't
+    tried again for FAILED_VERSIONS_TTL seconds. In offline mode the newest
+    downloaded game data is used.
+
+    Returns:
+        Optional[list[str]]: The latest versions of the game data.
+    """
+    global _latest_versions  # pylint: disable=global-statement
+
+    if is_offline():
+        return get_local_versions()
+    with _versions_lock:
+        if (
+            _latest_versions is not None
+            and 0 <= time.time() - _latest_versions[0] < _latest_versions[1]
+        ):
+            return _latest_versions[2]
+        ttl = LATEST_VERSIONS_TTL
+        versions = cache_handler.load("latest_versions", LATEST_VERSIONS_TTL)
+        if versions is None:
+            versions = fetch_latest_versions()
+            if versions is None:
+                versions = cache_handler.load("latest_versions")
+                ttl = FAILED_VERSIONS_TTL
+            else:
+                cache_handler.save("latest_versions", versions)
+        _latest_versions = (time.time(), ttl, versions)
+        return versions
+
+
 def get_latest_version(is_jp: bool) -> Optional[str]:
     """
     Gets the latest version of the game data.
@@ -75,6 +450,8 @@ def get_latest_version(is_jp: bool) -> Optional[str]:
     Returns:
         str: The latest version of the game data.
     """
+    if is_offline():
+        return get_local_version(is_jp)
     versions = get_latest_versions()
     if versions is None:
         return None
@@ -138,35 +515,70 @@ def get_path(pack_name: str, file_name: str, is_jp: bool) -> Optional[str]:
     return os.path.join("game_data", version, pack_name, file_name)
 
 
+def schedule_removal(path: str) -> None:
+    """Delete a game data directory when the editor exits, so nothing waits for it"""
+
+    with _removal_lock:
+        if not _pending_removals:
+            atexit.register(remove_scheduled)
+        if path not in _pending_removals:
+            _pending_removals.append(path)
+
+
+def remove_scheduled() -> None:
+    """
+    Delete the game data directories scheduled for removal, then the stored
+    files that no remaining game version uses
+    """
+
+    with _removal_lock:
+        paths = _pending_removals.copy()
+        _pending_removals.clear()
+    if not paths:
+        return
+    game_data_archive.close_archives()
+    for path in paths:
+        helper.delete_dir(path)
+    game_data_archive.collect_garbage()
+    game_data_archive.close_archives()
+
+
 def check_remove(new_version: str, is_jp: bool):
     """
-    Checks if older game data is downloaded, and deletes if out of date.
+    Checks if older game data is downloaded, and deletes it on exit if out of date.
+
+    The newest KEEP_OLD_VERSIONS older versions are kept.
 
     Args:
         new_version (str): The new version.
         is_jp (bool): Whether to get the japanese version.
     """
     all_versions = helper.get_dirs(helper.get_file("game_data"))
-    for version in all_versions:
-        if is_jp:
-            if "jp" not in version:
-                continue
-            if version != new_version:
-                helper.delete_dir(helper.get_file(os.path.join("game_data", version)))
-        else:
-            if "jp" in version:
-                continue
-            if version != new_version:
-                helper.delete_dir(helper.get_file(os.path.join("game_data", version)))
+    old_versions = [
+        version
+        for version in all_versions
+        if is_jp == ("jp" in version) and version != new_version
+    ]
+    old_versions.sort(key=get_version_key, reverse=True)
+    for version in old_versions[KEEP_OLD_VERSIONS:]:
+        schedule_removal(helper.get_file(os.path.join("game_data", version)))
 
 
 def check_remove_handler():
     """
-    Checks if older game data is downloaded, and deletes if out of date.
+    Checks if older game data is downloaded, and deletes it on exit if out of date.
+
+    Only checks once every HOUSEKEEPING_INTERVAL seconds, and never in offline mode.
     """
 
+    if is_offline():
+        return None
+    if cache_handler.load("game_data_housekeeping", HOUSEKEEPING_INTERVAL):
+        return None
     versions = get_latest_versions()
     if versions is None:
         return None
     check_remove(versions[0], is_jp=False)
     check_remove(versions[1], is_jp=True)
+    cache_handler.save("game_data_housekeeping", versions)
+    return None
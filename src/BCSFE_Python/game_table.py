@@ -0,0 +1,213 @@
+"""Columnar tables of game data"""
+
+import array
+from typing import Any, Iterator, Optional, Sequence, Union
+
+from . import csv_handler, table_cache
+
+Column = Union["array.array[int]", tuple[Any, ...]]
+
+
+class GameTable:
+    """
+    The columns of a game data file, with an index of its rows by a key column
+
+    Columns of ints are stored as arrays and other columns as tuples. Rows
+    shorter than the widest row are padded with a fill value in the columns,
+    but get_row only returns the items the row has.
+    """
+
+    def __init__(
+        self,
+        columns: list[Column],
+        lengths: "array.array[int]",
+        names: Optional[list[str]] = None,
+        key_column: Optional[int] = None,
+    ):
+        self.columns = columns
+        self.lengths = lengths
+        self.names = names if names is not None else []
+        self.key_column = key_column
+        self.name_index = {name: i for i, name in enumerate(self.names)}
+        self.index: dict[Any, int] = {}
+        if key_column is not None and key_column < len(columns):
+            keys = columns[key_column]
+            for row_id, length in enumerate(lengths):
+                if length > key_column:
+                    self.index[keys[row_id]] = row_id
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.index
+
+    def keys(self) -> Iterator[Any]:
+        """Get the keys of the rows, in the order of the rows"""
+
+        return iter(self.index)
+
+    def get_column_id(self, column: Union[int, str]) -> int:
+        """Get the position of a column from its position or name"""
+
+        if isinstance(column, str):
+            return self.name_index[column]
+        return column
+
+    def get_column(self, column: Union[int, str]) -> Sequence[Any]:
+        """
+        Get a column, without copying it
+
+        The table is shared, so the column is read-only.
+
+        Args:
+            column (Union[int, str]): The position or name of the column
+
+        Returns:
+            Sequence[Any]: The value of the column for every row, a read-only memoryview of an array if all of them are ints
+        """
+        column_id = self.get_column_id(column)
+        if column_id >= len(self.columns):
+            return ()
+        values = self.columns[column_id]
+        if isinstance(values, array.array):
+            return memoryview(values).toreadonly()
+        return tuple(values)
+
+    def get_column_slice(
+        self, column: Union[int, str], start: int = 0, stop: Optional[int] = None
+    ) -> Sequence[Any]:
+        """Get some rows of a column, a read-only view of the column if it is an array"""
+
+        return self.get_column(column)[start:stop]
+
+    def get_row(self, row_id: int) -> list[Any]:
+        """Get the items of a row by its position"""
+
+        return [column[row_id] for column in self.columns[: self.lengths[row_id]]]
+
+    def get_row_id(self, key: Any) -> Optional[int]:
+        """Get the position of the row with a key"""
+
+        return self.index.get(key)
+
+    def get_row_by_key(self, key: Any) -> Optional[list[Any]]:
+        """Get the items of the row with a key"""
+
+        row_id = self.index.get(key)
+        if row_id is None:
+            return None
+        return self.get_row(row_id)
+
+    def get_row_dict(self, row_id: int) -> dict[str, Any]:
+        """Get the items of a row by the name of their column"""
+
+        return dict(zip(self.names, self.get_row(row_id)))
+
+    def get_value(self, row_id: int, column: Union[int, str], default: Any = 0) -> Any:
+        """Get an item of a row, or a default if the row or table doesn't have it"""
+
+        if isinstance(column, str) and column not in self.name_index:
+            return default
+        column_id = self.get_column_id(column)
+        if row_id >= len(self.lengths) or column_id >= self.lengths[row_id]:
+            return default
+        return self.columns[column_id][row_id]
+
+    @staticmethod
+    def from_rows(
+        rows: list[list[Any]],
+        has_header: bool = False,
+        key_column: Optional[int] = None,
+        fill: int = 0,
+    ) -> "GameTable":
+        """
+        Create a table from its rows
+
+        Args:
+            rows (list[list[Any]]): The rows
+            has_header (bool, optional): Whether the first row is the names of the columns. Defaults to False.
+            key_column (Optional[int], optional): The column to index the rows by. Defaults to None.
+            fill (int, optional): The value of the items missing from shorter rows. Defaults to 0.
+
+        Returns:
+            GameTable: The table
+        """
+        names: Optional[list[str]] = None
+        if has_header and rows:
+            names = [str(name) for name in rows[0]]
+            rows = rows[1:]
+        width = max((len(row) for row in rows), default=0)
+        columns: list[Column] = []
+        for column_id in range(width):
+            values = [row[column_id] if column_id < len(row) else fill for row in rows]
+            columns.append(to_column(values))
+        lengths = array.array("I", [len(row) for row in rows])
+        return GameTable(columns, lengths, names, key_column)
+
+    @staticmethod
+    def from_csv(
+        data: Union[str, bytes],
+        delimeter: str = ",",
+        has_header: bool = False,
+        key_column: Optional[int] = None,
+    ) -> "GameTable":
+        """Parse a table from CSV data"""
+
+        return GameTable.from_rows(
+            csv_handler.parse_int_csv(data, delimeter), has_header, key_column
+        )
+
+
+def to_column(values: list[Any]) -> Column:
+    """Store the values of a column as an array if they are all ints, otherwise as a tuple"""
+
+    if all(isinstance(value, int) for value in values):
+        try:
+            return array.array("q", values)
+        except OverflowError:
+            pass
+    return tuple(values)
+
+
+def parse_game_table(
+    data: bytes, delimeter: str, has_header: bool, key_column: Optional[int]
+) -> GameTable:
+    """Parse a game data file into a table"""
+
+    return GameTable.from_csv(data, delimeter, has_header, key_column)
+
+
+def get_game_table(
+    pack_name: str,
+    file_name: str,
+    is_jp: bool,
+    has_header: bool = False,
+    key_column: Optional[int] = None,
+    delimeter: str = ",",
+) -> Optional[GameTable]:
+    """
+    Get the latest version of a game data file as a table, parsed once per game version
+
+    The table is shared between callers, so it must not be modified.
+
+    Args:
+        pack_name (str): The pack name of the file
+        file_name (str): The file name
+        is_jp (bool): Whether to get the japanese version
+        has_header (bool, optional): Whether the first row is the names of the columns. Defaults to False.
+        key_column (Optional[int], optional): The column to index the rows by. Defaults to None.
+        delimeter (str, optional): The delimeter. Defaults to ",".
+
+    Returns:
+        Optional[GameTable]: The table, None if the latest version is unknown
+    """
+    return table_cache.get_table(
+        pack_name,
+        file_name,
+        is_jp,
+        parse_game_table,
+        delimeter,
+        has_header,
+        key_column,
+    )
@@ -11,6 +11,7 @@ from typing import Any, Callable, Generator, Optional, Union
 import colored  # type: ignore
 
 from . import (
+    backup_handler,
     user_input_handler,
     server_handler,
     patcher,
@@ -18,6 +19,7 @@ from . import (
     parse_save,
     config_manager,
     user_info,
+    user_rank,
 )
 
 GREEN = "#008000"
@@ -74,8 +76,7 @@ def delete_dir(path: str) -> None:
 def create_dirs(path: str) -> None:
     """Create directories if they don't exist"""
 
-    if not os.path.exists(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
 
 def offset_list(lst: list[int], offset: int) -> list[int]:
@@ -453,6 +454,7 @@ def check_managed_items(save_stats: dict[str, Any], path: str) -> None:
 def exit_editor():
     """Exit the editor"""
 
+    backup_handler.wait_for_backups()
     sys.exit(0)
 
 
@@ -611,21 +613,7 @@ def colored_list(
 def calculate_user_rank(save_stats: dict[str, Any]):
     """Calculate the user rank"""
 
-    user_rank = 0
-    for cat_id, cat_flag in enumerate(save_stats["cats"]):
-        if cat_flag == 0:
-            continue
-
-        user_rank += save_stats["cat_upgrades"]["Base"][cat_id] + 1
-        user_rank += save_stats["cat_upgrades"]["Plus"][cat_id]
-
-    for skill_id in range(len(save_stats["blue_upgrades"]["Base"])):
-        if skill_id == 1:
-            continue
-        user_rank += save_stats["blue_upgrades"]["Base"][skill_id] + 1
-        user_rank += save_stats["blue_upgrades"]["Plus"][skill_id]
-
-    return user_rank
+    return user_rank.get_user_rank(save_stats)
 
 
 def write_save_data(save_data: bytes, country_code: str, path: str, prompt: bool):
@@ -836,11 +824,15 @@ def load_save_file(path: str) -> dict[str, Any]:
     save_data = read_file_bytes(path)
     country_code = get_country_code(save_data)
     colored_text(f"Game version: &{country_code}&")
-    save_stats = parse_save.start_parse(save_data, country_code)
-    if config_manager.get_config_value_category("START_UP", "CREATE_BACKUP"):
-        write_file_bytes(path + "_backup", save_data)
+    create_backup = config_manager.get_config_value_category(
+        "START_UP", "CREATE_BACKUP"
+    )
+    offsets: Optional[list[tuple[str, int, int]]] = [] if create_backup else None
+    save_stats = parse_save.start_parse(save_data, country_code, offsets)
+    if create_backup:
+        backup_handler.backup_save_async(path, save_data, offsets)
         colored_text(
-            f"Backup created at: &{os.path.abspath(path + '_backup')}&", new=GREEN
+            f"Backup created in: &{backup_handler.get_backup_folder()}&", new=GREEN
         )
     return {
         "save_data": save_data,
@@ -0,0 +1,81 @@
+"""Tables of the xp needed to reach each level, e.g gamatoto and cat shrine levels"""
+
+import array
+import bisect
+import itertools
+from typing import Any, Iterable
+
+
+class LevelTable:
+    """
+    The total xp needed to reach each level after level 1
+
+    The thresholds are in ascending order, so the level of an xp amount is
+    found with a binary search instead of comparing it with every threshold.
+    The table has no game data of its own, so it can convert the xp of any
+    number of saves once it has been parsed.
+    """
+
+    # bump when the layout of the table changes so stored ones are rebuilt
+    LAYOUT_VERSION = 1
+
+    def __init__(self, thresholds: Iterable[int], clamp: bool = False):
+        """
+        Initialize a LevelTable
+
+        Args:
+            thresholds (Iterable[int]): The total xp needed to reach level 2, level 3 and so on
+            clamp (bool, optional): Whether levels are limited to the max level. Defaults to False.
+        """
+        self.thresholds = array.array("q", thresholds)
+        self.clamp = clamp
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    @staticmethod
+    def from_increments(increments: Iterable[int], clamp: bool = False) -> "LevelTable":
+        """Create a LevelTable from the xp needed to go from each level to the next"""
+
+        return LevelTable(itertools.accumulate(increments), clamp)
+
+    def get_max_level(self) -> int:
+        """Get the max level"""
+
+        return len(self.thresholds)
+
+    def get_max_xp(self) -> int:
+        """Get the xp needed to reach the max level"""
+
+        return self.thresholds[-2]
+
+    def get_level(self, xp: int) -> int:
+        """Get the level reached with an amount of xp"""
+
+        level = bisect.bisect_right(self.thresholds, xp) + 1
+        if self.clamp and level > len(self.thresholds):
+            level = len(self.thresholds)
+        return level
+
+    def get_xp(self, level: int) -> int:
+        """Get the xp needed to reach a level"""
+
+        if level <= 1:
+            return 0
+        return self.thresholds[level - 2]
+
+    def get_level_data(self, xp: int) -> dict[str, Any]:
+        """
+        Get the level, max level and max xp of an amount of xp
+
+        Args:
+            xp (int): The amount of xp
+
+        Returns:
+            dict[str, Any]: The level, max level, and max xp
+        """
+        return {
+            "level": self.get_level(xp),
+            "max_level": self.get_max_level(),
+            "max_xp": self.get_max_xp(),
+        }
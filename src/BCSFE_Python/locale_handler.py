@@ -1,3 +1,5 @@
+import json
+from typing import Optional
 from . import config_manager, helper
 import os
 
@@ -34,65 +36,142 @@ class PropertySet:
 
 
 class LocalManager:
+    """
+    All keys of a locale with English as the fallback, flattened into a single
+    dict with templates resolved when loaded. The result is cached in the app
+    data folder and only rebuilt when a .properties file changes.
+    """
+
+    managers: dict[str, "LocalManager"] = {}
+
     def __init__(self, locale: str):
         self.locale = locale
         self.path = os.path.join(helper.get_local_files_path(), "locales", locale)
         if not os.path.exists(self.path):
             os.makedirs(self.path)
-        self.properties: dict[str, PropertySet] = {}
         self.is_en = locale == "en"
-        if not self.is_en:
-            self.en_path = os.path.join(helper.get_local_files_path(), "locales", "en")
-            if not os.path.exists(self.en_path):
-                os.makedirs(self.en_path)
-            self.en_properties: dict[str, PropertySet] = {}
+        self.en_path = os.path.join(helper.get_local_files_path(), "locales", "en")
+        if not os.path.exists(self.en_path):
+            os.makedirs(self.en_path)
+        self.properties: dict[str, dict[str, str]] = {}
+        self.values: dict[str, str] = {}
+        self.load()
+
+    def get_sources(self) -> dict[str, int]:
+        """Get the modification time of every .properties file used by the locale"""
+
+        paths = [self.en_path] if self.is_en else [self.en_path, self.path]
+        sources: dict[str, int] = {}
+        for path in paths:
+            for file in helper.get_files_in_dir(path):
+                if file.endswith(".properties"):
+                    sources[file] = os.stat(file).st_mtime_ns
+        return sources
+
+    def get_cache_path(self) -> str:
+        """Get the path of the compiled locale"""
+
+        return os.path.join(
+            config_manager.get_app_data_folder(), "locale_cache", f"{self.locale}.json"
+        )
+
+    def load(self):
+        """Load the compiled locale, compiling it if it is missing or out of date"""
+
+        sources = self.get_sources()
+        cache_path = self.get_cache_path()
+        if os.path.exists(cache_path):
+            try:
+                data = json.loads(helper.read_file_string(cache_path))
+            except json.JSONDecodeError:
+                data = None
+            if data is not None and data.get("sources") == sources:
+                self.properties = data["properties"]
+                self.values = data["values"]
+                return
         self.parse()
+        data = {
+            "sources": sources,
+            "properties": self.properties,
+            "values": self.values,
+        }
+        helper.create_dirs(os.path.dirname(cache_path))
+        temp_path = cache_path + ".tmp"
+        helper.write_file_string(temp_path, json.dumps(data))
+        os.replace(temp_path, cache_path)
 
     def parse(self):
-        for file in helper.get_files_in_dir(self.path):
-            file_name = os.path.basename(file)
-            if file_name.endswith(".properties"):
-                self.properties[file_name[:-11]] = PropertySet(
-                    self.locale, file_name[:-11]
-                )
-        if not self.is_en:
-            for file in helper.get_files_in_dir(self.en_path):
+        """Parse the .properties files and resolve the templates of every key"""
+
+        raw: dict[str, str] = {}
+        paths = [self.en_path] if self.is_en else [self.en_path, self.path]
+        for path in paths:
+            for file in helper.get_files_in_dir(path):
                 file_name = os.path.basename(file)
-                if file_name.endswith(".properties"):
-                    self.en_properties[file_name[:-11]] = PropertySet(
-                        "en", file_name[:-11]
+                if not file_name.endswith(".properties"):
+                    continue
+                property_set = PropertySet(
+                    os.path.basename(path), file_name[: -len(".properties")]
+                )
+                if path == self.path:
+                    self.properties[file_name[: -len(".properties")]] = (
+                        property_set.properties
                     )
+                for key in property_set.properties:
+                    raw[key] = property_set.get_key(key)
 
-    def get_key(self, property: str, key: str) -> str:
-        return self.properties[property].get_key(key)
+        self.values = {}
+        for key in raw:
+            self.resolve(key, raw, [])
 
-    def search_key(self, key: str) -> str:
-        value = None
-        for prop in self.properties.values():
-            if key in prop.properties:
-                value = prop.get_key(key)
-        if not self.is_en:
-            for prop in self.en_properties.values():
-                if key in prop.properties:
-                    value = prop.get_key(key)
-        if value is None:
-            raise KeyError(f"Key {key} not found")
+    def resolve(self, key: str, raw: dict[str, str], resolving: list[str]) -> str:
+        """Resolve the {{key}} templates in a value, unknown keys are left as is"""
 
+        if key in self.values:
+            return self.values[key]
+        value = raw[key]
+        resolving.append(key)
+        position = 0
         while True:
-            start = value.find("{{")
+            start = value.find("{{", position)
             if start == -1:
                 break
-            end = value.find("}}")
+            end = value.find("}}", start)
             if end == -1:
                 break
-            value = value.replace(
-                value[start : end + 2], self.search_key(value[start + 2 : end])
-            )
+            template_key = value[start + 2 : end]
+            if template_key not in raw or template_key in resolving:
+                position = end + 2
+                continue
+            template_value = self.resolve(template_key, raw, resolving)
+            value = value[:start] + template_value + value[end + 2 :]
+            position = start + len(template_value)
+        resolving.pop()
+        self.values[key] = value
         return value
 
+    def get_key(self, property: str, key: str) -> str:
+        return self.properties[property][key].replace("\\n", "\n")
+
+    def search_key(self, key: str) -> str:
+        value: Optional[str] = self.values.get(key)
+        if value is None:
+            raise KeyError(f"Key {key} not found")
+        return value
+
+    @staticmethod
+    def get(locale: str) -> "LocalManager":
+        """Get the shared manager of a locale"""
+
+        manager = LocalManager.managers.get(locale)
+        if manager is None:
+            manager = LocalManager(locale)
+            LocalManager.managers[locale] = manager
+        return manager
+
     @staticmethod
     def from_config() -> "LocalManager":
-        return LocalManager(config_manager.get_config_value("LOCALE"))
+        return LocalManager.get(config_manager.get_config_value("LOCALE"))
 
     @staticmethod
     def get_locales() -> list[str]:
@@ -0,0 +1,365 @@
+"""Shared HTTP session for downloading game data"""
+
+import concurrent.futures
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from . import helper
+
+if TYPE_CHECKING:
+    import requests
+
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+POOL_SIZE = 16
+CHUNK_SIZE = 65536
+# concurrent downloads and attempts per file for bulk downloads
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_ATTEMPTS = 3
+
+_session_lock = threading.Lock()
+_session: Optional["requests.Session"] = None
+
+
+class DownloadError(Exception):
+    """A request failed, after retrying, or returned an error status"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_session() -> "requests.Session":
+    """
+    Get the shared session, which keeps connections alive between requests and
+    retries failed requests with an exponential backoff
+
+    Returns:
+        requests.Session: The session
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+    from requests.adapters import (  # pylint: disable=import-outside-toplevel
+        HTTPAdapter,
+    )
+    from urllib3.util.retry import Retry  # pylint: disable=import-outside-toplevel
+
+    global _session  # pylint: disable=global-statement
+
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_conditional_headers(validators: Optional[dict[str, str]]) -> dict[str, str]:
+    """Get the headers to revalidate a cached response"""
+
+    headers: dict[str, str] = {}
+    if not validators:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def get_validators(response: "requests.Response") -> dict[str, str]:
+    """Get the ETag and Last-Modified of a response"""
+
+    validators: dict[str, str] = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    return validators
+
+
+def get(
+    url: str,
+    validators: Optional[dict[str, str]] = None,
+    stream: bool = False,
+    headers: Optional[dict[str, str]] = None,
+) -> "requests.Response":
+    """
+    Send a GET request with the shared session
+
+    Args:
+        url (str): The url
+        validators (Optional[dict[str, str]], optional): Validators of a cached response, a 304 response is returned if it is still valid. Defaults to None.
+        stream (bool, optional): Whether to stream the body. Defaults to False.
+        headers (Optional[dict[str, str]], optional): Extra headers. Defaults to None.
+
+    Raises:
+        DownloadError: If the request failed or returned an error status
+
+    Returns:
+        requests.Response: The response
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    all_headers = get_conditional_headers(validators)
+    if headers:
+        all_headers.update(headers)
+    try:
+        response = get_session().get(
+            url, headers=all_headers, timeout=REQUEST_TIMEOUT, stream=stream
+        )
+        if response.status_code >= 400:
+            # read the error body so the connection can be reused
+            _ = response.content
+            response.raise_for_status()
+    except requests.exceptions.RequestException as err:
+        status_code = err.response.status_code if err.response is not None else None
+        raise DownloadError(f"Failed to download {url}: {err}", status_code) from err
+    return response
+
+
+def get_partial_validators_path(temp_path: str) -> str:
+    """Get the path of the validators of the response a partial file was started from"""
+
+    return f"{temp_path}.json"
+
+
+def remove_partial(temp_path: str) -> None:
+    """Remove a partial file and its validators"""
+
+    for file_path in (temp_path, get_partial_validators_path(temp_path)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def load_partial_validators(temp_path: str) -> Optional[dict[str, str]]:
+    """Load the validators of the response a partial file was started from"""
+
+    try:
+        with open(
+            get_partial_validators_path(temp_path), "r", encoding="utf-8"
+        ) as file:
+            validators = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return validators if isinstance(validators, dict) else None
+
+
+def get_if_range(validators: dict[str, str]) -> Optional[str]:
+    """Get the If-Range header that only allows a range of the same file, None if there is no usable validator"""
+
+    etag = validators.get("etag")
+    # weak etags can't be used for ranges
+    if etag and not etag.startswith("W/"):
+        return etag
+    return validators.get("last_modified") or None
+
+
+def is_continuation(
+    response: "requests.Response", offset: int, validators: dict[str, str]
+) -> bool:
+    """Check that a 206 response continues the partial file it was asked for"""
+
+    content_range = response.headers.get("Content-Range", "")
+    if not content_range.startswith(f"bytes {offset}-"):
+        return False
+    new_validators = get_validators(response)
+    for key in ("etag", "last_modified"):
+        if validators.get(key) and new_validators.get(key) != validators[key]:
+            return False
+    return True
+
+
+def download(
+    url: str,
+    path: str,
+    validators: Optional[dict[str, str]] = None,
+    resume: bool = False,
+) -> Optional[dict[str, str]]:
+    """
+    Download a file, writing it to a temporary file first so that a failed
+    download never leaves a partial file behind
+
+    A resumed download asks for the rest of the file with an If-Range of the
+    response the partial file was started from and without content encoding,
+    so the partial file is only continued if the file didn't change.
+
+    Args:
+        url (str): The url
+        path (str): Path to write the file to
+        validators (Optional[dict[str, str]], optional): Validators of the existing file, it is kept if still valid. Defaults to None.
+        resume (bool, optional): Whether to keep the partial file of a failed download and continue it next time. Defaults to False.
+
+    Raises:
+        DownloadError: If the download failed
+
+    Returns:
+        Optional[dict[str, str]]: The validators of the new file, None if the existing file is still valid
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    headers: dict[str, str] = {}
+    offset = 0
+    partial_validators: dict[str, str] = {}
+    if resume:
+        temp_path = f"{path}.part"
+        # ranges are of the encoded bytes, so the body must not be encoded
+        headers["Accept-Encoding"] = "identity"
+        if os.path.exists(temp_path):
+            partial_validators = load_partial_validators(temp_path) or {}
+            if_range = get_if_range(partial_validators)
+            offset = os.path.getsize(temp_path) if if_range is not None else 0
+            if offset and if_range is not None:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = if_range
+            else:
+                # the partial file can't be checked against the file
+                remove_partial(temp_path)
+    else:
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        response = get(url, validators, stream=True, headers=headers)
+    except DownloadError as err:
+        if err.status_code != 416:
+            raise
+        # the partial file is not a prefix of the file, so start again
+        remove_partial(temp_path)
+        headers.pop("Range", None)
+        headers.pop("If-Range", None)
+        response = get(url, validators, stream=True, headers=headers)
+        offset = 0
+    if response.status_code == 304:
+        response.close()
+        if offset:
+            # the partial file may be of different content
+            remove_partial(temp_path)
+        return None
+    if (
+        offset
+        and response.status_code == 206
+        and not is_continuation(response, offset, partial_validators)
+    ):
+        response.close()
+        remove_partial(temp_path)
+        return download(url, path, validators, resume)
+    helper.create_dirs(os.path.dirname(path))
+    # the server sends the whole file if it changed or it ignores the range
+    append = offset and response.status_code == 206
+    try:
+        if resume and not append:
+            helper.write_file_string(
+                get_partial_validators_path(temp_path),
+                json.dumps(get_validators(response)),
+            )
+        with open(temp_path, "ab" if append else "wb") as file:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                file.write(chunk)
+        os.replace(temp_path, path)
+        if resume:
+            remove_partial(temp_path)
+    except (OSError, requests.exceptions.RequestException) as err:
+        raise DownloadError(f"Failed to download {url}: {err}") from err
+    finally:
+        response.close()
+        if not resume and os.path.exists(temp_path):
+            os.remove(temp_path)
+    return get_validators(response)
+
+
+class DownloadJob:
+    """A file to download in a bulk download"""
+
+    def __init__(
+        self, url: str, path: str, validators: Optional[dict[str, str]] = None
+    ):
+        self.url = url
+        self.path = path
+        self.validators = validators
+        self.not_modified = False
+        self.error: Optional[DownloadError] = None
+
+
+def download_job(job: DownloadJob, attempts: int) -> DownloadJob:
+    """
+    Download a file, resuming from where the last attempt stopped. If the job
+    has validators the file is only downloaded if it doesn't match them.
+    """
+
+    for _ in range(attempts):
+        try:
+            validators = download(job.url, job.path, job.validators, resume=True)
+            if validators is None:
+                job.not_modified = True
+            else:
+                job.validators = validators
+            job.error = None
+            break
+        except DownloadError as err:
+            job.error = err
+            if err.status_code is not None and 400 <= err.status_code < 500:
+                # retrying won't help if the file doesn't exist
+                break
+    if job.error is not None:
+        # nothing will resume the partial file
+        remove_partial(f"{job.path}.part")
+    return job
+
+
+def download_many(
+    jobs: list[DownloadJob],
+    workers: int = DOWNLOAD_WORKERS,
+    attempts: int = DOWNLOAD_ATTEMPTS,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> list[DownloadJob]:
+    """
+    Download files concurrently over the shared session
+
+    Args:
+        jobs (list[DownloadJob]): The files to download
+        workers (int, optional): Maximum concurrent downloads. Defaults to DOWNLOAD_WORKERS.
+        attempts (int, optional): Attempts per file, each resuming the last one. Defaults to DOWNLOAD_ATTEMPTS.
+        progress (Optional[Callable[[int, int], None]], optional): Called with the number of finished and total files. Defaults to None.
+
+    Returns:
+        list[DownloadJob]: The jobs that failed
+    """
+    failed: list[DownloadJob] = []
+    if not jobs:
+        return failed
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(workers, POOL_SIZE, len(jobs))),
+        thread_name_prefix="download",
+    ) as executor:
+        futures = [executor.submit(download_job, job, attempts) for job in jobs]
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            job = future.result()
+            if job.error is not None:
+                failed.append(job)
+            if progress is not None:
+                progress(done, len(jobs))
+    return failed
+
+
+def close() -> None:
+    """Close the connections of the shared session"""
+
+    global _session  # pylint: disable=global-statement
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -11,11 +11,25 @@ from typing import Any, Optional, Union
 
 from . import helper
 from . import updater
+from . import user_rank
 
 address = 0
 save_data_g = None
 
 
+class SectionRecorder(dict):  # type: ignore
+    """Save stats that record the address each time a section is parsed"""
+
+    def __init__(self, offsets: list[tuple[str, int, int]]):
+        super().__init__()
+        self.offsets = offsets
+
+    def __setitem__(self, key: str, value: Any):
+        super().__setitem__(key, value)
+        start = self.offsets[-1][2] if self.offsets else 0
+        self.offsets.append((key, start, address))
+
+
 def re_order(data: dict[str, Any]) -> collections.OrderedDict[str, Any]:
     """Move all unknown vals to the bottom of the json"""
 
@@ -1562,11 +1576,15 @@ def get_play_time() -> dict[str, Any]:
     return play_time_data
 
 
-def start_parse(save_data: bytes, country_code: str) -> dict[str, Any]:
+def start_parse(
+    save_data: bytes,
+    country_code: str,
+    offsets: Optional[list[tuple[str, int, int]]] = None,
+) -> dict[str, Any]:
     """Start the parser and handle any exceptions."""
 
     try:
-        save_stats = parse_save(save_data, country_code)
+        save_stats = parse_save(save_data, country_code, offsets=offsets)
     except Exception:  # pylint: disable=broad-except
         helper.colored_text(
             f"\nError: An error has occurred while parsing your save data (address = {address}):",
@@ -1883,14 +1901,50 @@ def parse_save(
     save_data: bytes,
     country_code: Union[str, None],
     dst: Optional[bool] = None,
+    offsets: Optional[list[tuple[str, int, int]]] = None,
+) -> dict[str, Any]:
+    """
+    Parse the save data.
+
+    Args:
+        save_data (bytes): The save data
+        country_code (Union[str, None]): The country code of the save
+        dst (Optional[bool], optional): If the save has dst, detected if None. Defaults to None.
+        offsets (Optional[list[tuple[str, int, int]]], optional): If given, filled with the key, start and end offset of each section in parse order. Defaults to None.
+
+    Returns:
+        dict[str, Any]: The save stats
+    """
+    save_stats = parse_sections(save_data, country_code, dst, offsets)
+    if isinstance(save_stats, SectionRecorder):
+        # stop recording, later edits to the save stats aren't sections
+        save_stats = dict(save_stats)
+    try:
+        user_rank.track(save_stats)
+    except IndexError:
+        # the upgrades don't line up with the cats, so the user rank can't be
+        # worked out, which is only an error if something asks for it
+        pass
+    return save_stats
+
+
+def parse_sections(
+    save_data: bytes,
+    country_code: Union[str, None],
+    dst: Optional[bool] = None,
+    offsets: Optional[list[tuple[str, int, int]]] = None,
 ) -> dict[str, Any]:
-    """Parse the save data."""
+    """Parse each section of the save data, recording its offsets if offsets is given"""
+
     if country_code == "ja" or country_code == "":
         country_code = "jp"
     set_address(0)
     global save_data_g
     save_data_g = save_data
     save_stats: dict[str, Any] = {}
+    if offsets is not None:
+        offsets.clear()
+        save_stats = SectionRecorder(offsets)
     save_stats["editor_version"] = updater.get_local_version()
 
     save_stats["game_version"] = next_int_len(4)
@@ -1952,9 +2006,9 @@ def parse_save(
     try:
         save_stats["enemy_guide"] = get_length_data()
     except Exception:
-        return parse_save(save_data, country_code, not dst)
+        return parse_sections(save_data, country_code, not dst, offsets)
     if len(save_stats["enemy_guide"]) == 0:
-        return parse_save(save_data, country_code, not dst)
+        return parse_sections(save_data, country_code, not dst, offsets)
     save_stats["cats"] = get_length_data()
     save_stats["cat_upgrades"] = get_cat_upgrades()
     save_stats["current_forms"] = get_length_data()
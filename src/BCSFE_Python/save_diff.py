@@ -0,0 +1,162 @@
+"""Section level diff of two saves
+
+Usage: python -m BCSFE_Python.save_diff OLD_SAVE NEW_SAVE
+"""
+
+import sys
+from typing import Any, Optional, Union
+
+from . import helper, parse_save, patcher
+
+# keys that never describe the contents of the save
+IGNORED_KEYS = {"editor_version", "hash", "exit"}
+# sections that the parser extends after first setting them, so their bytes are not contiguous
+ALWAYS_COMPARE = {"time_stamps_2"}
+
+Path = tuple[Union[str, int], ...]
+
+
+class Change:
+    """A changed value in a save"""
+
+    def __init__(self, path: Path, old: Any, new: Any):
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def get_path_str(self) -> str:
+        """Get the path as text, e.g. cats[123]"""
+
+        text = str(self.path[0])
+        for key in self.path[1:]:
+            text += f"[{key}]" if isinstance(key, int) else f".{key}"
+        return text
+
+    def __str__(self) -> str:
+        return f"{self.get_path_str()}: {format_value(self.old)} -> {format_value(self.new)}"
+
+
+def format_value(value: Any) -> str:
+    """Format a value for the diff output"""
+
+    if value is None:
+        return "(none)"
+    if isinstance(value, str):
+        return repr(value)
+    return str(value)
+
+
+def get_sections(
+    offsets: list[tuple[str, int, int]],
+) -> dict[str, tuple[int, int, int]]:
+    """Get the start and end offset and the number of times each section was set"""
+
+    sections: dict[str, tuple[int, int, int]] = {}
+    for key, start, end in offsets:
+        if key in sections:
+            old_start, old_end, count = sections[key]
+            sections[key] = (min(old_start, start), max(old_end, end), count + 1)
+        else:
+            sections[key] = (start, end, 1)
+    return sections
+
+
+def diff_values(old: Any, new: Any, path: Path, changes: list[Change]) -> None:
+    """Add the differences between two parsed values to a list of changes"""
+
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        if set(old) == {"Value", "Length"} and set(new) == {"Value", "Length"}:
+            changes.append(Change(path, old["Value"], new["Value"]))
+            return
+        for key in old:  # type: ignore
+            diff_values(old[key], new.get(key), path + (key,), changes)  # type: ignore
+        for key in new:  # type: ignore
+            if key not in old:
+                diff_values(None, new[key], path + (key,), changes)  # type: ignore
+        return
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        for index in range(max(len(old), len(new))):  # type: ignore
+            old_item = old[index] if index < len(old) else None  # type: ignore
+            new_item = new[index] if index < len(new) else None  # type: ignore
+            diff_values(old_item, new_item, path + (index,), changes)
+        return
+    changes.append(Change(path, old, new))
+
+
+def diff_saves(
+    save_data_1: bytes, save_data_2: bytes, country_code: Optional[str] = None
+) -> list[Change]:
+    """
+    Get the changes between two saves
+
+    Sections with identical bytes are skipped without comparing their values.
+
+    Args:
+        save_data_1 (bytes): The old save data
+        save_data_2 (bytes): The new save data
+        country_code (Optional[str], optional): Country code of the saves, detected if None. Defaults to None.
+
+    Returns:
+        list[Change]: The changed values, in save order
+    """
+    if save_data_1[:-32] == save_data_2[:-32]:
+        return []
+    if country_code is None:
+        country_code = patcher.detect_game_version(save_data_1)
+        if country_code is None:
+            country_code = patcher.detect_game_version(save_data_2)
+
+    offsets_1: list[tuple[str, int, int]] = []
+    offsets_2: list[tuple[str, int, int]] = []
+    save_stats_1 = parse_save.parse_save(save_data_1, country_code, offsets=offsets_1)
+    save_stats_2 = parse_save.parse_save(save_data_2, country_code, offsets=offsets_2)
+    sections_1 = get_sections(offsets_1)
+    sections_2 = get_sections(offsets_2)
+
+    changes: list[Change] = []
+    for key in save_stats_1:
+        if key in IGNORED_KEYS:
+            continue
+        if key not in save_stats_2:
+            changes.append(Change((key,), save_stats_1[key], None))
+            continue
+        start_1, end_1, count_1 = sections_1[key]
+        start_2, end_2, count_2 = sections_2[key]
+        if (
+            key not in ALWAYS_COMPARE
+            and count_1 == count_2 == 1
+            and end_1 > start_1
+            and save_data_1[start_1:end_1] == save_data_2[start_2:end_2]
+        ):
+            continue
+        diff_values(save_stats_1[key], save_stats_2[key], (key,), changes)
+    for key in save_stats_2:
+        if key not in save_stats_1 and key not in IGNORED_KEYS:
+            changes.append(Change((key,), None, save_stats_2[key]))
+    return changes
+
+
+def diff_files(path_1: str, path_2: str) -> list[Change]:
+    """Get the changes between two save files"""
+
+    return diff_saves(helper.read_file_bytes(path_1), helper.read_file_bytes(path_2))
+
+
+def main(args: list[str]) -> int:
+    """Print the changes between two save files"""
+
+    if len(args) != 2:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    changes = diff_files(args[0], args[1])
+    for change in changes:
+        print(change)
+    if not changes:
+        print("The saves are identical")
+    return 1 if changes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
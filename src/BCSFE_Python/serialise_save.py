@@ -3,8 +3,6 @@
 import struct
 from typing import Any, Union
 
-import dateutil.parser
-
 from . import helper, parse_save
 
 
@@ -107,6 +105,8 @@ def serialise_time_data_skip(
     duplicate: dict[str, Any],
     dst: int = 0,
 ) -> list[int]:
+    import dateutil.parser  # pylint: disable=import-outside-toplevel
+
     time = dateutil.parser.parse(time_data)
     save_data = write(save_data, time.year, 4)
     save_data = write(save_data, duplicate["yy"], 4)
@@ -132,6 +132,8 @@ def serialise_time_data_skip(
 def serialise_time_data(
     save_data: list[int], time: str, dst_flag: bool, dst: int = 0
 ) -> list[int]:
+    import dateutil.parser  # pylint: disable=import-outside-toplevel
+
     time_d = dateutil.parser.parse(time)
     if dst_flag:
         save_data = write(save_data, dst, 1)
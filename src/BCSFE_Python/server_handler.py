@@ -6,9 +6,7 @@ import hmac
 import json
 from random import randint
 import time
-from typing import Any, Optional, Union
-
-import requests
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from . import (
     helper,
@@ -20,6 +18,9 @@ from . import (
     parse_save,
 )
 
+if TYPE_CHECKING:
+    import requests
+
 
 def get_current_time() -> int:
     """Get current time."""
@@ -153,6 +154,8 @@ def handle_request(
 ) -> Union[dict[str, Any], None]:
     """Handle a request."""
 
+    import requests  # pylint: disable=import-outside-toplevel
+
     try:
         if is_get:
             response = requests.get(url, data=data, headers=headers)
@@ -266,10 +269,12 @@ def download_save(
     transfer_code: str,
     confirmation_code: str,
     game_version: str,
-) -> requests.Response:
+) -> "requests.Response":
     """Downloads the save for the given country_code, transfer_code, confirmation_code
     and game_version"""
 
+    import requests  # pylint: disable=import-outside-toplevel
+
     country_code = country_code.replace("jp", "ja")
     url = get_nyanko_save_url() + "/v2/transfers/" + transfer_code + "/reception"
     data = get_client_info(country_code, game_version)
@@ -417,6 +422,8 @@ def upload_save_data_v2(
 ):
     """Uploads the save data for the given token, inquiry_code and save_data"""
 
+    import requests  # pylint: disable=import-outside-toplevel
+
     if not config_manager.get_config_value_category("SERVER", "UPLOAD_METADATA"):
         items = []
     save_key_data = get_save_key_data(token)
@@ -457,6 +464,8 @@ def upload_metadata_v2(
 ):
     """Uploads the save data for the given token, inquiry_code and save_data"""
 
+    import requests  # pylint: disable=import-outside-toplevel
+
     if not config_manager.get_config_value_category("SERVER", "UPLOAD_METADATA"):
         items = []
     save_key_data = get_save_key_data(token)
@@ -557,6 +566,8 @@ def get_nyanko_managed_items_url() -> str:
 def get_inquiry_code() -> str:
     """Returns a new inquiry code"""
 
+    import requests  # pylint: disable=import-outside-toplevel
+
     url = get_nyanko_backups_url() + "/?action=createAccount&referenceId="
     response = requests.get(url)
     data = response.json()
@@ -0,0 +1,173 @@
+"""Import time breakdown of starting the editor
+
+The imports are timed in a new interpreter, so the breakdown is the same as a
+cold start of the editor.
+
+Usage: python -m BCSFE_Python --startup-profile
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Optional
+
+START_UP_MODULE = "BCSFE_Python.__main__"
+
+
+class ImportTime:
+    """Time taken to import a module, in seconds"""
+
+    def __init__(self, name: str, self_time: float, cumulative_time: float, depth: int):
+        self.name = name
+        self.self_time = self_time
+        self.cumulative_time = cumulative_time
+        self.depth = depth
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "self_time": self.self_time,
+            "cumulative_time": self.cumulative_time,
+            "depth": self.depth,
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "ImportTime":
+        return ImportTime(
+            data["name"], data["self_time"], data["cumulative_time"], data["depth"]
+        )
+
+
+class ImportTimer:
+    """
+    Meta path finder that times the execution of every module it sees
+
+    Unlike python -X importtime, this also times submodules imported with
+    `from . import module`.
+    """
+
+    def __init__(self):
+        self.times: list[ImportTime] = []
+        self.stack: list[list[float]] = []
+
+    def find_spec(self, name: str, path: Any, target: Any = None) -> Any:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            if loader is not None and not isinstance(loader, type):
+                loader.exec_module = self.wrap(name, loader.exec_module)
+            return spec
+        return None
+
+    def wrap(
+        self, name: str, exec_module: Callable[[Any], None]
+    ) -> Callable[[Any], None]:
+        """Wrap the exec_module method of a loader to time it"""
+
+        def timed_exec_module(module: Any) -> None:
+            depth = len(self.stack)
+            self.stack.append([0.0])
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                cumulative_time = time.perf_counter() - start
+                children_time = self.stack.pop()[0]
+                if self.stack:
+                    self.stack[-1][0] += cumulative_time
+                self.times.append(
+                    ImportTime(
+                        name, cumulative_time - children_time, cumulative_time, depth
+                    )
+                )
+
+        return timed_exec_module
+
+    def __enter__(self) -> "ImportTimer":
+        sys.meta_path.insert(0, self)  # type: ignore
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        sys.meta_path.remove(self)  # type: ignore
+
+
+def profile_imports(module: str) -> None:
+    """Import a module and print the import times as json, run in a new interpreter"""
+
+    with ImportTimer() as timer:
+        __import__(module)
+    print(json.dumps([import_time.to_dict() for import_time in timer.times]))
+
+
+def get_import_times(module: str = START_UP_MODULE) -> list[ImportTime]:
+    """Import a module in a new interpreter and get the import time of every module"""
+
+    env = dict(os.environ)
+    package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (package_path, env.get("PYTHONPATH")) if path
+    )
+    code = (
+        "import importlib.util\n"
+        f"spec = importlib.util.spec_from_file_location('startup_profile', {__file__!r})\n"
+        "startup_profile = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(startup_profile)\n"
+        f"startup_profile.profile_imports({module!r})\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    output = result.stdout.strip().splitlines()[-1]
+    return [ImportTime.from_dict(data) for data in json.loads(output)]
+
+
+def get_package(name: str) -> str:
+    """Get the name used to group a module, its top level package or editor module"""
+
+    parts = name.split(".")
+    if parts[0] == "BCSFE_Python" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def format_profile(times: list[ImportTime], limit: int = 20) -> str:
+    """
+    Format an import time breakdown
+
+    Args:
+        times (list[ImportTime]): The import times
+        limit (int, optional): Number of packages to show. Defaults to 20.
+
+    Returns:
+        str: The breakdown
+    """
+    packages: dict[str, float] = {}
+    for import_time in times:
+        package = get_package(import_time.name)
+        packages[package] = packages.get(package, 0) + import_time.self_time
+    total = sum(packages.values())
+
+    lines = [f"{'Package':<40} {'Time (ms)':>10} {'Share':>7}"]
+    for package, self_time in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[:limit]:
+        share = self_time / total if total else 0
+        lines.append(f"{package:<40} {self_time * 1000:>10.1f} {share:>7.1%}")
+    lines.append(f"{f'Total ({len(times)} modules)':<40} {total * 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def main(module: Optional[str] = None) -> None:
+    """Print the import time breakdown of starting the editor"""
+
+    print(format_profile(get_import_times(module or START_UP_MODULE)))
@@ -0,0 +1,252 @@
+"""Cache of parsed game data tables, kept in memory and on disk"""
+
+import os
+import pickle
+import threading
+import zlib
+from typing import Any, Callable, Optional
+
+from . import csv_handler, game_data_archive, game_data_getter, helper
+
+# bump when the format of a cached table changes so old ones are ignored
+CACHE_VERSION = 1
+
+_tables_lock = threading.Lock()
+_tables: dict[tuple[str, str, str], Any] = {}
+
+
+def parse_int_csv(data: bytes) -> list[list[Any]]:
+    """Parse a CSV file, turning the values that are numbers into ints"""
+
+    return csv_handler.parse_int_csv(data)
+
+
+def parse_text_csv(data: bytes, delimeter: str = ",") -> list[list[str]]:
+    """Parse a CSV file of text"""
+
+    return csv_handler.parse_csv(data, delimeter)
+
+
+def get_parser_name(parser: Callable[..., Any], args: tuple[Any, ...]) -> str:
+    """Get a name for a parser and its arguments that is safe to use in a file name"""
+
+    name = f"{parser.__module__}.{parser.__qualname__}"
+    if args:
+        name += f".{zlib.crc32(repr(args).encode('utf-8')):08x}"
+    return name
+
+
+def get_cache_path(game_version: str, key: str, parser_name: str) -> str:
+    """Get the path of the cached table of a game data file"""
+
+    file_name = f"{key.replace('/', '_')}.{parser_name}.pickle"
+    return helper.get_file(os.path.join("game_data", game_version, "tables", file_name))
+
+
+def load_table(path: str, checksum: int, layout_version: int = 0) -> tuple[bool, Any]:
+    """
+    Load a table parsed in an earlier session
+
+    Args:
+        path (str): The path of the cached table
+        checksum (int): The checksum of the current game data file
+        layout_version (int, optional): The layout version of the table. Defaults to 0.
+
+    Returns:
+        tuple[bool, Any]: Whether the table was loaded, and the table
+    """
+    if not os.path.exists(path):
+        return False, None
+    try:
+        with open(path, "rb") as file:
+            cached = pickle.load(file)
+    except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+        return False, None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != CACHE_VERSION
+        or cached.get("checksum") != checksum
+        or cached.get("layout_version", 0) != layout_version
+    ):
+        return False, None
+    return True, cached.get("table")
+
+
+def save_table(path: str, checksum: int, table: Any, layout_version: int = 0) -> None:
+    """Store a parsed table, keeping the checksum of the file it was parsed from"""
+
+    helper.create_dirs(os.path.dirname(path))
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            pickle.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "checksum": checksum,
+                    "layout_version": layout_version,
+                    "table": table,
+                },
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, path)
+    except (OSError, pickle.PicklingError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_version_table(
+    game_version: str,
+    pack_name: str,
+    file_name: str,
+    parser: Callable[..., Any] = parse_int_csv,
+    *args: Any,
+    layout_version: int = 0,
+) -> Any:
+    """
+    Get a game data file of a game version parsed by a parser
+
+    The table is parsed once per game version and file. It is kept in memory
+    for the rest of the session and on disk for later sessions, and is parsed
+    again if the file changes. The table is shared between callers, so it
+    must not be modified.
+
+    Args:
+        game_version (str): The game version
+        pack_name (str): The pack name of the file
+        file_name (str): The file name
+        parser (Callable[..., Any], optional): Turns the data of the file into the table, must be a module level function. Defaults to parse_int_csv.
+        *args (Any): Extra arguments passed to the parser
+        layout_version (int, optional): The layout version of the objects the parser returns, bumped when their classes change. Defaults to 0.
+
+    Returns:
+        Any: The table
+    """
+    key = f"{pack_name}/{file_name}"
+    parser_name = get_parser_name(parser, args)
+    memory_key = (game_version, key, parser_name)
+    with _tables_lock:
+        if memory_key in _tables:
+            return _tables[memory_key]
+
+    data = game_data_getter.download_file(
+        game_version, pack_name, file_name, print_progress=False
+    )
+    checksum = zlib.crc32(data)
+    path = get_cache_path(game_version, key, parser_name)
+    loaded, table = load_table(path, checksum, layout_version)
+    if not loaded:
+        table = parser(data, *args)
+        save_table(path, checksum, table, layout_version)
+    with _tables_lock:
+        _tables[memory_key] = table
+    return table
+
+
+def get_table(
+    pack_name: str,
+    file_name: str,
+    is_jp: bool,
+    parser: Callable[..., Any] = parse_int_csv,
+    *args: Any,
+    layout_version: int = 0,
+) -> Optional[Any]:
+    """
+    Get the latest version of a game data file parsed by a parser
+
+    Args:
+        pack_name (str): The pack name of the file
+        file_name (str): The file name
+        is_jp (bool): Whether to get the japanese version
+        parser (Callable[..., Any], optional): Turns the data of the file into the table, must be a module level function. Defaults to parse_int_csv.
+        *args (Any): Extra arguments passed to the parser
+        layout_version (int, optional): The layout version of the objects the parser returns, bumped when their classes change. Defaults to 0.
+
+    Returns:
+        Optional[Any]: The table, None if the latest version is unknown
+    """
+    version = game_data_getter.get_latest_version(is_jp)
+    if version is None:
+        return None
+    return get_version_table(
+        version, pack_name, file_name, parser, *args, layout_version=layout_version
+    )
+
+
+def get_built_table(
+    game_version: str,
+    key: str,
+    name: str,
+    checksum: int,
+    build: Callable[[], Any],
+) -> Any:
+    """
+    Get a table built from several game data files of a game version
+
+    Like get_version_table, but the caller reads the files and gives the
+    checksum of their content, so the table is only built again when one of
+    them changes.
+
+    Args:
+        game_version (str): The game version
+        key (str): The name of the table, e.g resLocal/Unit_Explanation_en
+        name (str): The name of what builds the table
+        checksum (int): The checksum of the files the table is built from
+        build (Callable[[], Any]): Builds the table
+
+    Returns:
+        Any: The table
+    """
+    memory_key = (game_version, key, f"{name}.{checksum:08x}")
+    with _tables_lock:
+        if memory_key in _tables:
+            return _tables[memory_key]
+
+    path = get_cache_path(game_version, key, name)
+    loaded, table = load_table(path, checksum)
+    if not loaded:
+        table = build()
+        save_table(path, checksum, table)
+    with _tables_lock:
+        _tables[memory_key] = table
+    return table
+
+
+def get_game_data_table(
+    game_version: str,
+    keys: list[str],
+    name: str,
+    layout_version: int,
+    build: Callable[[], Any],
+    key: Optional[str] = None,
+) -> Any:
+    """
+    Get a table built from game data files that are already in the archive
+
+    The checksum is made from the manifest hashes of the files and the layout
+    version of the table, so the table is built again when one of the files
+    changes or when the classes it is made of change. Files that aren't in
+    the archive are hashed as empty.
+
+    Args:
+        game_version (str): The game version
+        keys (list[str]): The files the table is built from, e.g DataLocal/SkillAcquisition.csv
+        name (str): The name of what builds the table
+        layout_version (int): The layout version of the table, bumped when its classes change
+        build (Callable[[], Any]): Builds the table
+        key (Optional[str], optional): The name of the table. Defaults to the first file.
+
+    Returns:
+        Any: The table
+    """
+    manifest = game_data_archive.get_manifest(game_version)
+    hashes = [manifest.get_hash(file_key) or "" for file_key in keys]
+    checksum = zlib.crc32(f"{layout_version}:{','.join(hashes)}".encode("utf-8"))
+    return get_built_table(game_version, key or keys[0], name, checksum, build)
+
+
+def clear() -> None:
+    """Forget the tables kept in memory"""
+
+    with _tables_lock:
+        _tables.clear()
@@ -3,9 +3,11 @@
 import subprocess
 from typing import Any, Optional
 
-import requests
+from . import cache_handler, config_manager, helper
 
-from . import config_manager, helper
+# seconds the latest version is cached for, so most start ups don't wait for pypi
+VERSION_INFO_TTL = 6 * 60 * 60
+REQUEST_TIMEOUT = 10
 
 
 def update(latest_version: str, command: str = "py") -> bool:
@@ -54,12 +56,21 @@ def get_local_version() -> str:
     return helper.read_file_string(helper.get_file("version.txt"))
 
 
-def get_version_info() -> Optional[tuple[str, str]]:
-    """Gets the latest version of the program"""
+def get_version_info(use_cache: bool = True) -> Optional[tuple[str, str]]:
+    """Gets the latest version of the program, cached for VERSION_INFO_TTL seconds"""
+
+    import requests  # pylint: disable=import-outside-toplevel
+
+    if use_cache:
+        cached = cache_handler.load("version_info", VERSION_INFO_TTL)
+        if cached is not None:
+            return cached[0], cached[1]
 
     package_name = "battle-cats-save-editor"
     try:
-        response = requests.get(f"https://pypi.org/pypi/{package_name}/json")
+        response = requests.get(
+            f"https://pypi.org/pypi/{package_name}/json", timeout=REQUEST_TIMEOUT
+        )
         response.raise_for_status()
         data = response.json()
     except requests.exceptions.RequestException:
@@ -69,6 +80,7 @@ def get_version_info() -> Optional[tuple[str, str]]:
         get_pypi_version(data),
         get_latest_prerelease_version(data),
     )
+    cache_handler.save("version_info", list(info))
     return info
 
 
@@ -0,0 +1,155 @@
+"""User rank of a save, kept up to date as cats and upgrades are edited"""
+
+import array
+import collections
+import threading
+from typing import Any, Iterable, Optional
+
+# the blue upgrade that doesn't count towards the user rank
+SKIPPED_SKILL = 1
+# the most saves to keep the user rank of
+MAX_TRACKED = 4
+
+_ranks_lock = threading.Lock()
+_ranks: "collections.OrderedDict[int, UserRank]" = collections.OrderedDict()
+
+
+class UserRank:
+    """
+    The user rank of a save, with what each cat and blue upgrade adds to it
+
+    Edits that change the cats, cat upgrades or blue upgrades of the save
+    refresh the entries they changed, so the total never has to be worked out
+    from all of the cats again.
+    """
+
+    def __init__(self, save_stats: dict[str, Any]):
+        self.lists = self.get_lists(save_stats)
+        self.lengths = [len(lst) for lst in self.lists]
+        (
+            self.cats,
+            self.cat_base,
+            self.cat_plus,
+            self.skill_base,
+            self.skill_plus,
+        ) = self.lists
+        self.cat_ranks = array.array(
+            "q", (self.get_cat_rank(cat_id) for cat_id in range(len(self.cats)))
+        )
+        self.skill_ranks = array.array(
+            "q",
+            (self.get_skill_rank(skill_id) for skill_id in range(len(self.skill_base))),
+        )
+        self.total = sum(self.cat_ranks) + sum(self.skill_ranks)
+
+    @staticmethod
+    def get_lists(save_stats: dict[str, Any]) -> list[list[int]]:
+        """Get the lists of a save the user rank is worked out from"""
+
+        return [
+            save_stats["cats"],
+            save_stats["cat_upgrades"]["Base"],
+            save_stats["cat_upgrades"]["Plus"],
+            save_stats["blue_upgrades"]["Base"],
+            save_stats["blue_upgrades"]["Plus"],
+        ]
+
+    def is_current(self, save_stats: dict[str, Any]) -> bool:
+        """Check that the save still has the lists the user rank was worked out from"""
+
+        try:
+            lists = self.get_lists(save_stats)
+        except (KeyError, TypeError):
+            return False
+        for lst, tracked, length in zip(lists, self.lists, self.lengths):
+            if lst is not tracked or len(lst) != length:
+                return False
+        return True
+
+    def get_cat_rank(self, cat_id: int) -> int:
+        """Get what a cat adds to the user rank"""
+
+        if self.cats[cat_id] == 0:
+            return 0
+        return self.cat_base[cat_id] + 1 + self.cat_plus[cat_id]
+
+    def get_skill_rank(self, skill_id: int) -> int:
+        """Get what a blue upgrade adds to the user rank"""
+
+        if skill_id == SKIPPED_SKILL:
+            return 0
+        return self.skill_base[skill_id] + 1 + self.skill_plus[skill_id]
+
+    def refresh_cats(self, cat_ids: Iterable[int]) -> None:
+        """Update the user rank after cats or their upgrades have changed"""
+
+        for cat_id in cat_ids:
+            if not 0 <= cat_id < len(self.cat_ranks):
+                continue
+            rank = self.get_cat_rank(cat_id)
+            self.total += rank - self.cat_ranks[cat_id]
+            self.cat_ranks[cat_id] = rank
+
+    def refresh_skills(self, skill_ids: Iterable[int]) -> None:
+        """Update the user rank after blue upgrades have changed"""
+
+        for skill_id in skill_ids:
+            if not 0 <= skill_id < len(self.skill_ranks):
+                continue
+            rank = self.get_skill_rank(skill_id)
+            self.total += rank - self.skill_ranks[skill_id]
+            self.skill_ranks[skill_id] = rank
+
+
+def get_tracked(save_stats: dict[str, Any]) -> Optional[UserRank]:
+    """Get the user rank of a save if it is being kept up to date"""
+
+    with _ranks_lock:
+        rank = _ranks.get(id(save_stats))
+    if rank is None or not rank.is_current(save_stats):
+        return None
+    return rank
+
+
+def track(save_stats: dict[str, Any]) -> UserRank:
+    """Work out the user rank of a save and keep it up to date from now on"""
+
+    rank = UserRank(save_stats)
+    with _ranks_lock:
+        _ranks[id(save_stats)] = rank
+        _ranks.move_to_end(id(save_stats))
+        while len(_ranks) > MAX_TRACKED:
+            _ranks.popitem(last=False)
+    return rank
+
+
+def get_user_rank(save_stats: dict[str, Any]) -> int:
+    """
+    Get the user rank of a save
+
+    Args:
+        save_stats (dict[str, Any]): The save stats
+
+    Returns:
+        int: The user rank, worked out from all of the cats only the first time
+    """
+    rank = get_tracked(save_stats)
+    if rank is None:
+        rank = track(save_stats)
+    return rank.total
+
+
+def refresh_cats(save_stats: dict[str, Any], cat_ids: Iterable[int]) -> None:
+    """Update the user rank of a save after cats or their upgrades have changed"""
+
+    rank = get_tracked(save_stats)
+    if rank is not None:
+        rank.refresh_cats(cat_ids)
+
+
+def refresh_skills(save_stats: dict[str, Any], skill_ids: Iterable[int]) -> None:
+    """Update the user rank of a save after blue upgrades have changed"""
+
+    rank = get_tracked(save_stats)
+    if rank is not None:
+        rank.refresh_skills(skill_ids)
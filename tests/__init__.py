@@ -1 +1 @@
-from . import test_item, test_parse, test_edits
\ No newline at end of file
+from . import test_item, test_parse, test_edits, test_benchmarks, test_save_generator, test_fuzz_round_trip, test_backup_handler, test_save_diff, test_config_manager, test_locale_handler, test_startup, test_background_startup, test_game_data_getter, test_network_handler, test_game_data_archive, test_table_cache, test_csv_handler, test_game_table, test_cat_name_index, test_user_rank, test_level_table
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Fixtures shared by the tests"""
+
+import pytest
+
+from BCSFE_Python import (
+    config_manager,
+    game_data_archive,
+    game_data_getter,
+    helper,
+    table_cache,
+)
+
+
+@pytest.fixture(name="manifest")
+def fixture_manifest(tmp_path, monkeypatch):
+    """Store game data in a temporary folder, tests add the files they need to the manifest"""
+
+    monkeypatch.setattr(helper, "get_local_files_path", lambda: str(tmp_path))
+    monkeypatch.setattr(game_data_getter, "get_latest_version", lambda _: "12.2.0")
+    monkeypatch.setattr(config_manager, "get_config_value_category", lambda *_: False)
+    table_cache.clear()
+    yield game_data_archive.get_manifest("12.2.0")
+    table_cache.clear()
+    game_data_archive.close_archives()
@@ -0,0 +1,79 @@
+"""Test the background start up checks"""
+
+import os
+import threading
+import time
+
+from BCSFE_Python import (
+    background_task,
+    cache_handler,
+    config_manager,
+    game_data_getter,
+    helper,
+)
+
+
+def setup_folders(tmp_path, monkeypatch):
+    """Use temporary app data and game data folders"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    files = tmp_path / "files"
+    monkeypatch.setattr(helper, "get_local_files_path", lambda: str(files))
+    monkeypatch.setattr(game_data_getter, "_pending_removals", [])
+    monkeypatch.setattr(game_data_getter, "_offline", False)
+    for version in ["12.0.0", "12.1.0", "12.2.0", "12.0.0jp", "12.1.0jp", "12.2.0jp"]:
+        os.makedirs(files / "game_data" / version / "DataLocal")
+
+
+def test_cache_ttl(tmp_path, monkeypatch):
+    """Test that cached values expire"""
+
+    setup_folders(tmp_path, monkeypatch)
+    assert cache_handler.load("test") is None
+    cache_handler.save("test", [1, 2])
+    assert cache_handler.load("test", 60) == [1, 2]
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+    assert cache_handler.load("test", 60) is None
+    assert cache_handler.load("test") == [1, 2]
+
+
+def test_task_timeout():
+    """Test that a slow task doesn't block for longer than the timeout"""
+
+    event = threading.Event()
+    task = background_task.BackgroundTask.start_new("slow", event.wait)
+    start = time.perf_counter()
+    assert task.result(0.05) is None
+    assert time.perf_counter() - start < 1
+    event.set()
+    assert task.result(1) is True
+
+
+def test_task_error():
+    """Test that a failing task returns None"""
+
+    task = background_task.BackgroundTask.start_new("error", lambda: 1 / 0)
+    assert task.result(1) is None
+    assert isinstance(task.error, ZeroDivisionError)
+
+
+def test_removal_deferred(tmp_path, monkeypatch):
+    """Test that out of date game data is only deleted on exit, and only checked once per interval"""
+
+    setup_folders(tmp_path, monkeypatch)
+    calls: list[int] = []
+
+    def get_latest_versions():
+        calls.append(1)
+        return ["12.2.0", "12.2.0jp"]
+
+    monkeypatch.setattr(game_data_getter, "get_latest_versions", get_latest_versions)
+    game_data_getter.check_remove_handler()
+    game_data_getter.check_remove_handler()
+    assert len(calls) == 1
+
+    game_data = tmp_path / "files" / "game_data"
+    assert len(os.listdir(game_data)) == 6
+    game_data_getter.remove_scheduled()
+    # the previous version is kept so its unchanged files can be shared
+    assert sorted(os.listdir(game_data)) == ["12.1.0", "12.1.0jp", "12.2.0", "12.2.0jp"]
@@ -0,0 +1,80 @@
+"""Test the backup store"""
+
+import os
+
+from BCSFE_Python import backup_handler, config_manager, parse_save, serialise_save
+from benchmarks import save_generator
+
+
+def get_save(seed: int, cat_food: int) -> tuple[bytes, list[tuple[str, int, int]]]:
+    """Generate a save and get its section offsets"""
+
+    options = save_generator.SaveOptions(seed=seed).scale(0.2)
+    save_stats = save_generator.generate_save_stats(options)
+    save_stats["cat_food"]["Value"] = cat_food
+    save_data = serialise_save.serialize_save(save_stats)
+    offsets: list[tuple[str, int, int]] = []
+    parse_save.parse_save(save_data, options.country_code, offsets=offsets)
+    return save_data, offsets
+
+
+def test_backup_generations(tmp_path, monkeypatch):
+    """Test that backups are deduplicated and can be restored"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    path = os.path.join(str(tmp_path), "SAVE_DATA")
+
+    save_data_1, offsets_1 = get_save(0, 100)
+    save_data_2, offsets_2 = get_save(0, 45000)
+
+    assert backup_handler.backup_save(path, save_data_1, offsets_1) is not None
+    assert backup_handler.backup_save(path, save_data_1, offsets_1) is None
+    assert backup_handler.backup_save(path, save_data_2, offsets_2) is not None
+
+    generations = backup_handler.get_generations(path)
+    assert len(generations) == 2
+    assert backup_handler.load_backup(generations[0]) == save_data_2
+    assert backup_handler.load_backup(generations[1]) == save_data_1
+
+    chunks_1 = set(generations[1]["chunks"])
+    chunks_2 = set(generations[0]["chunks"])
+    assert len(chunks_1) > 1
+    assert len(chunks_1 - chunks_2) == 1
+
+
+def test_prune(tmp_path, monkeypatch):
+    """Test that old generations and their unused chunks are deleted"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    monkeypatch.setattr(backup_handler, "MAX_GENERATIONS", 2)
+    path = os.path.join(str(tmp_path), "SAVE_DATA")
+
+    for seed in range(3):
+        save_data, offsets = get_save(seed, 0)
+        backup_handler.backup_save_async(path, save_data, offsets)
+        backup_handler.wait_for_backups()
+
+    generations = backup_handler.get_generations(path)
+    assert len(generations) == 2
+    assert backup_handler.load_backup(generations[0]) == get_save(2, 0)[0]
+
+    used = {chunk for manifest in generations for chunk in manifest["chunks"]}
+    stored: set[str] = set()
+    for _, _, files in os.walk(os.path.join(str(tmp_path), "backups", "objects")):
+        stored.update(file.split(".")[0] for file in files)
+    assert stored == used
+
+
+def test_edits_not_recorded():
+    """Test that editing the parsed save stats doesn't add section offsets"""
+
+    options = save_generator.SaveOptions(seed=1).scale(0.2)
+    save_data = serialise_save.serialize_save(
+        save_generator.generate_save_stats(options)
+    )
+    offsets: list[tuple[str, int, int]] = []
+    save_stats = parse_save.parse_save(save_data, options.country_code, offsets=offsets)
+    assert type(save_stats) is dict  # pylint: disable=unidiomatic-typecheck
+    count = len(offsets)
+    save_stats["cat_food"] = {"Value": 5}
+    assert len(offsets) == count
@@ -0,0 +1,38 @@
+"""Test the benchmark runner"""
+
+from benchmarks import runner
+
+
+def test_compare_regression():
+    """Test that slower or larger results are reported as regressions"""
+
+    baseline = runner.BenchmarkResult("parse_save", "save", 100, 1.0, 1000)
+    faster = runner.BenchmarkResult("parse_save", "save", 200, 1.0, 1000)
+    slower = runner.BenchmarkResult("parse_save", "save", 50, 1.0, 1000)
+    larger = runner.BenchmarkResult("parse_save", "save", 100, 1.0, 2000)
+    new = runner.BenchmarkResult("export_json", "save", 100, 1.0, 1000)
+
+    comparisons = runner.compare(
+        [faster, slower, larger, new], {baseline.key: baseline}, 0.1
+    )
+    assert [comparison.is_regression() for comparison in comparisons] == [
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert "2 regression(s) in 4 benchmark(s)" in runner.format_report(comparisons)
+
+
+def test_baseline_round_trip(tmp_path, monkeypatch):
+    """Test that a saved baseline can be loaded again"""
+
+    monkeypatch.setattr(runner, "BASELINE_DIR", str(tmp_path))
+    result = runner.BenchmarkResult("re_order", "save", 10, 0.5, 123)
+
+    runner.save_baseline([result], "test")
+    baseline = runner.load_baseline("test")
+
+    assert baseline is not None
+    assert baseline[result.key].to_dict() == result.to_dict()
+    assert runner.load_baseline("missing") is None
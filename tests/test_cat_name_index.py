@@ -0,0 +1,79 @@
+"""Test the index of cat names"""
+
+import random
+
+from BCSFE_Python import table_cache
+from BCSFE_Python.edits.cats import cat_id_selector, cat_name_index
+
+NAMES = [
+    ("Cat", 0, 0),
+    ("Macho Cat", 0, 1),
+    ("Tank Cat", 1, 0),
+    ("Wall Cat", 1, 1),
+    ("Crazed Tank Cat", 2, 0),
+    ("Manic Eraser Cat", 2, 1),
+]
+
+
+def test_search_same_as_scan():
+    """Test that the index finds the same names as scanning every name"""
+
+    index = cat_name_index.CatNameIndex(NAMES)
+    rng = random.Random(0)
+    alphabet = "acmnt kC"
+    queries = ["", "c", "Cat", "tank cat", "TANKCAT", "zzz", "ma", "cat c"]
+    queries += ["".join(rng.choice(alphabet) for _ in range(4)) for _ in range(500)]
+    for query in queries:
+        assert index.search(query) == cat_id_selector.search_cat_names(query, NAMES)
+
+    assert index.get_by_id(1) == [("Tank Cat", 1, 0), ("Wall Cat", 1, 1)]
+    assert index.get_by_id(5) == []
+    assert cat_id_selector.get_cat_by_form_and_id(index, 2, 1) == NAMES[5]
+    assert cat_id_selector.get_cat_by_form_and_id(index, 2, 2) is None
+
+
+def test_fuzzy_search():
+    """Test that names with typos are ranked by edit distance"""
+
+    index = cat_name_index.CatNameIndex(NAMES)
+    assert index.fuzzy_search("tnak cat")[0] == ("Tank Cat", 1, 0)
+    assert index.fuzzy_search("macho cta") == [("Macho Cat", 0, 1)]
+    assert index.fuzzy_search("tank cta") == [
+        ("Tank Cat", 1, 0),
+        ("Crazed Tank Cat", 2, 0),
+    ]
+    assert index.fuzzy_search("wal") == [("Wall Cat", 1, 1)]
+    assert index.fuzzy_search("tank cta", limit=1, max_distance=2) == [NAMES[2]]
+    assert index.fuzzy_search("dragon emperor") == []
+    assert cat_name_index.get_substring_distance("cta", "tankcat") == 1
+
+
+def test_index_kept_on_disk(manifest, monkeypatch):
+    """Test that the index is built once per game version and kept on disk"""
+
+    manifest.add("resLocal/Unit_Explanation1_en.csv", b"Cat|desc\nMacho Cat|desc\n")
+    manifest.add("resLocal/Unit_Explanation2_en.csv", b"Tank Cat|desc\n")
+    save_stats = {"version": "en", "cats": [1, 1]}
+
+    builds = []
+    parse_cat_names = cat_id_selector.parse_cat_names
+
+    def count_builds(*args):
+        builds.append(args)
+        return parse_cat_names(*args)
+
+    monkeypatch.setattr(cat_id_selector, "parse_cat_names", count_builds)
+    index = cat_id_selector.get_cat_name_index(save_stats)
+    assert index is not None
+    assert index.names == [("Cat", 0, 0), ("Macho Cat", 0, 1), ("Tank Cat", 1, 0)]
+    assert cat_id_selector.get_cat_name_index(save_stats) is index
+
+    table_cache.clear()
+    loaded = cat_id_selector.get_cat_name_index(save_stats)
+    assert loaded is not index
+    assert loaded.search("macho") == [("Macho Cat", 0, 1)]
+    assert len(builds) == 1
+
+    manifest.add("resLocal/Unit_Explanation2_en.csv", b"Tank Cat|desc\nWall Cat|d\n")
+    assert cat_id_selector.get_cat_names(save_stats)[-1] == ("Wall Cat", 1, 1)
+    assert len(builds) == 2
@@ -0,0 +1,89 @@
+"""Test the config cache"""
+
+import os
+
+import pytest
+import yaml
+
+from BCSFE_Python import config_manager
+
+
+def setup_config(tmp_path, monkeypatch) -> list[int]:
+    """Use a temporary config file and count how often it is loaded"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    monkeypatch.setattr(config_manager, "config_cache", config_manager.ConfigCache())
+    loads: list[int] = []
+    safe_load = yaml.safe_load
+
+    def counting_safe_load(stream):
+        loads.append(1)
+        return safe_load(stream)
+
+    monkeypatch.setattr(yaml, "safe_load", counting_safe_load)
+    return loads
+
+
+def test_config_cached(tmp_path, monkeypatch):
+    """Test that repeated reads only load the config file once"""
+
+    loads = setup_config(tmp_path, monkeypatch)
+
+    for _ in range(10):
+        assert config_manager.get_config_value_category("START_UP", "CREATE_BACKUP")
+        assert config_manager.get_config_value("LOCALE") == "en"
+    assert len(loads) == 1
+
+
+def test_config_write_through(tmp_path, monkeypatch):
+    """Test that set config settings are seen without re-reading the file"""
+
+    loads = setup_config(tmp_path, monkeypatch)
+
+    config_manager.set_config_setting("LOCALE", "fr")
+    config_manager.set_config_setting_category("EDITOR", "DISABLE_MAXES", True)
+    assert config_manager.get_config_value("LOCALE") == "fr"
+    assert config_manager.get_config_value_category("EDITOR", "DISABLE_MAXES")
+    assert len(loads) == 1
+
+    with open(config_manager.get_config_path(), "r", encoding="utf-8") as file:
+        assert "LOCALE: fr" in file.read()
+
+
+def test_config_mtime_invalidation(tmp_path, monkeypatch):
+    """Test that the config is re-read when the file is changed"""
+
+    loads = setup_config(tmp_path, monkeypatch)
+    monkeypatch.setattr(config_manager, "CHECK_INTERVAL", 0)
+
+    assert config_manager.get_config_value("LOCALE") == "en"
+    path = config_manager.get_config_path()
+    with open(path, "r", encoding="utf-8") as file:
+        data = file.read()
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(data.replace('LOCALE: "en"', 'LOCALE: "de"'))
+    mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+    assert config_manager.get_config_value("LOCALE") == "de"
+    assert config_manager.get_config_value("LOCALE") == "de"
+    assert len(loads) == 2
+
+
+def test_config_read_only(tmp_path, monkeypatch):
+    """Test that a caller can't change the config other callers see"""
+
+    setup_config(tmp_path, monkeypatch)
+
+    config = config_manager.get_config_file()
+    with pytest.raises(TypeError):
+        config["LOCALE"] = "fr"  # type: ignore
+    with pytest.raises(TypeError):
+        config["EDITOR"]["DISABLE_MAXES"] = True  # type: ignore
+    editable = config_manager.thaw(config)
+    editable["EDITOR"]["DISABLE_MAXES"] = True
+    assert not config_manager.get_config_value_category("EDITOR", "DISABLE_MAXES")
+
+    config_manager.set_config_setting_category("EDITOR", "DISABLE_MAXES", True)
+    assert config_manager.get_config_value_category("EDITOR", "DISABLE_MAXES")
+    assert not config["EDITOR"]["DISABLE_MAXES"]
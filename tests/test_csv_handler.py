@@ -0,0 +1,51 @@
+"""Test the CSV tokenizer"""
+
+import random
+
+import pytest
+
+from BCSFE_Python import csv_handler, helper
+from benchmarks import bench_csv
+
+
+def test_comments_and_empty_items():
+    """Test that comments, whitespace, empty items and empty rows are removed"""
+
+    data = "1,2,,3, // comment\r\n\n  ,,\n//only a comment\n4,a b,5,\n"
+    assert csv_handler.parse_csv(data) == [["1", "2", "3"], ["4", "a b", "5"]]
+    assert csv_handler.parse_int_csv(data.encode("utf-8")) == [[1, 2, 3], [4, "a b", 5]]
+    assert csv_handler.parse_csv("a|b||c", "|") == [["a", "b", "c"]]
+
+
+def test_same_as_legacy_parser():
+    """Test that the tokenizer parses random data like the parser it replaced"""
+
+    rng = random.Random(0)
+    alphabet = ["1", "-2", ",", "|", "\t", "\n", "\r", "/", "//", " ", "a", "é", "　"]
+    for _ in range(2000):
+        data = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        for delimeter in [",", "|", "\t"]:
+            legacy = bench_csv.legacy_parse_csv(data, delimeter)
+            legacy_ints = helper.parse_int_list_list(legacy)
+            assert csv_handler.parse_csv(data, delimeter) == legacy
+            assert csv_handler.parse_csv(data.encode("utf-8"), delimeter) == legacy
+            assert csv_handler.parse_int_csv(data, delimeter) == legacy_ints
+            assert (
+                csv_handler.parse_int_csv(data.encode("utf-8"), delimeter)
+                == legacy_ints
+            )
+
+
+def test_int_columns():
+    """Test that rows are turned into columns, filling in missing items"""
+
+    columns = csv_handler.parse_int_columns(b"1,2,3\n4\n5,6,7,8\n", fill=-1)
+    assert [column.tolist() for column in columns] == [
+        [1, 4, 5],
+        [2, -1, 6],
+        [3, -1, 7],
+        [-1, -1, 8],
+    ]
+    assert columns[0].typecode == "q"
+    with pytest.raises(ValueError):
+        csv_handler.parse_int_columns(b"1,2\n3,x\n")
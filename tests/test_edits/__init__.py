@@ -1 +1 @@
-from . import test_basic, test_cats
\ No newline at end of file
+from . import test_basic, test_cats, test_other
\ No newline at end of file
@@ -1 +1 @@
-from . import test_talent_orbs, test_basic
\ No newline at end of file
+from . import test_talent_orbs, test_basic, test_talent_orbs_new
\ No newline at end of file
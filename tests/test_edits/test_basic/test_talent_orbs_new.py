@@ -0,0 +1,115 @@
+"""Test the indexes of the talent orb data"""
+
+import json
+import random
+
+from pytest import MonkeyPatch
+from BCSFE_Python import table_cache
+from BCSFE_Python.edits.basic import talent_orbs_new
+from BCSFE_Python.edits.basic.talent_orbs_new import OrbInfoList
+
+GRADES = ["D", "C", "B", "A", "S"]
+ATTRIBUTES = ["Red", "Floating", "Black", "Metal"]
+EFFECTS = ["Attack up", "Defense up", "Attack speed", "Strong against", "Massive"]
+
+
+def get_orb_files(rng: random.Random, count: int) -> dict[str, bytes]:
+    """Get random equipment data with the names of its components"""
+
+    orbs = [
+        {
+            "gradeID": rng.randrange(len(GRADES)),
+            "content": rng.randrange(len(EFFECTS)),
+            "value": [rng.randint(0, 10)],
+            "attribute": rng.randrange(len(ATTRIBUTES)),
+        }
+        for _ in range(count)
+    ]
+    return {
+        OrbInfoList.equipment_data_file_name: json.dumps({"ID": orbs}).encode(),
+        OrbInfoList.grade_list_file_name: "\n".join(
+            f"{i},0,0,{grade}" for i, grade in enumerate(GRADES)
+        ).encode(),
+        OrbInfoList.attribute_list_file_name: "\n".join(ATTRIBUTES).encode(),
+        OrbInfoList.effect_list_file_name: "\n".join(EFFECTS).encode(),
+    }
+
+
+def add_orb_files(manifest) -> None:
+    """Add random orbs to the game data"""
+
+    for key, data in get_orb_files(random.Random(0), 200).items():
+        manifest.add(key, data)
+
+
+def search_orbs(
+    orbs: OrbInfoList, grade: str, attribute: str, effect: str
+) -> list[talent_orbs_new.OrbInfo]:
+    """Search the orbs one at a time"""
+
+    return [
+        orb
+        for orb in orbs.orb_info_list
+        if (orb.grade.lower() == grade.lower() or grade == "*")
+        and (orb.attribute.lower() == attribute.lower() or attribute == "*")
+        and (
+            orb.effect.lower().split(" ")[0] == effect.lower().split(" ")[0]
+            or effect == "*"
+        )
+    ]
+
+
+def test_same_as_search(manifest):
+    """Test that looking orbs up in the indexes finds the same orbs as a search"""
+
+    add_orb_files(manifest)
+    orbs = OrbInfoList.create(False)
+    assert orbs is not None
+    assert len(orbs.orb_info_list) == 200
+    for orb_id, orb in enumerate(orbs.orb_info_list):
+        assert orbs.get_orb_info(orb_id) is orb
+    assert orbs.get_orb_info(200) is None
+
+    for grade in GRADES + ["*", "x"]:
+        for attribute in ATTRIBUTES + ["*"]:
+            for effect in EFFECTS + ["*", "attack", "STRONG"]:
+                expected = search_orbs(orbs, grade.lower(), attribute, effect)
+                actual = orbs.get_orbs_from_component_fuzzy(
+                    grade.lower(), attribute, effect
+                )
+                assert actual == expected
+                first = next(
+                    (
+                        orb
+                        for orb in orbs.orb_info_list
+                        if (orb.grade, orb.attribute, orb.effect)
+                        == (grade, attribute, effect)
+                    ),
+                    None,
+                )
+                assert orbs.get_orb_from_components(grade, attribute, effect) is first
+
+
+def test_built_once(manifest, monkeypatch: MonkeyPatch):
+    """Test that the orbs are built once per game version and then read from disk"""
+
+    add_orb_files(manifest)
+    builds = []
+    parse = OrbInfoList.parse
+
+    def count_builds(*args):
+        builds.append(args)
+        return parse(*args)
+
+    monkeypatch.setattr(OrbInfoList, "parse", staticmethod(count_builds))
+    orbs = OrbInfoList.create(False)
+    table_cache.clear()
+    loaded = OrbInfoList.create(False)
+    assert orbs is not None and loaded is not None
+    assert len(builds) == 1
+    assert [str(orb) for orb in loaded.orb_info_list] == [
+        str(orb) for orb in orbs.orb_info_list
+    ]
+    assert loaded.get_orbs_from_component_fuzzy("s", "*", "attack") == search_orbs(
+        loaded, "s", "*", "attack"
+    )
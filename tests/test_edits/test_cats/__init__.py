@@ -1 +1 @@
-from . import test_cat_id_selector
\ No newline at end of file
+from . import test_cat_id_selector, test_cat_helper, test_bulk_cats, test_talents
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""Test edits applied to many cats at once"""
+
+import random
+
+from pytest import MonkeyPatch
+from BCSFE_Python.edits.cats import (
+    bulk_cats,
+    clear_cat_guide,
+    evolve_cats,
+    upgrade_cats,
+)
+
+
+def test_mask_edits():
+    """Test that edits only change the selected cats"""
+
+    rng = random.Random(0)
+    for _ in range(200):
+        length = rng.randint(0, 40)
+        ids = [rng.randint(-2, length + 2) for _ in range(rng.randint(0, 30))]
+        mask = bulk_cats.CatMask.from_ids(ids, length)
+        selected = sorted({cat_id for cat_id in ids if 0 <= cat_id < length})
+        assert mask.get_ids() == selected
+        assert mask.get_count() == len(selected)
+
+        values = [rng.randint(0, 3) for _ in range(length)]
+        source = [rng.randint(0, 3) for _ in range(rng.randint(0, length))]
+        expected = values.copy()
+        for cat_id in selected:
+            expected[cat_id] = 7
+        filled = values.copy()
+        bulk_cats.fill(filled, mask, 7)
+        assert filled == expected
+
+        expected = values.copy()
+        for cat_id in selected:
+            if cat_id < len(source):
+                expected[cat_id] = source[cat_id]
+        copied = values.copy()
+        bulk_cats.copy_from(copied, mask, source)
+        assert copied == expected
+
+        expected = [max(a, b) for a, b in zip(values, source)]
+        expected += values[len(source) :]
+        bulk_cats.maximum(values, source)
+        assert values == expected
+
+        expected = [0 if value == 1 else value for value in values]
+        bulk_cats.replace(values, 1, 0)
+        assert values == expected
+
+    assert bulk_cats.get_level_caps([40, 40, 20, 45], [[50, 35, 50], [50] * 4], 29) == [
+        11,
+        6,
+        0,
+        0,
+    ]
+    assert bulk_cats.CatMask.select_all(3).runs == [(0, 3)]
+
+
+def test_evolve_and_cat_guide(monkeypatch: MonkeyPatch):
+    """Test that evolving and the cat guide edit whole lists at once"""
+
+    monkeypatch.setattr(evolve_cats, "get_evolve_data", lambda _: [1, 2, 2, 0])
+    monkeypatch.setattr(evolve_cats.helper, "check_data_is_jp", lambda _: False)
+    save_stats = {
+        "cats": [1] * 5,
+        "unlocked_forms": [0, 0, 1, 0, 2],
+        "current_forms": [0, 1, 0, 0, 1],
+        "cat_guide_collected": [0] * 5,
+    }
+    evolve_cats.evolve_handler_ids(save_stats, 2, "set", [0, 1, 2, 4], False)
+    assert save_stats["unlocked_forms"] == [0, 2, 2, 0, 2]
+    assert save_stats["current_forms"] == [1, 2, 2, 0, 2]
+
+    clear_cat_guide.cat_guide_ids(save_stats, [1, 2, 4], 1, "collected")
+    assert save_stats["cat_guide_collected"] == [0, 1, 1, 0, 1]
+
+
+def test_level_caps_keep_lengths(monkeypatch: MonkeyPatch):
+    """Test that setting the level caps never changes the length of a list"""
+
+    helper = upgrade_cats.cat_helper
+    monkeypatch.setattr(upgrade_cats.helper, "is_jp", lambda _: False)
+    monkeypatch.setattr(helper, "get_unit_max_levels", lambda _: ([50, 35], [10]))
+    monkeypatch.setattr(helper, "get_rarities", lambda _: [])
+    monkeypatch.setattr(helper, "get_max_levels", lambda *_: [50] * 4)
+    save_stats = {
+        "cats": [1] * 4,
+        "cat_upgrades": {"Base": [40, 40, 20, 45]},
+        "catseye_cat_data": [0, 0],
+        "catseye_related_data": {"Base": [0] * 6},
+    }
+    upgrade_cats.set_level_caps(save_stats)
+    assert save_stats["catseye_cat_data"] == [11, 6]
+    assert save_stats["catseye_related_data"]["Base"] == [21, 16, 10, 10, 0, 0]
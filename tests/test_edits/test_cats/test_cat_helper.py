@@ -0,0 +1,61 @@
+"""Test the level caps of cats"""
+
+import itertools
+
+from pytest import MonkeyPatch
+from BCSFE_Python.edits.cats import cat_helper, upgrade_cats
+from BCSFE_Python.edits.levels import main_story, uncanny
+
+
+def get_save_stats(cat_count: int, level: int, blue_level: int = 0) -> dict:
+    """Get save stats with every cat unlocked at a level"""
+
+    return {
+        "version": "en",
+        "cats": [1] * cat_count,
+        "cat_upgrades": {"Base": [level - 1] * cat_count, "Plus": [0] * cat_count},
+        "blue_upgrades": {"Base": [blue_level] * 11, "Plus": [0] * 11},
+        "catseye_cat_data": [0] * cat_count,
+        "catseye_related_data": {"Base": [0] * cat_count},
+    }
+
+
+def test_max_levels_same_as_per_cat(monkeypatch: MonkeyPatch):
+    """Test that the caps of every cat match working them out one cat at a time"""
+
+    rarities = [cat_id % 7 for cat_id in range(700)]
+    progress = itertools.product([False, True], [False, True], [0, 100, 350, 500])
+    for eoc, curse, blue_level in progress:
+        monkeypatch.setattr(main_story, "has_cleared_chapter", lambda *_: eoc)
+        monkeypatch.setattr(uncanny, "is_ancient_curse_clear", lambda *_: curse)
+        save_stats = get_save_stats(710, 1, blue_level)
+        caps = cat_helper.get_max_levels(save_stats, rarities)
+        assert len(caps) == 710
+        for cat_id, cap in enumerate(caps):
+            rarity = rarities[cat_id] if cat_id < len(rarities) else 0
+            assert cap == cat_helper.get_max_level(save_stats, rarity, cat_id)
+
+
+def test_set_level_caps(monkeypatch: MonkeyPatch):
+    """Test that the user rank is only worked out once for all cats"""
+
+    calls = []
+    calculate_user_rank = cat_helper.helper.calculate_user_rank
+
+    def count_calls(save_stats):
+        calls.append(save_stats)
+        return calculate_user_rank(save_stats)
+
+    monkeypatch.setattr(cat_helper.helper, "calculate_user_rank", count_calls)
+    monkeypatch.setattr(main_story, "has_cleared_chapter", lambda *_: True)
+    monkeypatch.setattr(uncanny, "is_ancient_curse_clear", lambda *_: True)
+    monkeypatch.setattr(cat_helper, "get_rarities", lambda _: [2, 4, 1])
+    monkeypatch.setattr(
+        cat_helper, "get_unit_max_levels", lambda _: ([50, 50, 35], [10, 10, 10])
+    )
+    save_stats = get_save_stats(4, 40, 200)
+
+    save_stats = upgrade_cats.set_level_caps(save_stats)
+    assert len(calls) == 1
+    assert save_stats["catseye_cat_data"] == [10, 10, 6, 0]
+    assert save_stats["catseye_related_data"]["Base"] == [20, 20, 16, 10]
@@ -0,0 +1,89 @@
+"""Test the talents of cats"""
+
+from pytest import MonkeyPatch
+from BCSFE_Python import table_cache
+from BCSFE_Python.edits.cats import talents
+
+SKILL_ACQUISITION = (
+    b"ID,type,abilityID_A,MAXLv_A,textID_A,abilityID_B,MAXLv_B,textID_B,"
+    b"abilityID_C,MAXLv_C,textID_C,abilityID_D,MAXLv_D,textID_D,"
+    b"abilityID_E,MAXLv_E,textID_E,abilityID_F,MAXLv_F,tFxtID_F\n"
+    b"5,0,1,10,1,2,0,2,3,5,3,4,10,1,5,10,2,6,1,3\n"
+    b"8,1,2,10,2,7,10,3\n"
+)
+SKILL_DESCRIPTIONS = b"0|None\n1|Attack up<br>more text\n2|Defense up\n3|Speed up\n"
+
+
+def add_talent_files(manifest) -> None:
+    """Add the talent data to the game data"""
+
+    manifest.add("DataLocal/SkillAcquisition.csv", SKILL_ACQUISITION)
+    manifest.add("resLocal/SkillDescriptions.csv", SKILL_DESCRIPTIONS)
+
+
+def get_save_stats() -> dict:
+    """Get save stats with the talents of some cats"""
+
+    return {
+        "version": "en",
+        "talents": {
+            5: [{"id": i, "level": 0} for i in range(1, 7)],
+            8: [{"id": 2, "level": 3}, {"id": 7, "level": 1}],
+            9: [{"id": 1, "level": 4}],
+        },
+    }
+
+
+def test_talent_db(manifest):
+    """Test that the talent database has the name and max level of each talent"""
+
+    add_talent_files(manifest)
+    talent_db = talents.get_talent_db(get_save_stats())
+    assert talent_db is not None
+    assert talent_db.talents == {
+        5: {
+            1: ("Attack up", 10),
+            2: ("Defense up", 1),
+            3: ("Speed up", 5),
+            4: ("Attack up", 10),
+            5: ("Defense up", 10),
+            6: ("Speed up", 1),
+        },
+        8: {2: ("Defense up", 10), 7: ("Speed up", 10)},
+    }
+    assert talent_db.get_talent(5, 1) == ("Attack up", 10)
+    assert talent_db.get_talent(5, 2) == ("Defense up", 1)
+    assert 9 not in talent_db
+
+
+def test_max_all_talents(manifest, monkeypatch: MonkeyPatch):
+    """Test that the talents of many cats are maxed and reset in one pass"""
+
+    add_talent_files(manifest)
+    builds = []
+    parse_talent_db = talents.parse_talent_db
+
+    def count_builds(*args):
+        builds.append(args)
+        return parse_talent_db(*args)
+
+    monkeypatch.setattr(talents, "parse_talent_db", count_builds)
+    save_stats = get_save_stats()
+    talent_db = talents.get_talent_db(save_stats)
+    assert talents.set_all_talents(save_stats, [5, 8, 9, 10], talent_db, True) == 2
+    assert [talent["level"] for talent in save_stats["talents"][5]] == [
+        10,
+        1,
+        5,
+        10,
+        10,
+        1,
+    ]
+    assert [talent["level"] for talent in save_stats["talents"][8]] == [10, 10]
+    assert save_stats["talents"][9] == [{"id": 1, "level": 4}]
+
+    table_cache.clear()
+    talent_db = talents.get_talent_db(save_stats)
+    talents.set_all_talents(save_stats, [8], talent_db, False)
+    assert [talent["level"] for talent in save_stats["talents"][8]] == [0, 0]
+    assert len(builds) == 1
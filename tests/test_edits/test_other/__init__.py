@@ -0,0 +1 @@
+from . import test_meow_medals
\ No newline at end of file
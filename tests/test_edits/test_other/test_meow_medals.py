@@ -0,0 +1,121 @@
+"""Test the medal catalogue and giving many medals at once"""
+
+import json
+import random
+
+from BCSFE_Python.edits.levels import event_stages
+from BCSFE_Python.edits.other import meow_medals
+
+
+def get_medal_list(rng: random.Random, count: int) -> bytes:
+    """Get a random medallist.json"""
+
+    medals = []
+    for _ in range(count):
+        medal = {"grade": rng.randint(0, 2), "line": rng.randint(0, 5)}
+        kind = rng.randrange(4)
+        if kind == 0:
+            medal.update({"map": [rng.randint(0, 9)], "treasure": rng.randint(0, 3)})
+        elif kind == 1:
+            medal["chara"] = rng.randint(0, 700)
+        elif kind == 2:
+            medal["action"] = rng.randint(0, 4)
+        else:
+            medal["map"] = [rng.randint(-1, 9) for _ in range(rng.randint(0, 3))]
+            if rng.randint(0, 1):
+                medal["star"] = rng.randint(0, 2)
+        medals.append(medal)
+    return json.dumps({"iconID": medals}).encode("utf-8")
+
+
+def test_catalogue_indexes():
+    """Test that the indexes of the catalogue agree with the lists of medals"""
+
+    catalogue = meow_medals.parse_medal_catalogue(get_medal_list(random.Random(0), 300))
+    buckets = {
+        "treasure": catalogue.treasures,
+        "character": catalogue.characters,
+        "action": catalogue.actions,
+        "stage": catalogue.stages,
+    }
+    assert sum(len(bucket) for bucket in buckets.values()) == 300
+    for medal_type, bucket in buckets.items():
+        assert catalogue.ids_by_type.get(medal_type, []) == [
+            medal.medal_id for medal in bucket
+        ]
+        for medal in bucket:
+            assert catalogue.get_medal(medal.medal_id) is medal
+            assert not hasattr(medal, "__dict__")
+    assert catalogue.get_medal(300) is None
+    assert catalogue.get_ids() == list(range(300))
+    assert catalogue.get_ids(lambda medal: medal.grade == 2, "action") == [
+        medal.medal_id for medal in catalogue.actions if medal.grade == 2
+    ]
+
+
+def test_award_and_remove():
+    """Test that medals are given and removed like they were one at a time"""
+
+    rng = random.Random(1)
+    catalogue = meow_medals.parse_medal_catalogue(get_medal_list(rng, 100))
+    for _ in range(50):
+        owned = rng.sample(range(100), rng.randint(0, 30))
+        medal_stats = {
+            "medal_data_1": owned,
+            "medal_data_2": {medal_id: 1 for medal_id in owned[::2]},
+        }
+        expected = {
+            "medal_data_1": list(medal_stats["medal_data_1"]),
+            "medal_data_2": dict(medal_stats["medal_data_2"]),
+        }
+        for medal in catalogue.stages:
+            if medal.line > 2:
+                if medal.medal_id not in expected["medal_data_1"]:
+                    expected["medal_data_1"].append(medal.medal_id)
+                expected["medal_data_2"][medal.medal_id] = 1
+        count = meow_medals.award_medals(
+            medal_stats, catalogue, lambda medal: medal.line > 2, "stage", 1
+        )
+        assert medal_stats == expected
+        assert count == len([medal for medal in catalogue.stages if medal.line > 2])
+
+        ids = [rng.randint(0, 100) for _ in range(20)]
+        for medal_id in ids:
+            if medal_id == 0:
+                continue
+            medal_id -= 1
+            if medal_id not in expected["medal_data_1"]:
+                if medal_id not in expected["medal_data_2"]:
+                    expected["medal_data_1"].append(medal_id)
+                expected["medal_data_2"][medal_id] = 0
+        assert meow_medals.set_medals(medal_stats, ids) == expected
+
+        ids = [rng.randint(0, 100) for _ in range(20)]
+        for medal_id in set(ids) - {0}:
+            while medal_id - 1 in expected["medal_data_1"]:
+                expected["medal_data_1"].remove(medal_id - 1)
+            expected["medal_data_2"].pop(medal_id - 1, None)
+        assert meow_medals.remove_medals(medal_stats, ids) == expected
+
+
+def test_stage_medals(monkeypatch):
+    """Test that stage medals are given for the stages that are cleared"""
+
+    catalogue = meow_medals.parse_medal_catalogue(
+        json.dumps(
+            {
+                "iconID": [
+                    {"grade": 0, "line": 0, "map": [0, 1]},
+                    {"grade": 0, "line": 0, "map": [2], "star": 1},
+                    {"grade": 0, "line": 0, "map": [-1, 1]},
+                    {"grade": 0, "line": 0, "map": [5]},
+                    {"grade": 0, "line": 0},
+                ]
+            }
+        ).encode("utf-8")
+    )
+    monkeypatch.setattr(meow_medals, "get_medal_data", lambda _: catalogue)
+    stage_stats = {"Value": {"unlock_next": [[0, 0]] + [[1, 0]] * 3 + [[0, 0]] * 4}}
+    medal_stats = {"medal_data_1": [0], "medal_data_2": {}}
+    event_stages.set_medals(stage_stats, medal_stats, (0, 4), 0, False)
+    assert medal_stats == {"medal_data_1": [0, 2], "medal_data_2": {0: 1, 2: 1}}
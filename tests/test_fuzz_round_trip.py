@@ -0,0 +1,45 @@
+"""Test the parse and serialise round trip with the fuzzer"""
+
+from benchmarks import fuzz_round_trip, save_generator
+
+
+def run_test_fuzz(game_version: int, country_code: str):
+    """Fuzz a small generated save and check that every case round trips"""
+
+    options = save_generator.SaveOptions(
+        game_version=game_version, country_code=country_code
+    ).scale(0.05)
+    save_data = save_generator.generate_save(options)
+
+    cases, failures, _ = fuzz_round_trip.fuzz([(save_data, country_code)], 40, 20)
+
+    assert cases == 40
+    assert not failures, "\n".join(str(failure) for failure in failures)
+
+
+def test_fuzz():
+    """Test the round trip of saves with and without dst"""
+
+    run_test_fuzz(120200, "en")
+    run_test_fuzz(120200, "jp")
+
+
+def test_leaves_skip_frozen():
+    """Test that fields deciding the layout of the save are not mutated"""
+
+    save_stats = {
+        "cats": [0, 1],
+        "cat_food": {"Value": 0, "Length": 4},
+        "gv_90900": {"Value": 90900, "Length": 4},
+        "event_current": {"total": 1, "stars": 1, "stages": 1, "Clear": [[0]]},
+        "unknown_86": [{"Value": 1, "Length": 4}],
+    }
+    leaves = fuzz_round_trip.get_leaves(save_stats, fuzz_round_trip.FROZEN_KEYS)
+    paths = [fuzz_round_trip.format_path(leaf.path) for leaf in leaves]
+
+    assert paths == [
+        "cats[0]",
+        "cats[1]",
+        "cat_food.Value",
+        "event_current.Clear[0][0]",
+    ]
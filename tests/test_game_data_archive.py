@@ -0,0 +1,230 @@
+"""Test the packed, content addressed game data store"""
+
+import os
+import threading
+
+import pytest
+
+from BCSFE_Python import game_data_archive, game_data_getter, helper
+from BCSFE_Python.edits.cats import cat_id_selector
+
+
+@pytest.fixture(name="files_path")
+def fixture_files_path(tmp_path, monkeypatch):
+    """Store game data in a temporary folder"""
+
+    monkeypatch.setattr(helper, "get_local_files_path", lambda: str(tmp_path))
+    monkeypatch.setattr(game_data_getter, "_offline", False)
+    yield tmp_path
+    game_data_archive.close_archives()
+
+
+def test_add_and_reopen(tmp_path):
+    """Test that files can be read back after reopening the archive"""
+
+    path = str(tmp_path / "archive.bin")
+    archive = game_data_archive.GameDataArchive(path)
+    assert archive.get("DataLocal/unitbuy.csv") is None
+    archive.add("DataLocal/unitbuy.csv", b"1,2,3\n")
+    archive.add_many({"resLocal/a.csv": b"a", "resLocal/b.csv": b""})
+    archive.add("DataLocal/unitbuy.csv", b"4,5,6\n")
+    archive.close()
+
+    archive = game_data_archive.GameDataArchive(path)
+    assert len(archive) == 3
+    assert archive.get("DataLocal/unitbuy.csv") == b"4,5,6\n"
+    assert archive.get("resLocal/b.csv") == b""
+    assert archive.get_names("resLocal/") == ["resLocal/a.csv", "resLocal/b.csv"]
+    archive.compact()
+    assert archive.waste == 0
+    assert archive.get("DataLocal/unitbuy.csv") == b"4,5,6\n"
+    archive.close()
+
+
+def test_incomplete_record_ignored(tmp_path):
+    """Test that a record cut off by a crash is dropped and overwritten"""
+
+    path = str(tmp_path / "archive.bin")
+    archive = game_data_archive.GameDataArchive(path)
+    archive.add("resLocal/a.csv", b"a")
+    archive.close()
+    with open(path, "ab") as file:
+        file.write(b"\x0e\x00\x10\x00\x00\x00resLocal/b")
+
+    archive = game_data_archive.GameDataArchive(path)
+    assert archive.get_names() == ["resLocal/a.csv"]
+    archive.add("resLocal/c.csv", b"c")
+    archive.close()
+    archive = game_data_archive.GameDataArchive(path)
+    assert archive.get_names() == ["resLocal/a.csv", "resLocal/c.csv"]
+    assert archive.get("resLocal/c.csv") == b"c"
+    archive.close()
+
+
+def test_shared_between_processes(tmp_path):
+    """Test that archives opened separately, like by two processes, don't lose each other's records"""
+
+    path = str(tmp_path / "archive.bin")
+    archive_1 = game_data_archive.GameDataArchive(path)
+    archive_2 = game_data_archive.GameDataArchive(path)
+    archive_1.add("resLocal/a.csv", b"a")
+    archive_2.add("resLocal/b.csv", b"b")
+    archive_1.add("resLocal/c.csv", b"c")
+    assert archive_1.get("resLocal/b.csv") == b"b"
+    assert archive_2.get("resLocal/c.csv") == b"c"
+
+    archive_2.compact({"resLocal/a.csv"})
+    archive_1.add("resLocal/d.csv", b"d")
+    assert archive_1.get_names() == [
+        "resLocal/b.csv",
+        "resLocal/c.csv",
+        "resLocal/d.csv",
+    ]
+    assert archive_2.get("resLocal/d.csv") == b"d"
+
+    def add_files(archive, prefix):
+        for i in range(50):
+            archive.add(f"{prefix}/{i}.csv", f"{prefix} {i}".encode())
+
+    threads = [
+        threading.Thread(target=add_files, args=(archive, prefix))
+        for archive, prefix in [(archive_1, "one"), (archive_2, "two")]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    archive_1.close()
+    archive_2.close()
+
+    archive = game_data_archive.GameDataArchive(path)
+    assert len(archive) == 103
+    for prefix in ["one", "two"]:
+        for i in range(50):
+            assert archive.get(f"{prefix}/{i}.csv") == f"{prefix} {i}".encode()
+    archive.close()
+
+
+def test_cat_names_read_from_archive(files_path, monkeypatch):
+    """Test that loose files are moved into the archive and cat names are read from it"""
+
+    folder = files_path / "game_data" / "12.2.0" / "resLocal"
+    os.makedirs(folder)
+    for cat_id in range(1, 4):
+        (folder / f"Unit_Explanation{cat_id}_en.csv").write_text(
+            f"Cat {cat_id}|\nCat {cat_id} Form 2|\n"
+        )
+    monkeypatch.setattr(game_data_getter, "get_latest_version", lambda _: "12.2.0")
+    monkeypatch.setattr(helper, "is_jp", lambda _: False)
+
+    names = cat_id_selector.get_cat_names({"cats": [0, 0, 0]})
+    assert names is not None
+    assert names[:2] == [("Cat 1", 0, 0), ("Cat 1 Form 2", 0, 1)]
+    assert len(names) == 6
+    assert os.listdir(folder) == []
+    assert os.path.exists(game_data_archive.get_blob_store_path())
+    assert game_data_getter.download_file(
+        "12.2.0", "resLocal", "Unit_Explanation3_en.csv", print_progress=False
+    ) == (b"Cat 3|\nCat 3 Form 2|\n")
+
+
+def test_blobs_shared_and_collected(files_path):
+    """Test that identical files are stored once and unused blobs are removed"""
+
+    old = game_data_archive.get_manifest("12.1.0")
+    old.add_many({"DataLocal/unitbuy.csv": b"old", "DataLocal/same.csv": b"same"})
+    new = game_data_archive.get_manifest("12.2.0")
+    new.add_many({"DataLocal/unitbuy.csv": b"new", "DataLocal/same.csv": b"same"})
+    store = game_data_archive.get_blob_store()
+    assert len(store) == 3
+    assert old.get_hash("DataLocal/same.csv") == new.get_hash("DataLocal/same.csv")
+
+    assert game_data_archive.collect_garbage() == 0
+    game_data_archive.close_archives()
+    helper.delete_dir(str(files_path / "game_data" / "12.1.0"))
+    assert game_data_archive.get_reference_counts() == {
+        game_data_archive.get_hash(b"new"): 1,
+        game_data_archive.get_hash(b"same"): 1,
+    }
+    assert game_data_archive.collect_garbage() == 1
+
+    game_data_archive.close_archives()
+    new = game_data_archive.get_manifest("12.2.0")
+    assert len(game_data_archive.get_blob_store()) == 2
+    assert new.get("DataLocal/unitbuy.csv") == b"new"
+    assert new.get("DataLocal/same.csv") == b"same"
+
+
+def test_version_archive_migrated(files_path):
+    """Test that a game version packed into its own archive is moved into the store"""
+
+    path = files_path / "game_data" / "12.2.0" / "archive.bin"
+    archive = game_data_archive.GameDataArchive(str(path))
+    archive.add_many({"DataLocal/unitbuy.csv": b"1,2,3", "resLocal/a.csv": b"a"})
+    archive.close()
+
+    manifest = game_data_archive.get_manifest("12.2.0")
+    assert sorted(manifest.get_names()) == ["DataLocal/unitbuy.csv", "resLocal/a.csv"]
+    assert manifest.get("DataLocal/unitbuy.csv") == b"1,2,3"
+    assert not os.path.exists(path)
+
+
+def test_manifest_shared_and_missing_blobs(files_path, monkeypatch):
+    """Test that manifests don't lose each other's files and missing blobs are downloaded again"""
+
+    manifest_1 = game_data_archive.VersionManifest("12.2.0")
+    manifest_2 = game_data_archive.VersionManifest("12.2.0")
+    manifest_1.add("DataLocal/a.csv", b"a")
+    manifest_2.add("DataLocal/b.csv", b"b")
+    manifest_1.link("DataLocal/c.csv", game_data_archive.get_hash(b"b"))
+    assert sorted(game_data_archive.load_manifest(manifest_1.path)) == [
+        "DataLocal/a.csv",
+        "DataLocal/b.csv",
+        "DataLocal/c.csv",
+    ]
+    assert game_data_archive.collect_garbage() == 0
+    assert manifest_2.get("DataLocal/a.csv") == b"a"
+    assert game_data_archive.get_manifest("12.2.0").get("DataLocal/a.csv") == b"a"
+
+    store = game_data_archive.get_blob_store()
+    store.compact({game_data_archive.get_hash(b"a")})
+    manifest = game_data_archive.get_manifest("12.2.0")
+    assert "DataLocal/a.csv" not in manifest
+    downloads: list[str] = []
+
+    def download(url, file_path, validators=None):
+        downloads.append(url)
+        helper.create_dirs(os.path.dirname(file_path))
+        helper.write_file_bytes(file_path, b"a")
+        return {"etag": '"a"'}
+
+    monkeypatch.setattr(game_data_getter, "get_previous_version", lambda _: None)
+    monkeypatch.setattr(game_data_getter.network_handler, "download", download)
+    assert (
+        game_data_getter.download_file(
+            "12.2.0", "DataLocal", "a.csv", print_progress=False
+        )
+        == b"a"
+    )
+    assert len(downloads) == 1
+
+
+def test_garbage_collected_while_adding(files_path):
+    """Test that collecting garbage never removes the blob of a file being added"""
+
+    manifest = game_data_archive.VersionManifest("12.2.0")
+    collector = game_data_archive.VersionManifest("12.1.0")
+    collector.add("DataLocal/old.csv", b"old")
+
+    def add_files():
+        for i in range(100):
+            manifest.add(f"DataLocal/{i}.csv", str(i).encode())
+
+    thread = threading.Thread(target=add_files)
+    thread.start()
+    while thread.is_alive():
+        game_data_archive.collect_garbage()
+    thread.join()
+    game_data_archive.collect_garbage()
+    for i in range(100):
+        assert manifest.get(f"DataLocal/{i}.csv") == str(i).encode()
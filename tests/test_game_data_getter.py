@@ -0,0 +1,108 @@
+"""Test the game data version resolution"""
+
+import os
+import time
+
+from BCSFE_Python import config_manager, game_data_getter, helper
+
+
+def setup_folders(tmp_path, monkeypatch) -> list[int]:
+    """Use temporary folders and count the downloads of latest.txt"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    files = tmp_path / "files"
+    monkeypatch.setattr(helper, "get_local_files_path", lambda: str(files))
+    monkeypatch.setattr(game_data_getter, "_latest_versions", None)
+    monkeypatch.setattr(game_data_getter, "_offline", False)
+    for version in ["9.10.0", "12.1.0", "12.1.0jp", "12.2.0jp"]:
+        os.makedirs(files / "game_data" / version)
+
+    downloads: list[int] = []
+
+    def fetch_latest_versions():
+        downloads.append(1)
+        return ["12.3.0", "12.3.0jp"]
+
+    monkeypatch.setattr(
+        game_data_getter, "fetch_latest_versions", fetch_latest_versions
+    )
+    return downloads
+
+
+def test_latest_versions_cached(tmp_path, monkeypatch):
+    """Test that latest.txt is only downloaded once per ttl"""
+
+    downloads = setup_folders(tmp_path, monkeypatch)
+    for _ in range(5):
+        assert game_data_getter.get_latest_version(False) == "12.3.0"
+        assert game_data_getter.get_latest_version(True) == "12.3.0jp"
+    assert len(downloads) == 1
+
+    # a new process reads the cached versions from disk
+    monkeypatch.setattr(game_data_getter, "_latest_versions", None)
+    assert game_data_getter.get_latest_versions() == ["12.3.0", "12.3.0jp"]
+    assert len(downloads) == 1
+
+    now = time.time()
+    monkeypatch.setattr(
+        time, "time", lambda: now + game_data_getter.LATEST_VERSIONS_TTL + 1
+    )
+    game_data_getter.get_latest_versions()
+    assert len(downloads) == 2
+
+
+def test_stale_versions_used_when_download_fails(tmp_path, monkeypatch):
+    """Test that the last downloaded versions are used if latest.txt can't be downloaded"""
+
+    setup_folders(tmp_path, monkeypatch)
+    game_data_getter.get_latest_versions()
+    monkeypatch.setattr(game_data_getter, "_latest_versions", None)
+    monkeypatch.setattr(game_data_getter, "fetch_latest_versions", lambda: None)
+    now = time.time()
+    monkeypatch.setattr(
+        time, "time", lambda: now + game_data_getter.LATEST_VERSIONS_TTL + 1
+    )
+    assert game_data_getter.get_latest_versions() == ["12.3.0", "12.3.0jp"]
+
+
+def test_offline(tmp_path, monkeypatch):
+    """Test that offline mode uses the newest downloaded versions"""
+
+    downloads = setup_folders(tmp_path, monkeypatch)
+    game_data_getter.set_offline(True)
+    assert game_data_getter.get_latest_versions() == ["12.1.0", "12.2.0jp"]
+    assert game_data_getter.get_path("DataLocal", "unitbuy.csv", True) == os.path.join(
+        "game_data", "12.2.0jp", "DataLocal", "unitbuy.csv"
+    )
+    assert not downloads
+
+    helper.delete_dir(str(tmp_path / "files" / "game_data" / "12.1.0"))
+    helper.delete_dir(str(tmp_path / "files" / "game_data" / "9.10.0"))
+    assert game_data_getter.get_latest_versions() is None
+    assert game_data_getter.get_latest_version(False) is None
+    assert game_data_getter.get_latest_version(True) == "12.2.0jp"
+
+
+def test_failed_download_cached(tmp_path, monkeypatch):
+    """Test that latest.txt isn't downloaded again on every call while it can't be"""
+
+    setup_folders(tmp_path, monkeypatch)
+    attempts: list[int] = []
+
+    def fetch_latest_versions():
+        attempts.append(1)
+
+    monkeypatch.setattr(
+        game_data_getter, "fetch_latest_versions", fetch_latest_versions
+    )
+    for _ in range(5):
+        assert game_data_getter.get_latest_versions() is None
+    assert len(attempts) == 1
+
+    # the network may be back soon, so a failure isn't kept for the full ttl
+    now = time.time()
+    monkeypatch.setattr(
+        time, "time", lambda: now + game_data_getter.FAILED_VERSIONS_TTL + 1
+    )
+    game_data_getter.get_latest_versions()
+    assert len(attempts) == 2
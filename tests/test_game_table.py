@@ -0,0 +1,79 @@
+"""Test the columnar game data tables"""
+
+import array
+
+import pytest
+
+from BCSFE_Python import game_table
+from BCSFE_Python.edits.cats import cat_helper, talents
+
+
+def test_columns_and_index():
+    """Test that rows can be read by key and columns by name without copying"""
+
+    table = game_table.GameTable.from_csv(
+        b"id,level,name\n1,20,a\n2,30\n1,40,b,9\n", has_header=True, key_column=0
+    )
+    assert len(table) == 3
+    assert list(table.keys()) == [1, 2]
+    assert table.get_row_by_key(1) == [1, 40, "b", 9]
+    assert table.get_row_by_key(3) is None
+    assert table.get_row(1) == [2, 30]
+    assert table.get_row_dict(1) == {"id": 2, "level": 30}
+    assert table.get_value(1, "name", None) is None
+
+    assert isinstance(table.columns[1], array.array)
+    levels = table.get_column("level")
+    assert isinstance(levels, memoryview)
+    assert levels.obj is table.columns[1]
+    with pytest.raises(TypeError):
+        levels[0] = 1  # type: ignore
+    view = table.get_column_slice("level", 1)
+    assert isinstance(view, memoryview)
+    assert view.tolist() == [30, 40]
+    assert table.get_column("name") == ("a", 0, "b")
+    assert table.get_column(10) == ()
+
+
+def test_shared_between_edits(manifest):
+    """Test that the edits read unitbuy.csv through one shared table"""
+
+    rows = []
+    for rarity in range(3):
+        row = [0] * 52
+        row[13] = rarity
+        row[50] = 50 + rarity
+        row[51] = 10
+        rows.append(",".join(str(value) for value in row))
+    manifest.add("DataLocal/unitbuy.csv", "\n".join(rows).encode("utf-8"))
+
+    max_levels = cat_helper.get_unit_max_levels(False)
+    assert max_levels is not None
+    assert list(max_levels[0]) == [50, 51, 52]
+    assert cat_helper.get_unit_max_level(max_levels, 2) == (52, 10)
+    assert cat_helper.get_unit_max_level(max_levels, 3) == (0, 0)
+    assert cat_helper.get_rarity([1, 2], False) == [1, 2]
+    table = game_table.get_game_table("DataLocal", "unitbuy.csv", False)
+    assert table is not None
+    assert table is game_table.get_game_table("DataLocal", "unitbuy.csv", False)
+    rarities = cat_helper.get_rarities(False)
+    assert rarities == [0, 1, 2]
+    rarities[0] = 5
+    assert cat_helper.get_rarities(False) == [0, 1, 2]
+
+
+def test_talent_db(manifest):
+    """Test that talents are read by cat id and text ids are replaced"""
+
+    manifest.add(
+        "DataLocal/SkillAcquisition.csv",
+        b"ID,type,abilityID_A,MAXLv_A,textID_A\n5,0,1,0,1\n8,1,2,3\n",
+    )
+    manifest.add(
+        "resLocal/SkillDescriptions.csv",
+        b"0|None\n1|Attack up<br>more text\n",
+    )
+
+    talent_db = talents.get_talent_db({"version": "en"})
+    assert talent_db is not None
+    assert talent_db.talents == {5: {1: ("Attack up", 1)}, 8: {2: ("", 3)}}
@@ -0,0 +1,80 @@
+"""Test the tables of the xp needed to reach each level"""
+
+import random
+
+from pytest import MonkeyPatch
+
+from BCSFE_Python import table_cache
+from BCSFE_Python.edits.gamototo import gamatoto_xp
+from BCSFE_Python.edits.other import cat_shrine
+from BCSFE_Python.level_table import LevelTable
+
+
+def count_level(xp: int, thresholds: list[int], clamp: bool) -> int:
+    """Work out a level by comparing the xp with every threshold"""
+
+    level = 1
+    for threshold in thresholds:
+        if xp >= threshold:
+            level += 1
+    if clamp and level > len(thresholds):
+        level = len(thresholds)
+    return level
+
+
+def test_same_as_counting():
+    """Test that the levels found with a binary search are the same as counting"""
+
+    rng = random.Random(0)
+    for _ in range(100):
+        increments = [rng.randint(0, 20) for _ in range(rng.randint(2, 30))]
+        clamp = bool(rng.randint(0, 1))
+        table = LevelTable.from_increments(increments, clamp)
+        thresholds = table.thresholds.tolist()
+        assert thresholds[-1] == sum(increments)
+        for xp in range(-1, thresholds[-1] + 3):
+            assert table.get_level(xp) == count_level(xp, thresholds, clamp)
+        for level in range(-1, len(thresholds) + 2):
+            expected = 0 if level <= 1 else thresholds[level - 2]
+            assert table.get_xp(level) == expected
+        assert table.get_max_xp() == thresholds[-2]
+
+
+def test_parsed_once(manifest, monkeypatch: MonkeyPatch):
+    """Test that the gamatoto and shrine levels are parsed once per game version"""
+
+    manifest.add("DataLocal/GamatotoExpedition.csv", b"100,0\n300,1\n700,2\n0,0\n")
+    manifest.add("resLocal/jinja_level.csv", b"10|a\n20|b\n30|c\n")
+    calls = []
+    parse = LevelTable.__init__
+
+    def count_parse(self, *args):
+        calls.append(1)
+        parse(self, *args)
+
+    monkeypatch.setattr(LevelTable, "__init__", count_parse)
+
+    assert gamatoto_xp.get_boundaries(False) == [100, 300, 700]
+    assert gamatoto_xp.get_level_from_xp(300, False) == {
+        "level": 3,
+        "max_level": 3,
+        "max_xp": 300,
+    }
+    assert gamatoto_xp.get_level_from_xp(5000, False)["level"] == 4
+    assert gamatoto_xp.get_xp_from_level(3, False) == 300
+    assert cat_shrine.get_boundaries(False) == [10, 30, 60]
+    assert cat_shrine.get_level_from_xp(5000, False)["level"] == 3
+    assert cat_shrine.get_xp_from_level(2, False) == 10
+    assert len(calls) == 2
+
+    table_cache.clear()
+    assert cat_shrine.get_level_from_xp(30, False)["level"] == 3
+    assert gamatoto_xp.get_xp_from_level(1, False) == 0
+    assert len(calls) == 2
+
+    # a new layout of the table makes the stored ones out of date
+    table_cache.clear()
+    monkeypatch.setattr(LevelTable, "LAYOUT_VERSION", LevelTable.LAYOUT_VERSION + 1)
+    assert gamatoto_xp.get_xp_from_level(3, False) == 300
+    assert cat_shrine.get_xp_from_level(2, False) == 10
+    assert len(calls) == 4
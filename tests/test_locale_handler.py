@@ -0,0 +1,66 @@
+"""Test the compiled locale bundle"""
+
+import os
+
+from BCSFE_Python import config_manager, locale_handler
+
+
+def setup_locale(tmp_path, monkeypatch):
+    """Use a temporary app data folder and no shared managers"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    monkeypatch.setattr(locale_handler.LocalManager, "managers", {})
+
+
+def test_templates_resolved(tmp_path, monkeypatch):
+    """Test that templates are resolved like the old recursive search"""
+
+    setup_locale(tmp_path, monkeypatch)
+    manager = locale_handler.LocalManager("en")
+    for key, value in manager.values.items():
+        assert "{{" not in value or "}}" not in value, key
+    try:
+        manager.search_key("not_a_key")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Missing key did not raise KeyError")
+
+
+def test_compiled_cache(tmp_path, monkeypatch):
+    """Test that the compiled locale is written and used on the next load"""
+
+    setup_locale(tmp_path, monkeypatch)
+    manager = locale_handler.LocalManager("en")
+    cache_path = manager.get_cache_path()
+    assert os.path.exists(cache_path)
+
+    def fail_parse(_):
+        raise AssertionError("Locale was parsed again")
+
+    monkeypatch.setattr(locale_handler.LocalManager, "parse", fail_parse)
+    cached = locale_handler.LocalManager("en")
+    assert cached.values == manager.values
+    assert cached.properties == manager.properties
+
+
+def test_shared_manager(tmp_path, monkeypatch):
+    """Test that a locale is only loaded once"""
+
+    setup_locale(tmp_path, monkeypatch)
+    assert locale_handler.LocalManager.get("en") is locale_handler.LocalManager.get(
+        "en"
+    )
+
+
+def test_fallback(tmp_path, monkeypatch):
+    """Test that a locale overrides english and falls back to it for missing keys"""
+
+    setup_locale(tmp_path, monkeypatch)
+    en = locale_handler.LocalManager("en")
+    th = locale_handler.LocalManager("th")
+    th_main = locale_handler.PropertySet("th", "main").properties
+    key = next(key for key in th_main if "{{" not in th_main[key])
+    assert th.search_key(key) == th_main[key].replace("\\n", "\n")
+    en_only = next(key for key in en.values if key not in th_main)
+    assert th.search_key(en_only) == en.search_key(en_only)
@@ -0,0 +1,263 @@
+"""Test the shared session used for game data downloads"""
+
+import http.server
+import json
+import os
+import threading
+
+import pytest
+
+from BCSFE_Python import (
+    config_manager,
+    game_data_archive,
+    game_data_getter,
+    helper,
+    network_handler,
+)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves files with an ETag, counting requests and connections"""
+
+    protocol_version = "HTTP/1.1"
+    files = {"/12.2.0/DataLocal/unitbuy.csv": b"1,2,3\n4,5,6\n"}
+    files.update(
+        {
+            f"/12.2.0/resLocal/Unit_Explanation{i}_en.csv": f"Cat {i}|\n".encode()
+            for i in range(1, 51)
+        }
+    )
+    requests: list[str] = []
+    not_modified: list[str] = []
+    ranges: list[str] = []
+    encodings: list[str] = []
+    connections: list[int] = []
+
+    def setup(self):
+        super().setup()
+        Handler.connections.append(1)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        Handler.requests.append(self.path)
+        data = Handler.files.get(self.path)
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "9")
+            self.end_headers()
+            self.wfile.write(b"Not Found")
+            return
+        etag = f'"{hash(data)}"'
+        if self.headers.get("If-None-Match") == etag:
+            Handler.not_modified.append(self.path)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        range_header = self.headers.get("Range")
+        if range_header is not None:
+            Handler.ranges.append(range_header)
+            Handler.encodings.append(self.headers.get("Accept-Encoding", ""))
+        if range_header is not None and self.headers.get("If-Range") == etag:
+            start = int(range_header[len("bytes=") : -1])
+            self.send_response(206)
+            self.send_header("ETag", etag)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+            )
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            self.wfile.write(data[start:])
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class Server(http.server.ThreadingHTTPServer):
+    """Local server that ignores clients closing their connections"""
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+@pytest.fixture(name="server")
+def fixture_server(tmp_path, monkeypatch):
+    """Start a local server for the game data"""
+
+    monkeypatch.setattr(config_manager, "get_app_data_folder", lambda: str(tmp_path))
+    monkeypatch.setattr(helper, "get_local_files_path", lambda: str(tmp_path / "files"))
+    Handler.requests.clear()
+    Handler.not_modified.clear()
+    Handler.connections.clear()
+    Handler.ranges.clear()
+    Handler.encodings.clear()
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        game_data_getter, "URL", f"http://127.0.0.1:{server.server_address[1]}/"
+    )
+    network_handler.close()
+    yield server
+    network_handler.close()
+    game_data_archive.close_archives()
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_and_revalidate(server, tmp_path):
+    """Test that files are downloaded, kept if unchanged and connections are reused"""
+
+    data = game_data_getter.download_file(
+        "12.2.0", "DataLocal", "unitbuy.csv", print_progress=False
+    )
+    assert data == b"1,2,3\n4,5,6\n"
+    assert (
+        game_data_getter.download_file(
+            "12.2.0", "DataLocal", "unitbuy.csv", print_progress=False
+        )
+        == data
+    )
+    assert len(Handler.requests) == 1
+
+    game_data_getter.download_file(
+        "12.2.0", "DataLocal", "unitbuy.csv", print_progress=False, revalidate=True
+    )
+    assert len(Handler.requests) == 2
+    assert len(Handler.connections) == 1
+    assert "validators.json" in os.listdir(tmp_path / "files" / "game_data" / "12.2.0")
+
+
+def test_error_status_not_written(server, tmp_path):
+    """Test that an error response raises and isn't written to the cache"""
+
+    with pytest.raises(Exception):
+        game_data_getter.download_file(
+            "12.2.0", "DataLocal", "missing.csv", print_progress=False
+        )
+    folder = tmp_path / "files" / "game_data" / "12.2.0" / "DataLocal"
+    assert not os.path.exists(folder) or os.listdir(folder) == []
+
+
+def test_bulk_download(server, tmp_path, monkeypatch):
+    """Test that bulk downloads reuse a bounded number of connections and resume partial files"""
+
+    folder = tmp_path / "files" / "game_data" / "12.2.0" / "resLocal"
+    os.makedirs(folder)
+    (folder / "Unit_Explanation1_en.csv.part").write_bytes(b"Cat")
+    etag = f'"{hash(Handler.files["/12.2.0/resLocal/Unit_Explanation1_en.csv"])}"'
+    (folder / "Unit_Explanation1_en.csv.part.json").write_text(
+        json.dumps({"etag": etag})
+    )
+    (folder / "Unit_Explanation2_en.csv").write_bytes(b"Cat 2|\n")
+    files = [("resLocal", f"Unit_Explanation{i}_en.csv") for i in range(1, 53)]
+    progress: list[int] = []
+    download_many = network_handler.download_many
+
+    def download_many_4_workers(jobs, **kwargs):
+        kwargs["progress"] = lambda done, total: progress.append(done)
+        return download_many(jobs, workers=4, **kwargs)
+
+    monkeypatch.setattr(network_handler, "download_many", download_many_4_workers)
+    failed = game_data_getter.download_files("12.2.0", files)
+
+    assert failed == [
+        ("resLocal", "Unit_Explanation51_en.csv"),
+        ("resLocal", "Unit_Explanation52_en.csv"),
+    ]
+    assert len(Handler.requests) == 51
+    assert len(Handler.connections) <= 4
+    assert progress == list(range(1, 52))
+    assert Handler.ranges == ["bytes=3-"]
+    assert Handler.encodings == ["identity"]
+    manifest = game_data_archive.get_manifest("12.2.0")
+    assert manifest.get("resLocal/Unit_Explanation1_en.csv") == b"Cat 1|\n"
+    assert manifest.get("resLocal/Unit_Explanation2_en.csv") == b"Cat 2|\n"
+    assert manifest.get("resLocal/Unit_Explanation50_en.csv") == b"Cat 50|\n"
+    assert "resLocal/Unit_Explanation51_en.csv" not in manifest
+    assert os.listdir(folder) == []
+
+
+def test_unchanged_files_shared(server, monkeypatch):
+    """Test that files that didn't change since the previous game version aren't downloaded again"""
+
+    files = [("resLocal", f"Unit_Explanation{i}_en.csv") for i in range(1, 4)]
+    assert not game_data_getter.download_files("12.2.0", files, print_progress=False)
+    game_data_getter.download_file(
+        "12.2.0", "DataLocal", "unitbuy.csv", print_progress=False
+    )
+    new_files = {
+        path.replace("/12.2.0/", "/12.3.0/"): data
+        for path, data in Handler.files.items()
+    }
+    new_files["/12.3.0/resLocal/Unit_Explanation2_en.csv"] = b"New Cat 2|\n"
+    monkeypatch.setattr(Handler, "files", new_files)
+    Handler.requests.clear()
+
+    assert not game_data_getter.download_files("12.3.0", files, print_progress=False)
+    assert game_data_getter.download_file(
+        "12.3.0", "DataLocal", "unitbuy.csv", print_progress=False
+    ) == (b"1,2,3\n4,5,6\n")
+    assert len(Handler.requests) == 4
+    assert sorted(Handler.not_modified) == [
+        "/12.3.0/DataLocal/unitbuy.csv",
+        "/12.3.0/resLocal/Unit_Explanation1_en.csv",
+        "/12.3.0/resLocal/Unit_Explanation3_en.csv",
+    ]
+    manifest = game_data_archive.get_manifest("12.3.0")
+    assert manifest.get("resLocal/Unit_Explanation1_en.csv") == b"Cat 1|\n"
+    assert manifest.get("resLocal/Unit_Explanation2_en.csv") == b"New Cat 2|\n"
+    assert len(game_data_archive.get_blob_store()) == 5
+    assert game_data_getter.load_validators("12.3.0").keys() == {
+        "DataLocal/unitbuy.csv",
+        "resLocal/Unit_Explanation1_en.csv",
+        "resLocal/Unit_Explanation2_en.csv",
+        "resLocal/Unit_Explanation3_en.csv",
+    }
+
+
+def test_changed_file_not_resumed(server, tmp_path):
+    """Test that a partial file of an older or unknown version of a file is downloaded again"""
+
+    url = f"{game_data_getter.URL}12.2.0/DataLocal/unitbuy.csv"
+    path = str(tmp_path / "unitbuy.csv")
+    with open(f"{path}.part", "wb") as file:
+        file.write(b"9,9,9")
+    with open(f"{path}.part.json", "w", encoding="utf-8") as file:
+        json.dump({"etag": '"old"'}, file)
+    network_handler.download(url, path, resume=True)
+    with open(path, "rb") as file:
+        assert file.read() == b"1,2,3\n4,5,6\n"
+    assert Handler.ranges == ["bytes=5-"]
+
+    # without the validators of the partial file it can't be resumed
+    os.remove(path)
+    with open(f"{path}.part", "wb") as file:
+        file.write(b"1,2")
+    network_handler.download(url, path, resume=True)
+    with open(path, "rb") as file:
+        assert file.read() == b"1,2,3\n4,5,6\n"
+    assert Handler.ranges == ["bytes=5-"]
+    assert not [name for name in os.listdir(tmp_path) if ".part" in name]
+
+
+def test_failed_partial_removed(server, tmp_path):
+    """Test that the partial file of a download that failed for good is removed"""
+
+    path = str(tmp_path / "missing.csv")
+    with open(f"{path}.part", "wb") as file:
+        file.write(b"1,2")
+    job = network_handler.download_job(
+        network_handler.DownloadJob(
+            f"{game_data_getter.URL}12.2.0/DataLocal/missing.csv", path
+        ),
+        2,
+    )
+    assert job.error is not None
+    assert not os.path.exists(f"{path}.part")
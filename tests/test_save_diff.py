@@ -0,0 +1,33 @@
+"""Test the save diff"""
+
+from BCSFE_Python import save_diff, serialise_save
+from benchmarks import save_generator
+
+
+def test_diff_saves():
+    """Test that only changed values are reported"""
+
+    options = save_generator.SaveOptions().scale(0.1)
+    save_stats = save_generator.generate_save_stats(options)
+    save_data_1 = serialise_save.serialize_save(save_stats)
+
+    save_stats["cats"][12] = 1 - save_stats["cats"][12]
+    save_stats["cat_food"]["Value"] = 45000
+    save_stats["cats"].append(1)
+    save_data_2 = serialise_save.serialize_save(save_stats)
+
+    changes = [str(change) for change in save_diff.diff_saves(save_data_1, save_data_2)]
+    old_cat = 1 - save_stats["cats"][12]
+    old_cat_food = save_generator.generate_save_stats(options)["cat_food"]["Value"]
+
+    assert f"cats[12]: {old_cat} -> {1 - old_cat}" in changes
+    assert f"cats[{options.cats}]: (none) -> 1" in changes
+    assert f"cat_food: {old_cat_food} -> 45000" in changes
+    assert len(changes) == 4  # the bcsfe entry in unknown_108 is also updated
+
+
+def test_diff_identical():
+    """Test that identical saves have no changes"""
+
+    save_data = save_generator.generate_save(save_generator.SaveOptions().scale(0.1))
+    assert save_diff.diff_saves(save_data, save_data) == []
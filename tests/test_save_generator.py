@@ -0,0 +1,45 @@
+"""Test the synthetic save generator"""
+
+from BCSFE_Python import parse_save, patcher, serialise_save
+from benchmarks import save_generator
+
+
+def run_test_generate(game_version: int, country_code: str):
+    """Generate a save and check that it parses back to the requested sizes"""
+
+    options = save_generator.SaveOptions(
+        game_version=game_version, country_code=country_code
+    ).scale(0.1)
+    save_data = save_generator.generate_save(options)
+
+    assert patcher.detect_game_version(save_data) == country_code
+    assert parse_save.get_game_version(save_data) == game_version
+
+    save_stats = parse_save.parse_save(save_data, country_code)
+    assert len(save_stats["cats"]) == options.cats
+    assert save_stats["event_current"]["total"] == options.event_sub_chapters
+    assert save_stats["gauntlet_current"]["total"] == options.gauntlet_sub_chapters
+    assert len(save_stats["talent_orbs"]) == options.orbs
+    assert len(save_stats["login_bonuses"]) == options.login_bonuses
+    assert len(save_stats["purchases"]) == options.purchase_receipts
+
+    save_data_2 = serialise_save.serialize_save(save_stats)
+    assert parse_save.parse_save(save_data_2, country_code) == save_stats
+
+
+def test_generate():
+    """Test generated saves for a few game versions and countries"""
+
+    run_test_generate(120200, "en")
+    run_test_generate(120200, "jp")
+    run_test_generate(110300, "kr")
+    run_test_generate(100000, "tw")
+
+
+def test_generate_reproducible():
+    """Test that the same options always generate the same save"""
+
+    options = save_generator.SaveOptions().scale(0.1)
+    assert save_generator.generate_save(options) == save_generator.generate_save(
+        options
+    )
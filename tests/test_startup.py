@@ -0,0 +1,43 @@
+"""Test the lazy imports of the editor start up"""
+
+import importlib
+
+from BCSFE_Python import feature_handler, startup_profile
+from benchmarks import bench_startup
+
+
+def get_features(features):
+    """Get every feature in the features table"""
+
+    for feature in features.values():
+        if isinstance(feature, dict):
+            yield from get_features(feature)
+        else:
+            yield feature
+
+
+def test_lazy_modules_not_imported():
+    """Test that starting the editor doesn't import the lazily loaded modules"""
+
+    assert bench_startup.get_eager_modules() == []
+
+
+def test_lazy_features_exist():
+    """Test that every lazily loaded feature points to a function"""
+
+    for feature in get_features(feature_handler.FEATURES):
+        if isinstance(feature, feature_handler.LazyFeature):
+            module = importlib.import_module(f"BCSFE_Python.edits.{feature.module}")
+            assert callable(getattr(module, feature.function)), feature
+
+
+def test_startup_profile():
+    """Test that the profile times the editor modules"""
+
+    times = startup_profile.get_import_times()
+    names = [import_time.name for import_time in times]
+    assert "BCSFE_Python.__main__" in names
+    assert "BCSFE_Python.helper" in names
+    for import_time in times:
+        assert 0 <= import_time.self_time <= import_time.cumulative_time
+    assert "BCSFE_Python.helper" in startup_profile.format_profile(times, limit=100)
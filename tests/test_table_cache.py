@@ -0,0 +1,150 @@
+"""Test the cache of parsed game data tables"""
+
+import json
+import os
+import zlib
+
+from BCSFE_Python import (
+    csv_handler,
+    helper,
+    table_cache,
+)
+from BCSFE_Python.edits.cats import cat_helper
+from BCSFE_Python.edits.other import meow_medals
+
+
+def get_unitbuy(max_level: int) -> bytes:
+    """Get a unitbuy.csv with two cats"""
+
+    rows = []
+    for rarity in range(2):
+        row = [0] * 62
+        row[13] = rarity
+        row[50] = max_level
+        row[51] = 10
+        rows.append(",".join(str(value) for value in row) + ",//comment")
+    return "\n".join(rows).encode("utf-8")
+
+
+def test_table_parsed_once(manifest, monkeypatch):
+    """Test that a table is parsed once, then read from memory and then from disk"""
+
+    manifest.add("DataLocal/unitbuy.csv", get_unitbuy(50))
+    parse_int_csv = csv_handler.parse_int_csv
+    calls: list[int] = []
+
+    def count_parse(*args):
+        calls.append(1)
+        return parse_int_csv(*args)
+
+    monkeypatch.setattr(csv_handler, "parse_int_csv", count_parse)
+
+    assert cat_helper.get_unit_max_levels(False) == ([50, 50], [10, 10])
+    assert cat_helper.get_rarities(False) == [0, 1]
+    assert len(calls) == 1
+    folder = os.path.dirname(
+        table_cache.get_cache_path("12.2.0", "DataLocal/unitbuy.csv", "x")
+    )
+    assert len(os.listdir(folder)) == 1
+
+    table_cache.clear()
+    assert cat_helper.get_unit_max_levels(False) == ([50, 50], [10, 10])
+    assert len(calls) == 1
+
+    # the file changed, so the cached table is out of date
+    table_cache.clear()
+    manifest.add("DataLocal/unitbuy.csv", get_unitbuy(60))
+    assert cat_helper.get_unit_max_levels(False) == ([60, 60], [10, 10])
+    assert len(calls) == 2
+
+
+def test_objects_cached_on_disk(manifest):
+    """Test that tables of objects are stored and loaded"""
+
+    medals = {
+        "iconID": [
+            {"grade": 0, "line": 0, "map": 1, "treasure": 2},
+            {"grade": 1, "line": 2, "chara": 3, "condition": 1},
+            {"grade": 2, "line": 1, "action": 0},
+            {"grade": 0, "line": 3, "condition": 4},
+        ]
+    }
+    manifest.add("DataLocal/medallist.json", json.dumps(medals).encode("utf-8"))
+
+    medal_data = meow_medals.get_medal_data(False)
+    table_cache.clear()
+    cached = meow_medals.get_medal_data(False)
+
+    assert cached is not medal_data
+    assert isinstance(cached, meow_medals.Medals)
+    assert type(cached.characters[0]) is type(medal_data.characters[0])
+    assert cached.characters[0].get_fields() == medal_data.characters[0].get_fields()
+    assert type(cached.stages[0]) is type(medal_data.stages[0])
+    assert cached.stages[0].get_fields() == medal_data.stages[0].get_fields()
+    assert type(cached.actions[0]) is type(medal_data.actions[0])
+    assert cached.actions[0].get_fields() == medal_data.actions[0].get_fields()
+
+
+def test_medal_layout_version(manifest, monkeypatch):
+    """Test that stored medals are parsed again when the layout of their classes changes"""
+
+    data = json.dumps({"iconID": [{"grade": 0, "line": 0, "action": 0}]})
+    manifest.add("DataLocal/medallist.json", data.encode("utf-8"))
+    path = table_cache.get_cache_path(
+        "12.2.0",
+        "DataLocal/medallist.json",
+        table_cache.get_parser_name(meow_medals.parse_medal_catalogue, ()),
+    )
+    checksum = zlib.crc32(data.encode("utf-8"))
+
+    assert meow_medals.get_medal_data(False) is not None
+    assert table_cache.load_table(path, checksum, 1)[0]
+    assert not table_cache.load_table(path, checksum, 2)[0]
+
+    table_cache.clear()
+    monkeypatch.setattr(meow_medals.MedalCatalogue, "LAYOUT_VERSION", 2)
+    assert meow_medals.get_medal_data(False) is not None
+    assert table_cache.load_table(path, checksum, 2)[0]
+
+
+def test_corrupt_cache_ignored(manifest):
+    """Test that an unreadable cached table is parsed again"""
+
+    manifest.add("DataLocal/unitbuy.csv", get_unitbuy(50))
+    path = table_cache.get_cache_path(
+        "12.2.0",
+        "DataLocal/unitbuy.csv",
+        table_cache.get_parser_name(table_cache.parse_int_csv, ()),
+    )
+    helper.create_dirs(os.path.dirname(path))
+    with open(path, "wb") as file:
+        file.write(b"not a pickle")
+
+    assert cat_helper.get_rarities(False) == [0, 1]
+    table = table_cache.get_table("DataLocal", "unitbuy.csv", False)
+    assert [row[13] for row in table] == [0, 1]
+    loaded, table = table_cache.load_table(path, zlib.crc32(get_unitbuy(50)))
+    assert loaded
+    assert [row[13] for row in table] == [0, 1]
+
+
+def test_layout_version_rebuilds(manifest):
+    """Test that a built table is built again when its layout version changes"""
+
+    manifest.add("DataLocal/unitbuy.csv", get_unitbuy(50))
+    builds: list[int] = []
+
+    def build() -> list[int]:
+        builds.append(1)
+        return [len(builds)]
+
+    keys = ["DataLocal/unitbuy.csv"]
+    assert table_cache.get_game_data_table("12.2.0", keys, "x", 1, build) == [1]
+    table_cache.clear()
+    assert table_cache.get_game_data_table("12.2.0", keys, "x", 1, build) == [1]
+    table_cache.clear()
+    assert table_cache.get_game_data_table("12.2.0", keys, "x", 2, build) == [2]
+    table_cache.clear()
+    manifest.add("DataLocal/unitbuy.csv", get_unitbuy(60))
+    assert table_cache.get_game_data_table("12.2.0", keys, "x", 2, build) == [3]
+    assert len(builds) == 3
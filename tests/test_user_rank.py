@@ -0,0 +1,83 @@
+"""Test the user rank kept up to date as cats are edited"""
+
+import random
+
+from pytest import MonkeyPatch
+
+from BCSFE_Python import helper, user_rank
+from BCSFE_Python.edits.cats import get_remove_cats, upgrade_blue, upgrade_cats
+
+
+def count_user_rank(save_stats: dict) -> int:
+    """Work out the user rank from all of the cats"""
+
+    rank = 0
+    for cat_id, cat_flag in enumerate(save_stats["cats"]):
+        if cat_flag:
+            rank += save_stats["cat_upgrades"]["Base"][cat_id] + 1
+            rank += save_stats["cat_upgrades"]["Plus"][cat_id]
+    for skill_id, base in enumerate(save_stats["blue_upgrades"]["Base"]):
+        if skill_id != 1:
+            rank += base + 1 + save_stats["blue_upgrades"]["Plus"][skill_id]
+    return rank
+
+
+def get_save_stats(rng: random.Random, cat_count: int) -> dict:
+    """Get save stats with random cats and upgrades"""
+
+    return {
+        "cats": [rng.randint(0, 1) for _ in range(cat_count)],
+        "gatya_seen_cats": [0] * cat_count,
+        "menu_unlocks": [0] * 5,
+        "user_rank_popups": {"Value": 0},
+        "cat_upgrades": {
+            "Base": [rng.randint(0, 49) for _ in range(cat_count)],
+            "Plus": [rng.randint(0, 90) for _ in range(cat_count)],
+        },
+        "blue_upgrades": {
+            "Base": [rng.randint(0, 9) for _ in range(11)],
+            "Plus": [rng.randint(0, 10) for _ in range(11)],
+        },
+    }
+
+
+def test_refreshed_by_edits(monkeypatch: MonkeyPatch):
+    """Test that edits to cats and upgrades keep the user rank up to date"""
+
+    rng = random.Random(0)
+    save_stats = get_save_stats(rng, 300)
+    rank = user_rank.track(save_stats)
+    assert helper.calculate_user_rank(save_stats) == count_user_rank(save_stats)
+
+    monkeypatch.setattr(
+        "builtins.input", lambda: f"{rng.randint(1, 50)}+{rng.randint(0, 90)}"
+    )
+    monkeypatch.setattr(helper, "check_cat_ids", lambda ids, _: ids)
+    for _ in range(20):
+        cat_ids = rng.sample(range(300), 5)
+        get_remove_cats.get_cat_ids(save_stats, rng.randint(0, 1), "gave", cat_ids)
+        upgrade_cats.upgrade_handler(
+            save_stats["cat_upgrades"], cat_ids[:1], "cat", save_stats
+        )
+        upgrade_blue.upgrade_blue_ids(save_stats, [rng.randint(0, 10)])
+        assert user_rank.get_tracked(save_stats) is rank
+        assert helper.calculate_user_rank(save_stats) == count_user_rank(save_stats)
+
+
+def test_rebuilt_when_lists_replaced():
+    """Test that the user rank is worked out again if the save has new lists"""
+
+    rng = random.Random(1)
+    save_stats = get_save_stats(rng, 50)
+    assert user_rank.get_user_rank(save_stats) == count_user_rank(save_stats)
+    rank = user_rank.get_tracked(save_stats)
+    assert rank is not None
+
+    save_stats["cats"] = [1] * 50
+    assert user_rank.get_tracked(save_stats) is None
+    assert user_rank.get_user_rank(save_stats) == count_user_rank(save_stats)
+
+    save_stats["cats"].append(1)
+    save_stats["cat_upgrades"]["Base"].append(4)
+    save_stats["cat_upgrades"]["Plus"].append(0)
+    assert user_rank.get_user_rank(save_stats) == count_user_rank(save_stats)